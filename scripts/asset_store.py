@@ -0,0 +1,129 @@
+"""
+Magasin de fichiers adressé par contenu pour les PDF des dossiers simples
+
+Plusieurs modèles partagent souvent le même manuel, et un même PDF est
+parfois déposé dans plusieurs dossiers de content/. Au lieu d'une copie par
+dossier, chaque PDF est haché (empreinte mise en cache par le manifeste de
+build) et publié une seule fois sous
+
+    static/pdf/<section>/_fichiers/<empreinte>/<nom du premier fichier>.pdf
+
+Le nom d'origine est gardé pour le téléchargement; l'empreinte dans le
+chemin permet de le mettre en cache comme immuable. Les entrées "file" du
+frontmatter pointent vers ce chemin, et les copies en double sont comptées
+dans le bilan (octets évités).
+
+Le registre du magasin, .build-cache/assets/<chemin web>.json (ex.
+pdf-manuels.json), associe chaque fichier publié au dossier qui l'a fourni
+en premier; generate-search-index.py y prend la catégorie des PDF à indexer:
+
+    {"version": 1,
+     "files": {"pdf/manuels/_fichiers/<empreinte>/OM-1.pdf":
+               {"category": "lames", "model": "testmod"}}}
+"""
+
+import json
+from pathlib import Path
+
+from build_cache import CACHE_DIR, hash_text
+from build_metrics import count
+
+# Dossier du magasin sous static/pdf/<section>/ (ignoré par index-manuals.py)
+STORE_DIRNAME = "_fichiers"
+
+# Registres des magasins
+RECORDS_DIR = CACHE_DIR / "assets"
+
+# Version du format des registres
+RECORD_VERSION = 1
+
+# Nombre de caractères de l'empreinte dans le chemin
+HASH_LENGTH = 16
+
+
+def record_path(web_dir):
+    """Registre du magasin de la section web_dir (ex. pdf/manuels)"""
+    return RECORDS_DIR / f"{web_dir.replace('/', '-')}.json"
+
+
+def read_record(web_dir):
+    """
+    Fichiers du magasin de web_dir: chemin web -> dossier d'origine (vide
+    sans registre, par exemple avant le premier build)
+    """
+    try:
+        record = json.loads(record_path(web_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if record.get("version") != RECORD_VERSION:
+        return {}
+    return record["files"]
+
+
+class AssetStore:
+    """Fichiers d'un générateur, publiés une seule fois par contenu"""
+
+    def __init__(self, manifest, static_dir, web_dir):
+        """
+        static_dir est le dossier de la section sous static/ (ex.
+        static/pdf/manuels), web_dir son chemin web (ex. pdf/manuels).
+        """
+        self.manifest = manifest
+        self.root = Path(static_dir) / STORE_DIRNAME
+        self.web_dir = web_dir
+        self.web_root = f"{web_dir}/{STORE_DIRNAME}"
+        # Empreinte -> (cible, chemin web, origine) du premier fichier de ce
+        # contenu
+        self.entries = {}
+        # Fichiers à synchroniser vers static/: (source, cible, stat)
+        self.assets = []
+        self.duplicates = 0
+        self.bytes_saved = 0
+
+    def add(self, source, stat=None, origin=None):
+        """
+        Ajoute un fichier et retourne son chemin web dans le magasin. origin
+        (dictionnaire JSON, ex. catégorie et modèle) décrit le dossier qui
+        fournit le fichier; seule celle du premier exemplaire est gardée.
+        """
+        source = Path(source)
+        if stat is None:
+            stat = source.stat()
+        file_hash = self.manifest.hash_file(source, stat)[:HASH_LENGTH]
+
+        entry = self.entries.get(file_hash)
+        if entry is not None:
+            self.duplicates += 1
+            self.bytes_saved += stat.st_size
+            count("files_deduplicated")
+            count("bytes_deduplicated", stat.st_size)
+            return entry[1]
+
+        target = self.root / file_hash / source.name
+        web_path = f"{self.web_root}/{file_hash}/{source.name}"
+        self.entries[file_hash] = (target, web_path, origin or {})
+        self.assets.append((source, target, stat))
+        return web_path
+
+    def write_record(self):
+        """
+        Écrit le registre du magasin avec le manifeste du générateur,
+        seulement si son contenu a changé. Retourne True s'il a été réécrit.
+        """
+        files = {web_path: origin for _, web_path, origin in self.entries.values()}
+        text = json.dumps(
+            {"version": RECORD_VERSION, "files": files},
+            ensure_ascii=False,
+            indent=1,
+            sort_keys=True,
+        )
+        return self.manifest.write_text(
+            record_path(self.web_dir), hash_text(text), str, text
+        )
+
+    def report(self):
+        """Résumé de la déduplication"""
+        return (
+            f"♻️  {len(self.entries)} PDF uniques, {self.duplicates} en double"
+            f" ({self.bytes_saved / 1e6:.1f} Mo évités)"
+        )
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Benchmark de tous les générateurs sur des catalogues synthétiques, avec seuils de régression
+Pour chaque taille de catalogue (--scales, en nombre de lignes CSV), crée
+dans un dossier temporaire un site synthétique complet: lignes CSV et
+entrées specs.yaml, dossiers de manuels simples (info.yaml, PDF, photo),
+dossiers de produits simples, et arborescence catégorie/modèle de PDF dans
+static/pdf/manuels/. Chaque script est lancé dans son propre processus, dans
+l'ordre du déploiement, d'abord sans cache (build à froid) puis une seconde
+fois sans modification (build incrémental). Sont relevés: la durée mesurée
+par le script (.build-cache/metrics.json), le débit, le temps CPU et le pic
+de mémoire du processus.
+
+Les durées dépendent de la machine: la référence (fichier --baseline,
+baseline-build.json par défaut, non versionné) s'enregistre d'abord avec
+--save-baseline, sur la machine qui lance le benchmark et avant les
+modifications à mesurer. Les lancements suivants sont comparés à la
+référence et le benchmark échoue (code 1) si une durée ou une mémoire
+dépasse la référence de plus de --tolerance (en plus d'une marge absolue
+pour les mesures très courtes), s'il n'y a pas de référence, ou si aucune
+mesure n'y figure (autres tailles). Tout est local, sans accès réseau.
+Usage: python scripts/benchmarks/bench-build.py [--scales 200 1000]
+       [--save-baseline] [--baseline FICHIER] [--tolerance 0.25]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow non installé: photos factices non décodables
+    Image = None
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline-build.json"
+
+# Tailles mesurées par défaut (lignes CSV)
+DEFAULT_SCALES = [200, 1000]
+
+# Scripts mesurés, dans l'ordre du workflow de déploiement
+SCRIPTS = [
+    "generate-products",
+    "process-simple-manuals",
+    "process-simple-products",
+    "index-manuals",
+    "generate-search-index",
+]
+
+# Proportions du catalogue synthétique, par ligne CSV
+MANUAL_FOLDERS_RATIO = 0.1
+PRODUCT_FOLDERS_RATIO = 0.05
+PDF_MODELS_RATIO = 0.1
+PDF_PAGES = 2
+
+# Marges de comparaison à la référence
+DEFAULT_TOLERANCE = 0.25
+MIN_SECONDS_SLACK = 0.05
+MIN_RSS_SLACK_MB = 5.0
+
+CSV_FIELDS = [
+    "sku",
+    "name",
+    "category",
+    "price",
+    "price_note",
+    "description",
+    "image",
+    "manual_ref",
+    "in_stock",
+    "featured",
+]
+CATEGORIES = ["souffleuses", "balais", "debris", "lames", "options"]
+WORDS = (
+    "souffleuse balais lame hydraulique rotation deversement attache rapide "
+    "tracteur neige capacite garantie courroie roulement engrenage vis "
+    "goupille cisaillement deflecteur cheminee patins usure boulon ressort"
+).split()
+
+
+def dummy_pdf(title, pages, rng):
+    """PDF minimal valide: une page de texte (titre, pièces) par page"""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # liste des pages, complétée plus bas
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for number in range(1, pages + 1):
+        lines = [f"{title} - SECTION {number}"]
+        for _ in range(12):
+            words = " ".join(rng.choices(WORDS, k=4))
+            lines.append(f"{rng.randint(100_000, 999_999)} {words}")
+        text = " ".join(
+            f"({line}) Tj 0 -16 Td" for line in lines
+        )
+        stream = f"BT /F1 11 Tf 72 740 Td {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    output = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+    output += f"startxref\n{xref}\n%%EOF\n"
+    return output.encode("latin-1")
+
+
+def write_photo(path, seed):
+    """Photo synthétique (JPEG 1200x900 avec Pillow, octets factices sinon)"""
+    if Image is None:
+        path.write_bytes(bytes([seed % 256]) * 50_000)
+        return
+    color = (seed * 37 % 256, seed * 91 % 256, seed * 53 % 256)
+    Image.new("RGB", (1200, 900), color).save(path, "JPEG", quality=85)
+
+
+def write_info(path, title, rng):
+    """info.yaml d'un dossier de manuel ou de produit"""
+    path.write_text(
+        f'title: "{title}"\n'
+        f'description: "{" ".join(rng.choices(WORDS, k=8))}"\n'
+        f'years: "{rng.randint(1990, 2024)}"\n'
+        "specs:\n"
+        f'  largeur: "{rng.randint(48, 120)} pouces"\n'
+        f'  poids: "{rng.randint(200, 900)} kg"\n',
+        encoding="utf-8",
+    )
+
+
+def build_catalog(root, rows, seed=0):
+    """Crée le site synthétique et retourne le nombre d'éléments par type"""
+    rng = random.Random(seed)
+    sizes = {
+        "rows": rows,
+        "manual_folders": max(1, int(rows * MANUAL_FOLDERS_RATIO)),
+        "product_folders": max(1, int(rows * PRODUCT_FOLDERS_RATIO)),
+        "pdf_models": max(1, int(rows * PDF_MODELS_RATIO)),
+    }
+
+    csv_dir = root / "scripts" / "data"
+    csv_dir.mkdir(parents=True)
+    (root / "data").mkdir()
+    with open(csv_dir / "produits.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for i in range(rows):
+            category = CATEGORIES[i % len(CATEGORIES)]
+            writer.writerow(
+                [
+                    f"SKU{i:06d}",
+                    f"{category.capitalize()} modèle {i}",
+                    category.capitalize(),
+                    f"{1000 + i % 5000}.99",
+                    "Prix suggéré",
+                    " ".join(rng.choices(WORDS, k=12)),
+                    f"images/produits/sku{i:06d}.jpg",
+                    f"manuels/{category}/modele-{i // 10}",
+                    "true" if i % 7 else "false",
+                    "true" if i % 11 == 0 else "false",
+                ]
+            )
+    with open(root / "data" / "specs.yaml", "w", encoding="utf-8") as f:
+        for i in range(rows):
+            f.write(
+                f"sku{i:06d}:\n"
+                f'  largeur: "{60 + i % 40} pouces"\n'
+                f'  poids: "{400 + i % 400} kg"\n'
+                f'  garantie: "{1 + i % 3} ans"\n'
+            )
+
+    for i in range(sizes["manual_folders"]):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        folder = root / "content" / "manuels" / category / f"modele-simple-{i}"
+        folder.mkdir(parents=True)
+        write_info(folder / "info.yaml", f"Modèle simple {i}", rng)
+        pdf = dummy_pdf(f"OM {i:05d}", PDF_PAGES, rng)
+        (folder / f"OM-{i:05d}-F.pdf").write_bytes(pdf)
+        write_photo(folder / "photo-1.jpg", i)
+
+    for i in range(sizes["product_folders"]):
+        folder = root / "content" / "produits" / f"produit-simple-{i}"
+        folder.mkdir(parents=True)
+        write_info(folder / "info.yaml", f"Produit simple {i}", rng)
+        (folder / f"fiche-{i}.pdf").write_bytes(dummy_pdf(f"FICHE {i}", 1, rng))
+        write_photo(folder / "photo-1.jpg", 10_000 + i)
+
+    for i in range(sizes["pdf_models"]):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        folder = root / "static" / "pdf" / "manuels" / category / f"modele-{i}"
+        folder.mkdir(parents=True)
+        for lang in ("A", "F"):
+            name = f"SA{i}B OM {i:04d}SB-{lang} rev{1 + i % 4} 0{1 + i % 9}-19.pdf"
+            (folder / name).write_bytes(dummy_pdf(f"OM {i:04d}", PDF_PAGES, rng))
+
+    return sizes
+
+
+def run_script(root, script, metrics_file):
+    """
+    Lance un script dans root. Retourne ses mesures: durée interne, temps
+    CPU et pic de mémoire du processus, compteurs
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(SCRIPTS_DIR / f"{script}.py"),
+            "--quiet",
+            "--metrics",
+            str(metrics_file),
+        ],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    if status != 0:
+        raise RuntimeError(f"{script}.py a échoué ({status})")
+
+    with open(metrics_file, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    counters = report["counters"]
+    # Éléments traités: documents indexés, ou sorties écrites et inchangées
+    items = counters.get("documents_indexed") or (
+        counters.get("files_written", 0)
+        + counters.get("files_skipped", 0)
+        + counters.get("files_copied", 0)
+    )
+    seconds = report["wall_seconds"]
+    return {
+        "seconds": seconds,
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 4),
+        # ru_maxrss est en Ko sous Linux
+        "rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "items": items,
+        "items_per_second": round(items / seconds, 1) if seconds else None,
+    }
+
+
+def run_scale(rows):
+    """Mesure tous les scripts, à froid puis en incrémental, pour une taille"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        sizes = build_catalog(root, rows)
+        print(
+            f"\nCatalogue de {rows} lignes: {sizes['manual_folders']} dossiers "
+            f"de manuels, {sizes['product_folders']} dossiers de produits, "
+            f"{sizes['pdf_models']} modèles PDF "
+            f"(créé en {time.perf_counter() - start:.1f} s)"
+        )
+        for mode in ("froid", "incrémental"):
+            for script in SCRIPTS:
+                key = f"{rows}/{mode}/{script}"
+                results[key] = run_script(root, script, root / "metrics.json")
+                print_row(key, results[key])
+    return results
+
+
+def print_row(key, result):
+    rate = result["items_per_second"]
+    rate = f"{rate:>10.0f}" if rate is not None else f"{'-':>10}"
+    print(
+        f"  {key:<44} {result['seconds']:>8.2f} {rate} "
+        f"{result['cpu_seconds']:>8.2f} {result['rss_mb']:>8.1f}"
+    )
+
+
+def compare(results, baseline, tolerance):
+    """
+    Régressions par rapport à la référence, et mesures absentes de la
+    référence
+    """
+    regressions = []
+    missing = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            missing.append(key)
+            continue
+        limit = max(
+            reference["seconds"] * (1 + tolerance),
+            reference["seconds"] + MIN_SECONDS_SLACK,
+        )
+        if result["seconds"] > limit:
+            regressions.append(
+                f"{key}: {result['seconds']:.2f} s "
+                f"(référence {reference['seconds']:.2f} s)"
+            )
+        limit = max(
+            reference["rss_mb"] * (1 + tolerance),
+            reference["rss_mb"] + MIN_RSS_SLACK_MB,
+        )
+        if result["rss_mb"] > limit:
+            regressions.append(
+                f"{key}: {result['rss_mb']:.1f} Mo "
+                f"(référence {reference['rss_mb']:.1f} Mo)"
+            )
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--output", type=Path, help="écrit aussi les résultats dans ce fichier JSON"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"  {'taille/mode/script':<44} {'temps (s)':>8} {'éléments/s':>10} "
+        f"{'CPU (s)':>8} {'RSS (Mo)':>8}"
+    )
+    results = {}
+    for rows in args.scales:
+        results.update(run_scale(rows))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline.update(results)
+        args.baseline.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(
+            f"\n❌ Pas de référence ({args.baseline}): lancer d'abord avec"
+            " --save-baseline sur cette machine"
+        )
+        sys.exit(1)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions, missing = compare(results, baseline, args.tolerance)
+    if len(missing) == len(results):
+        print(
+            f"\n❌ Aucune mesure dans la référence ({args.baseline}):"
+            " lancer d'abord avec --save-baseline pour ces tailles"
+        )
+        sys.exit(1)
+    if missing:
+        print(
+            f"\n⚠️ {len(missing)} mesure(s) absente(s) de la référence,"
+            " non comparée(s)"
+        )
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) (tolérance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    compared = len(results) - len(missing)
+    print(
+        f"\n✅ Aucune régression sur {compared} mesures"
+        f" (tolérance {args.tolerance:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la base SQLite du catalogue (scripts/catalog_db.py)
+Sur des catalogues synthétiques (ceux de bench-products-streaming.py),
+compare la lecture complète du CSV et de specs.yaml à la lecture de la base,
+et mesure l'import (base vide, catalogue inchangé, 1 % des lignes
+modifiées), l'export et la lecture du journal des changements.
+Usage: python scripts/benchmarks/bench-catalog-db.py [--sizes 10000 50000]
+"""
+
+import argparse
+import csv
+import importlib.util
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import catalog_db  # noqa: E402
+
+# Catalogues synthétiques de bench-products-streaming.py
+_spec = importlib.util.spec_from_file_location(
+    "bench_products_streaming", BENCH_DIR / "bench-products-streaming.py"
+)
+bench_products_streaming = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_products_streaming)
+
+# Part des lignes modifiées entre deux imports
+CHANGED_RATIO = 0.01
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def read_csv_path(csv_file, specs_file):
+    """Chemin sans base: CSV et specs.yaml relus en entier"""
+    products = catalog_db.read_csv(csv_file)
+    specs_data = catalog_db.read_specs(specs_file)
+    return [(p, specs_data.get(p["sku"].lower(), {})) for p in products]
+
+
+def read_db_path(db):
+    """Chemin avec base: produits et specs lus dans la base"""
+    specs_data = db.specs()
+    return [(p, specs_data.get(p["sku"].lower(), {})) for p in db.iter_products()]
+
+
+def modify_rows(csv_file, ratio):
+    """Change le prix d'une ligne sur 1 / ratio"""
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    step = max(1, int(1 / ratio))
+    for row in rows[::step]:
+        row["price"] = f"{float(row['price']) + 1:.2f}"
+    with open(csv_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=catalog_db.PRODUCT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows[::step])
+
+
+def bench(size):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        bench_products_streaming.write_catalog(root, size)
+        csv_file = root / "scripts" / "data" / "produits.csv"
+        specs_file = root / "data" / "specs.yaml"
+        db_file = root / "catalog.sqlite"
+
+        results = {}
+        results["lecture CSV + YAML"], expected = timed(
+            read_csv_path, csv_file, specs_file
+        )
+
+        with catalog_db.CatalogDB(db_file) as db:
+            results["import (base vide)"], _ = timed(
+                catalog_db.import_catalog, db, csv_file, specs_file
+            )
+            results["import (inchangé)"], _ = timed(
+                catalog_db.import_catalog, db, csv_file, specs_file
+            )
+            results["lecture base"], rows = timed(read_db_path, db)
+            if rows != expected:
+                raise AssertionError("La base ne relit pas le même catalogue")
+
+            processed = db.last_build()
+            modified = modify_rows(csv_file, CHANGED_RATIO)
+            results[f"import ({modified} modifiés)"], _ = timed(
+                catalog_db.import_catalog, db, csv_file, specs_file
+            )
+            results["journal des changements"], (upserts, _) = timed(
+                db.changes_since, processed
+            )
+            if len(upserts) != modified:
+                raise AssertionError(f"{len(upserts)} changements, {modified} attendus")
+
+            export_dir = root / "export"
+            export_dir.mkdir()
+            results["export CSV + YAML"], _ = timed(
+                catalog_db.export_catalog,
+                db,
+                export_dir / "produits.csv",
+                export_dir / "specs.yaml",
+            )
+
+        size_mb = db_file.stat().st_size / 1e6
+        print(f"\n{size} produits (base: {size_mb:.1f} Mo)")
+        for label, seconds in results.items():
+            print(f"  {label:<28} {seconds:>8.3f} s  {size / seconds:>10.0f} lignes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size)
+
+
+if __name__ == "__main__":
+    main()
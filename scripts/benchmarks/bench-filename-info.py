@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark et vérification de scripts/filename_info.py
+Vérifie parse_filename sur un corpus de noms de manuels (cas ambigus
+compris), puis mesure le débit (noms/s) de l'ancienne extraction
+d'index-manuals.py (quatre re.search et tests "-A" in nom), de
+parse_filename sans cache et de parse_filenames avec cache, sur des noms
+générés à la manière des dossiers de manuels réels (meilleure de
+REPEAT passes).
+Usage: python scripts/benchmarks/bench-filename-info.py [--names 100000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import filename_info  # noqa: E402
+from filename_info import FilenameInfo  # noqa: E402
+
+# Nom -> métadonnées attendues
+CORPUS = {
+    "SA92B-SA98B OM 0440SB92-A 21900001 rev3 01-19.pdf": FilenameInfo(
+        "Anglais", "0440SB92", "3", "01/2019"
+    ),
+    "SA92B-SA98B OM 0440SB92-F 21900001 rev3 01-19.pdf": FilenameInfo(
+        "Français", "0440SB92", "3", "01/2019"
+    ),
+    "OM-0440SB92-A.pdf": FilenameInfo("Anglais", "0440SB92"),
+    "OM-0440SB92-F.pdf": FilenameInfo("Français", "0440SB92"),
+    "B84A_OM_1234BR-FR_Rev.2_03-2021.pdf": FilenameInfo(
+        "Français", "1234BR", "2", "03/2021"
+    ),
+    "H64A OM 2210HM64-EN REV 12 11/2018.pdf": FilenameInfo(
+        "Anglais", "2210HM64", "12", "11/2018"
+    ),
+    "SA54 parts list ANG.pdf": FilenameInfo("Anglais"),
+    "DB6000-F.PDF": FilenameInfo("Français"),
+    # Un "-A" ou "-F" au début d'un mot n'est pas un code de langue
+    "BLADE-ASSEMBLY.pdf": FilenameInfo(),
+    "SA92B-ARCHIVE rev1.pdf": FilenameInfo(revision="1"),
+    "LAME-FRONTALE 06-2020.pdf": FilenameInfo(date="06/2020"),
+    "MANUEL-EXEMPLE.pdf": FilenameInfo(),
+    # "rev" dans un mot, numéro de série pris pour une date, mois invalide
+    "Preview2.pdf": FilenameInfo(),
+    "SA88TRCB 21900001 12-345.pdf": FilenameInfo(),
+    "OM 0550SA88 13-19.pdf": FilenameInfo(doc_number="0550SA88"),
+    "ROMAN 0440 parts.pdf": FilenameInfo(),
+}
+
+MODELS = ["SA92B", "SA98B", "B84A", "B94A", "H64A", "H76A", "SA88TRCB", "DB6000"]
+WORDS = ["parts", "pieces", "ASSEMBLY", "ARCHIVE", "liste", "manuel", "operator"]
+
+
+def legacy_extract(filename):
+    """Extraction d'index-manuals.py avant scripts/filename_info.py"""
+    info = {"title": "", "lang": "", "doc_number": "", "revision": "", "date": ""}
+
+    if "-A" in filename or " OM " in filename and "-A " in filename:
+        info["lang"] = "Anglais"
+    elif "-F" in filename or " OM " in filename and "-F " in filename:
+        info["lang"] = "Français"
+
+    date_match = re.search(r"(\d{2})[-/](\d{2,4})", filename)
+    if date_match:
+        month, year = date_match.groups()
+        if len(year) == 2:
+            year = "20" + year
+        info["date"] = f"{month}/{year}"
+
+    doc_match = re.search(r"OM\s+(\d+\w+)", filename)
+    if doc_match:
+        info["doc_number"] = doc_match.group(1)
+
+    rev_match = re.search(r"rev(\d+)", filename, re.IGNORECASE)
+    if rev_match:
+        info["revision"] = rev_match.group(1)
+
+    return info
+
+
+def generated_names(count, seed=0):
+    """
+    Noms à la manière des dossiers réels: les mêmes manuels reviennent d'un
+    modèle à l'autre (environ un nom sur trois est répété)
+    """
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        if names and rng.random() < 0.33:
+            names.append(rng.choice(names))
+            continue
+        model = rng.choice(MODELS)
+        lang = rng.choice("AF")
+        number = f"{rng.randrange(10000):04d}{model[:2]}{rng.randrange(100)}"
+        shape = i % 4
+        if shape == 0:
+            name = (
+                f"{model} OM {number}-{lang} {rng.randrange(10**8):08d}"
+                f" rev{rng.randrange(10)} {rng.randrange(1, 13):02d}-{rng.randrange(15, 25)}"
+            )
+        elif shape == 1:
+            name = f"OM-{number}-{lang}"
+        elif shape == 2:
+            name = f"{model}_{rng.choice(WORDS)}-{rng.choice(WORDS)}_Rev.{rng.randrange(5)}"
+        else:
+            name = f"{model} {rng.choice(WORDS)} {rng.randrange(1, 13):02d}/{rng.randrange(2015, 2025)}"
+        names.append(name + rng.choice((".pdf", ".PDF")))
+    return names
+
+
+def check():
+    """parse_filename donne les métadonnées attendues pour tout le corpus"""
+    failures = 0
+    for name, expected in CORPUS.items():
+        result = filename_info.parse_filename(name)
+        if result != expected:
+            failures += 1
+            print(f"  ✗ {name}\n      obtenu:  {result}\n      attendu: {expected}")
+    return failures
+
+
+# Passes par mesure: le meilleur temps est retenu
+REPEAT = 5
+
+
+def measure(name, parse, names):
+    timings = []
+    for _ in range(REPEAT):
+        filename_info.parse_filename.cache_clear()
+        start = time.perf_counter()
+        parse(names)
+        timings.append(time.perf_counter() - start)
+    print(f"  {name:<28} {len(names) / min(timings):>12.0f} noms/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--names", type=int, default=100000)
+    args = parser.parse_args()
+
+    failures = check()
+    if failures:
+        print(f"❌ {failures} nom(s) du corpus mal analysé(s)")
+        sys.exit(1)
+    print(f"Corpus: {len(CORPUS)} noms analysés correctement")
+
+    names = generated_names(args.names)
+    misclassified = sum(
+        1
+        for name in names
+        if legacy_extract(name)["lang"] != filename_info.parse_filename(name).lang
+    )
+    print(f"{len(names)} noms ({len(set(names))} distincts)")
+    print(f"  langue différente de l'ancienne extraction: {misclassified} noms")
+
+    measure("ancienne extraction", lambda ns: [legacy_extract(n) for n in ns], names)
+    measure(
+        "parse_filename (sans cache)",
+        lambda ns: [filename_info.parse_filename.__wrapped__(n) for n in ns],
+        names,
+    )
+    measure("parse_filenames", filename_info.parse_filenames, names)
+
+
+if __name__ == "__main__":
+    main()
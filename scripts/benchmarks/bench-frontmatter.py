@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark et vérification de scripts/frontmatter.py
+Vérifie que dump_frontmatter produit exactement le texte de yaml.dump et que
+ce texte se relit à l'identique (aller-retour), puis mesure le débit
+(pages/s) de chaque méthode sur des frontmatters produits et manuels.
+Usage: python scripts/benchmarks/bench-frontmatter.py [--pages 5000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import frontmatter  # noqa: E402
+
+CATEGORIES = ["Souffleuse", "Balais", "Débris", "Lames", "Options"]
+
+
+def product_frontmatter(i):
+    """Frontmatter de generate-products.py / process-simple-products.py"""
+    category = CATEGORIES[i % len(CATEGORIES)]
+    return {
+        "title": f"{category} modèle {i}",
+        "description": (
+            f"{category} professionnelle {60 + i % 40} pouces avec attache "
+            "rapide. Parfaite pour les tracteurs de grande taille et l'usage "
+            "commercial intensif."
+        ),
+        "date": "2024-01-01",
+        "categories": [category],
+        "tags": [category.lower(), "équipement", "hiver"],
+        "price": 1000 + (i % 5000) + 0.99,
+        "price_note": "Prix suggéré" if i % 3 else "",
+        "image": f"images/produits/sku{i:06d}.jpg",
+        "images": [f"images/produits/sku{i:06d}/photo-{n}.jpg" for n in range(3)],
+        "documents": [
+            {"title": f"Fiche-{i:06d}", "file": f"pdf/produits/sku{i:06d}/fiche.pdf"}
+        ],
+        "manual_ref": f"/manuels/{category.lower()}/modele-{i // 10}/",
+        "in_stock": bool(i % 7),
+        "featured": i % 11 == 0,
+        "sku": f"SKU{i:06d}",
+        "specs": {
+            "largeur": f"{60 + i % 40} pouces ({1500 + i % 1000} mm)",
+            "poids": f"{400 + i % 400} kg",
+            "capacite_neige": f"Jusqu'à {10 + i % 10} pouces",
+            "vitesse_rotation": "150-200 RPM",
+            "angle_inclinaison": "±25 degrés",
+            "garantie": f"{1 + i % 3} ans pièces et main-d'œuvre",
+        },
+        "draft": False,
+    }
+
+
+def manual_frontmatter(i):
+    """Frontmatter de index-manuals.py / process-simple-manuals.py"""
+    return {
+        "title": f"Modèle {i}",
+        "slug": f"modele-{i}",
+        "description": f"Manuels de pièces pour Modèle {i}",
+        "years": "2019+",
+        "draft": False,
+        "manuals": [
+            {
+                "title": f"OM-{i:04d}SB92-{lang[0]}",
+                "file": f"pdf/manuels/souffleuses/modele-{i}/OM-{i:04d}SB92-{lang[0]}.pdf",
+                "lang": lang,
+                "date": f"{1 + i % 12:02d}/2019",
+                "version": str(i % 5),
+                "description": f"Manuel {lang}",
+            }
+            for lang in ("Anglais", "Français")
+        ],
+    }
+
+
+def check(documents):
+    """Sortie identique à yaml.dump et aller-retour sans perte"""
+    for data in documents:
+        expected = yaml.dump(data, allow_unicode=True, sort_keys=False)
+        output = frontmatter.dump_frontmatter(data)
+        if output != expected:
+            raise AssertionError(f"Sortie différente:\n{output}\n---\n{expected}")
+        if yaml.safe_load(output) != data:
+            raise AssertionError(f"Aller-retour différent:\n{output}")
+
+
+def measure(name, dump, documents):
+    frontmatter._format_text.cache_clear()
+    start = time.perf_counter()
+    for data in documents:
+        dump(data)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<22} {len(documents) / elapsed:>10.0f} pages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5000)
+    args = parser.parse_args()
+
+    for label, factory in (
+        ("Produits", product_frontmatter),
+        ("Manuels", manual_frontmatter),
+    ):
+        documents = [factory(i) for i in range(args.pages)]
+        check(documents)
+        print(f"{label}: {len(documents)} pages identiques à yaml.dump")
+
+        measure(
+            "yaml.dump",
+            lambda data: yaml.dump(data, allow_unicode=True, sort_keys=False),
+            documents,
+        )
+        if frontmatter.CSafeDumper is not None:
+            measure(
+                "CSafeDumper",
+                lambda data: yaml.dump(
+                    data,
+                    Dumper=frontmatter.CSafeDumper,
+                    allow_unicode=True,
+                    sort_keys=False,
+                ),
+                documents,
+            )
+        measure("gabarits", frontmatter.dump_with_templates, documents)
+        measure("dump_frontmatter", frontmatter.dump_frontmatter, documents)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark du parcours des dossiers: anciens parcours vs scripts/file_inventory.py
+Crée une arborescence synthétique de manuels (catégorie/modèle/fichiers, avec
+des sous-dossiers archives) puis compare, pour le parcours de chaque script,
+l'ancienne version (iterdir, glob par extension, rglob) à l'inventaire
+construit en un seul passage avec os.scandir. Les appels os.stat et
+os.scandir sont comptés: ce sont eux qui coûtent cher sur un partage réseau.
+Usage: python scripts/benchmarks/bench-inventory.py [--files 200000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import file_inventory  # noqa: E402
+
+CATEGORIES = ["souffleuses", "balais", "debris", "lames", "options"]
+
+# Contenu d'un dossier de modèle (environ 10 fichiers)
+MODEL_FILES = [
+    "info.yaml",
+    "OM-{n}-A.pdf",
+    "OM-{n}-F.pdf",
+    "photo-1.jpg",
+    "photo-2.jpg",
+    "vue.png",
+    "notes.txt",
+]
+ARCHIVE_FILES = ["OM-{n}-A rev1.pdf", "OM-{n}-F rev1.pdf", "ancien.md"]
+
+
+def build_tree(root, file_count):
+    """Crée environ file_count fichiers vides"""
+    models = max(1, file_count // (len(MODEL_FILES) + len(ARCHIVE_FILES)))
+    for n in range(models):
+        model_dir = root / CATEGORIES[n % len(CATEGORIES)] / f"modele-{n}"
+        archive_dir = model_dir / "archives"
+        archive_dir.mkdir(parents=True)
+        for name in MODEL_FILES:
+            (model_dir / name.format(n=n)).touch()
+        for name in ARCHIVE_FILES:
+            (archive_dir / name.format(n=n)).touch()
+    return models
+
+
+# Anciens parcours, repris tels quels des scripts
+
+
+def legacy_index_manuals(root):
+    pdfs = []
+    for category_dir in root.iterdir():
+        if not category_dir.is_dir():
+            continue
+        for model_dir in category_dir.iterdir():
+            if not model_dir.is_dir():
+                continue
+            for pdf_file in model_dir.rglob("*.pdf"):
+                if (
+                    "archives" in str(pdf_file).lower()
+                    or "désuet" in str(pdf_file).lower()
+                ):
+                    continue
+                pdfs.append(pdf_file)
+    return len(pdfs)
+
+
+def legacy_simple_folders(root):
+    found = 0
+    for category_dir in root.iterdir():
+        if not category_dir.is_dir() or category_dir.name.startswith("_"):
+            continue
+        for model_dir in category_dir.iterdir():
+            if not model_dir.is_dir() or model_dir.name.startswith("_"):
+                continue
+            pdf_files = list(model_dir.glob("*.pdf"))
+            if not (model_dir / "info.yaml").exists() or not pdf_files:
+                continue
+            image_files = (
+                list(model_dir.glob("*.jpg"))
+                + list(model_dir.glob("*.jpeg"))
+                + list(model_dir.glob("*.png"))
+                + list(model_dir.glob("*.webp"))
+            )
+            found += len(pdf_files) + len(image_files)
+    return found
+
+
+def legacy_search_index(root):
+    md_files = [f for f in root.rglob("*.md")]
+    pdf_files = sorted(f for f in root.rglob("*.pdf") if f.is_file())
+    return len(md_files) + len(pdf_files)
+
+
+# Mêmes requêtes sur l'inventaire
+
+
+def inventory_index_manuals(root):
+    inventory = file_inventory.scan(root)
+    pdfs = []
+    for category in inventory.subdirs():
+        for model in inventory.subdirs(category):
+            for pdf_file in inventory.walk(category, model, extensions=(".pdf",)):
+                path_text = pdf_file.fspath.lower()
+                if "archives" in path_text or "désuet" in path_text:
+                    continue
+                pdfs.append(pdf_file)
+    return len(pdfs)
+
+
+def inventory_simple_folders(root):
+    inventory = file_inventory.scan(root)
+    found = 0
+    for category in inventory.subdirs():
+        if category.startswith("_"):
+            continue
+        for model in inventory.subdirs(category):
+            if model.startswith("_"):
+                continue
+            pdf_files = inventory.files(category, model, extensions=(".pdf",))
+            if not inventory.has_file(category, model, "info.yaml") or not pdf_files:
+                continue
+            image_files = inventory.files(
+                category, model, extensions=file_inventory.IMAGE_EXTENSIONS
+            )
+            found += len(pdf_files) + len(image_files)
+    return found
+
+
+def inventory_search_index(root):
+    inventory = file_inventory.scan(root)
+    md_files = list(inventory.walk(extensions=(".md",)))
+    pdf_files = sorted(f.path for f in inventory.walk(extensions=(".pdf",)))
+    return len(md_files) + len(pdf_files)
+
+
+class SyscallCounter:
+    """Compte les appels à os.stat et os.scandir (pathlib passe par eux)"""
+
+    def __init__(self):
+        self.counts = {"stat": 0, "scandir": 0}
+
+    def __enter__(self):
+        self._stat, self._scandir = os.stat, os.scandir
+
+        def stat(*args, **kwargs):
+            self.counts["stat"] += 1
+            return self._stat(*args, **kwargs)
+
+        def scandir(*args, **kwargs):
+            self.counts["scandir"] += 1
+            return self._scandir(*args, **kwargs)
+
+        os.stat, os.scandir = stat, scandir
+        return self
+
+    def __exit__(self, *exc):
+        os.stat, os.scandir = self._stat, self._scandir
+
+
+def measure(walker, root, repeat):
+    with SyscallCounter() as counter:
+        result = walker(root)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        walker(root)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings), counter.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "manuels"
+        models = build_tree(root, args.files)
+        print(f"Arborescence: {models} modèles, environ {args.files} fichiers")
+        print()
+        print(
+            f"{'parcours':<24} {'méthode':<12} {'temps (s)':>10} "
+            f"{'stat':>9} {'scandir':>9}"
+        )
+
+        for label, legacy, inventory in (
+            ("index-manuals", legacy_index_manuals, inventory_index_manuals),
+            ("process-simple-*", legacy_simple_folders, inventory_simple_folders),
+            ("generate-search-index", legacy_search_index, inventory_search_index),
+        ):
+            rows = []
+            for method, walker in (("ancien", legacy), ("inventaire", inventory)):
+                result, elapsed, counts = measure(walker, root, args.repeat)
+                rows.append(result)
+                print(
+                    f"{label:<24} {method:<12} {elapsed:>10.2f} "
+                    f"{counts['stat']:>9} {counts['scandir']:>9}"
+                )
+            if rows[0] != rows[1]:
+                raise AssertionError(f"{label}: résultats différents {rows}")
+
+
+if __name__ == "__main__":
+    main()
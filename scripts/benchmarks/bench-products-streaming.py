@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark de generate-products.py: chargement complet vs mode --stream
+Génère des catalogues synthétiques de 1k, 10k et 100k SKU, puis mesure le
+temps, le débit (pages/s) et la mémoire maximale (RSS) de chaque mode.
+Usage: python scripts/benchmarks/bench-products-streaming.py [--sizes 1000 10000]
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "generate-products.py"
+
+CSV_FIELDS = [
+    "sku",
+    "name",
+    "category",
+    "price",
+    "price_note",
+    "description",
+    "image",
+    "manual_ref",
+    "in_stock",
+    "featured",
+]
+CATEGORIES = ["Souffleuse", "Balais", "Débris", "Lames", "Options"]
+
+
+def write_catalog(root, size):
+    """Écrit un CSV et un specs.yaml synthétiques de size produits"""
+    csv_dir = root / "scripts" / "data"
+    csv_dir.mkdir(parents=True)
+    (root / "data").mkdir()
+
+    with open(csv_dir / "produits.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for i in range(size):
+            category = CATEGORIES[i % len(CATEGORIES)]
+            writer.writerow(
+                [
+                    f"SKU{i:06d}",
+                    f"{category} modèle {i}",
+                    category,
+                    f"{1000 + i % 5000}.99",
+                    "Prix suggéré",
+                    f"Équipement {category.lower()} numéro {i} pour usage commercial.",
+                    f"images/produits/sku{i:06d}.jpg",
+                    f"manuels/{category.lower()}/modele-{i // 10}",
+                    "true" if i % 7 else "false",
+                    "true" if i % 11 == 0 else "false",
+                ]
+            )
+
+    with open(root / "data" / "specs.yaml", "w", encoding="utf-8") as f:
+        for i in range(size):
+            f.write(
+                f"sku{i:06d}:\n"
+                f'  largeur: "{60 + i % 40} pouces ({1500 + i % 1000} mm)"\n'
+                f'  poids: "{400 + i % 400} kg"\n'
+                f'  capacite_neige: "Jusqu\'à {10 + i % 10} pouces"\n'
+                f'  systeme_rotation: "Hydraulique"\n'
+                f'  garantie: "{1 + i % 3} ans"\n\n'
+            )
+
+
+def run_generator(root, extra_args):
+    """Lance le générateur dans root et retourne (secondes, RSS max en Mo)"""
+    shutil.rmtree(root / "content", ignore_errors=True)
+    shutil.rmtree(root / ".build-cache", ignore_errors=True)
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(SCRIPT), *extra_args],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f"generate-products.py a échoué ({status})")
+
+    # ru_maxrss est en Ko sous Linux
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'SKU':>8} {'mode':>8} {'temps (s)':>10} {'pages/s':>10} {'RSS (Mo)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write_catalog(root, size)
+            for mode, extra_args in (("complet", []), ("stream", ["--stream"])):
+                elapsed, rss = run_generator(root, extra_args)
+                print(
+                    f"{size:>8} {mode:>8} {elapsed:>10.2f} "
+                    f"{size / elapsed:>10.0f} {rss:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'index de recherche: tableau JSON plat vs index inversé
+Construit un corpus synthétique (50k pages par défaut), puis compare la taille
+des fichiers produits et la latence des requêtes. Les deux algorithmes du
+client (parcours linéaire avec includes() et intersection de listes triées)
+sont reproduits en Python pour une comparaison à armes égales.
+Usage: python scripts/benchmarks/bench-search-index.py [--pages 50000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+WORDS = (
+    "souffleuse balais lame débris option hydraulique électrique rotation "
+    "déversement attache rapide tracteur neige pouces capacité garantie "
+    "pièces manuel entretien commercial professionnel compacte largeur "
+    "poids hauteur moteur courroie roulement engrenage vis sans fin goupille "
+    "cisaillement déflecteur cheminée patins usure boulon écrou rondelle "
+    "ressort joint filtre huile chaîne pignon arbre palier"
+).split()
+SECTIONS = ["produits", "manuels"]
+
+
+def load_generator():
+    """Importe le générateur de l'index (scripts/generators/search_index.py)"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    from generators import search_index
+
+    return search_index
+
+
+def synthetic_entries(count, rng):
+    """Pages avec un vocabulaire de fréquence zipfienne et des numéros de pièce"""
+    weights = [1 / rank for rank in range(1, len(WORDS) + 1)]
+    entries = []
+    for i in range(count):
+        words = rng.choices(WORDS, weights=weights, k=200)
+        parts = [str(rng.randint(100_000, 999_999)) for _ in range(30)]
+        sku = f"SA{i % 997:03d}B"
+        entries.append(
+            {
+                "title": f"{words[0].capitalize()} {sku}",
+                "description": " ".join(words[1:15]),
+                "url": f"/tempete/{SECTIONS[i % 2]}/modele-{i}/",
+                "content": f"Référence {sku} "
+                + " ".join(words[15:])
+                + " Pièces: "
+                + " ".join(parts),
+                "section": SECTIONS[i % 2],
+            }
+        )
+    return entries
+
+
+def flat_search(entries, query, limit=10):
+    """Ancien client: filter() + toLowerCase().includes() sur chaque entrée"""
+    query = query.lower()
+    results = []
+    for item in entries:
+        if (
+            query in item["title"].lower()
+            or query in item["description"].lower()
+            or query in item["content"].lower()
+        ):
+            results.append(item)
+    return results[:limit]
+
+
+def decode(deltas):
+    ids = []
+    current = 0
+    for delta in deltas:
+        current += delta
+        ids.append(current)
+    return ids
+
+
+def inverted_search(generator, index, docs, query, limit=10):
+    """Nouveau client: intersection des listes de documents de chaque terme"""
+    ids = None
+    for term in generator.tokenize(query):
+        postings = set(decode(index.get(term, [])))
+        ids = postings if ids is None else ids & postings
+        if not ids:
+            return []
+    return [docs[doc_id] for doc_id in sorted(ids or [])[:limit]]
+
+
+def time_queries(search, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    generator = load_generator()
+    entries = synthetic_entries(args.pages, rng)
+
+    # Ancien format: contenu tronqué à 500 caractères, JSON indenté
+    flat = [dict(entry, content=entry["content"][:500]) for entry in entries]
+    flat_size = len(json.dumps(flat, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    start = time.perf_counter()
+    docs, index = generator.build_inverted_index(entries)
+    build_time = time.perf_counter() - start
+    docs_size = len(
+        json.dumps(
+            generator.doc_columns(entries, {}, {}),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    )
+    index_size = len(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+    # Requêtes typiques: un ou deux mots, un SKU ou un numéro de pièce
+    queries = []
+    for i in range(args.queries):
+        entry = rng.choice(entries)
+        kind = i % 3
+        if kind == 0:
+            queries.append(" ".join(rng.sample(WORDS, rng.randint(1, 2))))
+        elif kind == 1:
+            queries.append(entry["title"].split()[-1])
+        else:
+            queries.append(entry["content"].split()[-1])
+    flat_median, flat_max = time_queries(
+        lambda q: flat_search(flat, q), queries
+    )
+    inverted_median, inverted_max = time_queries(
+        lambda q: inverted_search(generator, index, docs, q), queries
+    )
+
+    print(f"Corpus: {args.pages} pages, {len(index)} termes indexés")
+    print(f"Construction de l'index inversé: {build_time:.1f} s")
+    print()
+    print(f"{'format':<22} {'taille (Mo)':>12} {'médiane (ms)':>13} {'max (ms)':>10}")
+    print(
+        f"{'plat (500 car.)':<22} {flat_size / 1e6:>12.1f} "
+        f"{flat_median:>13.2f} {flat_max:>10.2f}"
+    )
+    print(
+        f"{'inversé (texte complet)':<22} {(docs_size + index_size) / 1e6:>12.1f} "
+        f"{inverted_median:>13.2f} {inverted_max:>10.2f}"
+    )
+    print(f"  dont documents: {docs_size / 1e6:.1f} Mo, index: {index_size / 1e6:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
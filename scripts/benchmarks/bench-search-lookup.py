@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche d'identifiants pendant la saisie (lookup.json)
+Construit la table de bigrammes de scripts/generators/search_index.py pour un
+catalogue synthétique (50k produits par défaut, chacun avec un SKU et le
+numéro de document de son manuel), puis exécute sous Node.js le code de
+static/js/search-worker.js sur des requêtes tapées comme au comptoir: SKU
+exact, préfixe en minuscules, avec espace ("sa 92"), inversion ou faute de
+frappe, numéro de document. Affiche la taille de la table, le temps de
+décodage et la latence par requête (médiane, p99, max), et vérifie que
+l'identifiant visé est trouvé.
+Usage: python scripts/benchmarks/bench-search-lookup.py [--products 50000]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+WORKER = SCRIPTS_DIR.parent / "static" / "js" / "search-worker.js"
+
+FAMILIES = ["SA", "B", "H", "DB", "TR", "LM", "SN", "BL"]
+LETTERS = "ABCDEFGHJKLMNPRSTUVWXYZ"
+
+# Exécuté par node: décode la table, puis chronomètre matchKeys par requête
+NODE_SCRIPT = """
+const fs = require('fs');
+const worker = require(process.argv[1]);
+const data = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+const queries = JSON.parse(fs.readFileSync(process.argv[3], 'utf8'));
+let start = process.hrtime.bigint();
+const table = worker.prepareLookup(data);
+const prepare = Number(process.hrtime.bigint() - start) / 1e6;
+for (const [query] of queries) worker.matchKeys(table, query, 10);
+const results = queries.map(([query, target]) => {
+  start = process.hrtime.bigint();
+  const ids = worker.matchKeys(table, query, 10);
+  const ms = Number(process.hrtime.bigint() - start) / 1e6;
+  return [ms, ids.indexOf(target)];
+});
+console.log(JSON.stringify({ prepare: prepare, results: results }));
+"""
+
+
+def load_generator():
+    """Importe le générateur de l'index (scripts/generators/search_index.py)"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    from generators import search_index
+
+    return search_index
+
+
+def synthetic_entries(count, rng):
+    """Un document par produit: son SKU et le numéro de document du manuel"""
+    skus = set()
+    entries = []
+    while len(entries) < count:
+        family = rng.choice(FAMILIES)
+        sku = f"{family}{rng.randrange(10, 10000)}{rng.choice(LETTERS)}"
+        if sku in skus:
+            continue
+        skus.add(sku)
+        doc_number = f"{rng.randrange(10000):04d}{sku}"
+        entries.append({"keys": [sku, doc_number]})
+    return entries
+
+
+def typo(text, rng):
+    """Une faute de frappe: inversion de deux caractères ou substitution"""
+    i = rng.randrange(1, len(text) - 1)
+    if rng.random() < 0.5:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+    replacement = rng.choice([c for c in "0123456789" if c != text[i]])
+    return text[:i] + replacement + text[i + 1 :]
+
+
+def queries_for(entries, count, rng):
+    """Requêtes (type, texte, document visé)"""
+    kinds = ["exact", "minuscules", "espace", "préfixe", "faute", "document"]
+    queries = []
+    for i in range(count):
+        doc_id = rng.randrange(len(entries))
+        sku, doc_number = entries[doc_id]["keys"]
+        kind = kinds[i % len(kinds)]
+        if kind == "exact":
+            text = sku
+        elif kind == "minuscules":
+            text = sku.lower()
+        elif kind == "espace":
+            split = len(sku.rstrip("0123456789" + LETTERS)) or 1
+            text = f"{sku[:split].lower()} {sku[split:]}"
+        elif kind == "préfixe":
+            text = sku[: max(3, len(sku) - 1)]
+        elif kind == "faute":
+            text = typo(sku, rng)
+        else:
+            text = doc_number
+        queries.append((kind, text, doc_id))
+    return queries
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=600)
+    args = parser.parse_args()
+
+    node = shutil.which("node")
+    if node is None:
+        print("❌ Node.js introuvable: nécessaire pour exécuter search-worker.js")
+        sys.exit(1)
+
+    rng = random.Random(42)
+    generator = load_generator()
+    entries = synthetic_entries(args.products, rng)
+    lookup = generator.build_lookup(entries)
+    text = json.dumps(lookup, separators=(",", ":"))
+    queries = queries_for(entries, args.queries, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lookup_file = Path(tmp) / "lookup.json"
+        lookup_file.write_text(text, encoding="utf-8")
+        queries_file = Path(tmp) / "queries.json"
+        queries_file.write_text(
+            json.dumps([[query, doc_id] for _, query, doc_id in queries]),
+            encoding="utf-8",
+        )
+        output = subprocess.run(
+            [node, "-e", NODE_SCRIPT, str(WORKER), str(lookup_file), str(queries_file)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    measures = json.loads(output)
+
+    size = len(text.encode("utf-8"))
+    gzipped = len(gzip.compress(text.encode("utf-8"), 9))
+    print(
+        f"Table: {len(lookup['keys'])} clés, {len(lookup['grams'])} bigrammes, "
+        f"{size / 1e6:.1f} Mo ({gzipped / 1e6:.1f} Mo gzip)"
+    )
+    print(f"Décodage dans le worker: {measures['prepare']:.1f} ms (une fois)")
+    print()
+    print(f"{'requête':<12} {'médiane':>9} {'p99':>9} {'max':>9} {'en tête':>9} {'trouvé':>8}")
+    by_kind = {}
+    for (kind, _, _), result in zip(queries, measures["results"]):
+        by_kind.setdefault(kind, []).append(result)
+    by_kind["toutes"] = measures["results"]
+    for kind, results in by_kind.items():
+        timings = [ms for ms, _ in results]
+        first = sum(1 for _, rank in results if rank == 0) / len(results)
+        found = sum(1 for _, rank in results if rank >= 0) / len(results)
+        print(
+            f"{kind:<12} {statistics.median(timings):>7.2f}ms "
+            f"{percentile(timings, 0.99):>7.2f}ms {max(timings):>7.2f}ms "
+            f"{first:>9.0%} {found:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test de charge du service de recherche (scripts/search_service.py)
+Sans --url, construit l'index binaire d'un corpus synthétique (celui de
+bench-search-index.py, 50k pages par défaut), mesure son ouverture, lance
+le service sur un port libre et l'interroge; avec --url, interroge un
+service déjà lancé. Les requêtes (un ou deux mots, mots en cours de saisie,
+SKU) suivent une loi de Zipf, comme au comptoir: les plus fréquentes
+profitent du cache LRU. Affiche les requêtes par seconde, la latence
+(p50, p90, p99, max) et l'efficacité du cache.
+Usage: python scripts/benchmarks/bench-search-service.py [--pages 50000]
+           [--requests 20000] [--concurrency 32] [--url http://127.0.0.1:8765]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from search_postings import PostingsIndex, write_postings  # noqa: E402
+
+# Corpus synthétique de bench-search-index.py
+_spec = importlib.util.spec_from_file_location(
+    "bench_search_index", BENCH_DIR / "bench-search-index.py"
+)
+bench_search_index = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_search_index)
+
+# Nombre de requêtes distinctes tirées selon la loi de Zipf
+DISTINCT_QUERIES = 2000
+
+# Délai maximal de démarrage du service (secondes)
+START_TIMEOUT = 30
+
+
+def build_index(pages, path, rng):
+    """Index binaire d'un corpus synthétique; retourne sa taille"""
+    search_index = bench_search_index.load_generator()
+    entries = bench_search_index.synthetic_entries(pages, rng)
+    docs, index = search_index.build_inverted_index(entries)
+    postings = {token: list(accumulate(deltas)) for token, deltas in index.items()}
+    return write_postings(path, docs, postings)
+
+
+def query_pool(rng):
+    """Requêtes distinctes, de la plus fréquente à la plus rare"""
+    words = bench_search_index.WORDS
+    queries = []
+    while len(queries) < DISTINCT_QUERIES:
+        kind = len(queries) % 4
+        if kind == 0:
+            query = rng.choice(words)
+        elif kind == 1:
+            query = " ".join(rng.sample(words, 2))
+        elif kind == 2:
+            # Mot en cours de saisie
+            word = rng.choice(words)
+            query = word[: rng.randint(2, max(2, len(word) - 1))]
+        else:
+            query = f"SA{rng.randrange(997):03d}B"
+        queries.append(query)
+    return queries
+
+
+def zipf_queries(pool, count, rng):
+    weights = [1 / rank for rank in range(1, len(pool) + 1)]
+    return rng.choices(pool, weights=weights, k=count)
+
+
+async def http_get(reader, writer, host, path):
+    """Requête GET keep-alive; retourne le statut et le corps"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def worker(host, port, queries, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while queries:
+            query = queries.pop()
+            start = time.perf_counter()
+            status, _ = await http_get(reader, writer, host, f"/search?q={quote(query)}")
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await http_get(reader, writer, host, "/stats")
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def load(host, port, queries, concurrency):
+    latencies = []
+    errors = []
+    pending = list(reversed(queries))
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(worker(host, port, pending, latencies, errors) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed, await fetch_stats(host, port)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(host, port, process):
+    """Attend que le service accepte les connexions"""
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("le service s'est arrêté au démarrage")
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("le service ne répond pas")
+
+
+def report(latencies, errors, elapsed, stats):
+    cache = stats["cache"]
+    print(
+        f"{len(latencies)} requêtes en {elapsed:.2f} s:"
+        f" {len(latencies) / elapsed:.0f} requêtes/s, {len(errors)} erreurs"
+    )
+    print(
+        f"Latence: p50 {percentile(latencies, 0.50):.2f} ms,"
+        f" p90 {percentile(latencies, 0.90):.2f} ms,"
+        f" p99 {percentile(latencies, 0.99):.2f} ms,"
+        f" max {max(latencies):.2f} ms"
+    )
+    print(
+        f"Cache: {cache['hit_rate']:.0%} de succès"
+        f" ({cache['size']}/{cache['max_size']} réponses)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--url", help="service déjà lancé (ex. http://127.0.0.1:8765)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    queries = zipf_queries(query_pool(rng), args.requests, rng)
+
+    if args.url:
+        url = urlsplit(args.url)
+        report(*asyncio.run(load(url.hostname, url.port, queries, args.concurrency)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "search-index.bin"
+        start = time.perf_counter()
+        size = build_index(args.pages, index_file, rng)
+        print(
+            f"Index: {args.pages} pages, {size / 1e6:.1f} Mo,"
+            f" écrit en {time.perf_counter() - start:.1f} s"
+        )
+        start = time.perf_counter()
+        with PostingsIndex(index_file) as index:
+            opened = (time.perf_counter() - start) * 1000
+            print(f"Ouverture (mmap): {opened:.2f} ms, {index.term_count} termes")
+
+        host, port = "127.0.0.1", free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                str(SCRIPTS_DIR / "search-service.py"),
+                "--index",
+                str(index_file),
+                "--port",
+                str(port),
+                "--cache-size",
+                str(args.cache_size),
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(host, port, process)
+            report(*asyncio.run(load(host, port, queries, args.concurrency)))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
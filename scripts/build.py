@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Build complet du contenu en un seul processus
+Usage: python scripts/build.py [--jobs N] [--stream] [--sequential] [--watch]
+                              [--output data] [--catalog BASE]
+                              [--service-index [FICHIER]]
+
+Enchaîne les générateurs de scripts/generators/ comme étapes d'un graphe
+(voir scripts/pipeline.py):
+
+    produits ───────────┐
+    produits-simples ───┤
+    manuels-simples ─── manuels ─── recherche
+
+Les trois premières étapes sont indépendantes et tournent en parallèle.
+manuels attend manuels-simples, qui copie les PDF dans static/pdf/manuels/.
+recherche attend toutes les autres et lit les enregistrements de recherche
+des pages qu'elles viennent d'écrire (scripts/search_records.py), sans
+garder leur texte en mémoire. Le résultat est identique à celui des scripts
+lancés un par un, dans l'ordre du workflow de déploiement.
+
+Avec --output data, les pages produits et les pages de manuels sont écrites
+dans data/products.json et data/manuals.json au lieu d'un fichier par page
+(voir scripts/data_pages.py).
+
+Avec --catalog, les pages produits sont générées à partir de la base SQLite
+du catalogue (voir scripts/catalog_db.py).
+
+Avec --watch, le build reste actif et ne relance que les étapes touchées
+par chaque modification (voir scripts/watcher.py).
+
+Avec --service-index, l'étape recherche écrit aussi l'index binaire du
+service de recherche local (voir scripts/search_service.py), tenu à jour à
+chaque rebuild du mode --watch.
+"""
+
+import argparse
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+from generators.manuals import index_manuals
+from generators.products import generate_products
+from generators.search_index import build_search_index
+from generators.simple_manuals import process_manual_folders
+from generators.simple_products import process_product_folders
+from build_metrics import add_arguments, session
+from data_pages import add_output_argument
+from pipeline import Stage, run_stages, timing_report
+from search_postings import INDEX_FILE
+from watcher import watch
+
+
+def build_stages(
+    jobs=1,
+    stream=False,
+    pages=None,
+    search=None,
+    output="pages",
+    catalog=None,
+    service_index=None,
+):
+    """
+    Étapes du build. pages, partagé par toutes les étapes, reçoit le chemin
+    des fichiers écrits sans enregistrement de recherche (voir
+    BuildManifest.rendered); search remplace la fonction de l'étape recherche
+    (index gardé en mémoire du mode --watch). output est le mode de sortie
+    des pages produits et des pages de manuels ("pages" ou "data"); catalog
+    la base SQLite du catalogue, s'il y en a une; service_index l'index
+    binaire du service de recherche, s'il faut l'écrire.
+    """
+    if pages is None:
+        pages = set()
+    if search is None:
+
+        def search():
+            build_search_index(jobs=jobs, service_index=service_index)
+
+    return [
+        Stage(
+            "produits",
+            lambda: generate_products(
+                jobs=jobs, stream=stream, pages=pages, output=output, catalog=catalog
+            ),
+        ),
+        Stage(
+            "manuels-simples",
+            lambda: process_manual_folders(jobs=jobs, pages=pages),
+        ),
+        Stage(
+            "produits-simples",
+            lambda: process_product_folders(jobs=jobs, pages=pages),
+        ),
+        Stage(
+            "manuels",
+            lambda: index_manuals(jobs=jobs, pages=pages, output=output),
+            after=["manuels-simples"],
+        ),
+        Stage(
+            "recherche",
+            search,
+            after=["produits", "manuels-simples", "produits-simples", "manuels"],
+        ),
+    ]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Génère tout le contenu du site en un seul processus"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="nombre de processus de chaque étape (rendu, images, PDF)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="lit specs.yaml SKU par SKU au lieu de tout charger en mémoire",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="lance les étapes une par une au lieu de les paralléliser",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="reste actif et régénère ce qui dépend des fichiers modifiés",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        metavar="BASE",
+        help="génère les pages produits à partir de cette base SQLite"
+        " (scripts/catalog-db.py)",
+    )
+    parser.add_argument(
+        "--service-index",
+        type=Path,
+        nargs="?",
+        const=INDEX_FILE,
+        metavar="FICHIER",
+        help="écrit aussi l'index binaire de scripts/search-service.py"
+        f" (par défaut: {INDEX_FILE})",
+    )
+    add_output_argument(parser)
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.watch:
+        with session("build --watch", args):
+            make_stages = partial(
+                build_stages, output=args.output, catalog=args.catalog
+            )
+            watch(
+                make_stages,
+                jobs=args.jobs,
+                stream=args.stream,
+                service_index=args.service_index,
+            )
+        return
+
+    print("🏗️  Build du contenu...")
+
+    stages = build_stages(
+        jobs=args.jobs,
+        stream=args.stream,
+        output=args.output,
+        catalog=args.catalog,
+        service_index=args.service_index,
+    )
+    with session("build", args):
+        start = time.perf_counter()
+        ok = run_stages(stages, parallel=not args.sequential)
+        total = time.perf_counter() - start
+
+    print()
+    print(timing_report(stages, total))
+    print(f"📊 Mesures: {args.metrics}")
+    if not ok:
+        print("\n❌ Build incomplet")
+        sys.exit(1)
+    print("\n✅ Build terminé!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+"""
+Cache de build incrémental partagé par les scripts de génération
+
+Chaque script tient un manifeste (.build-cache/<générateur>.json) qui associe
+chaque fichier produit à l'empreinte de ses entrées (ligne CSV, entrée de
+specs.yaml, info.yaml, PDF, images, version du générateur). Un fichier n'est
+réécrit que si cette empreinte change, et les fichiers produits lors d'un
+build précédent mais plus générés (orphelins) sont supprimés.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from build_metrics import count
+from search_records import RecordLog
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CACHE_DIR = Path(".build-cache")
+
+# Nombre de pages rendues et écrites par tâche envoyée aux processus
+WRITE_CHUNK_SIZE = 64
+
+# Taille des blocs lus lors du hachage des fichiers (PDF volumineux)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Threads de synchronisation des fichiers statiques: le travail est surtout
+# des entrées/sorties (hachage, copie), qui libèrent le GIL
+SYNC_THREADS = min(32, (os.cpu_count() or 1) * 4)
+
+# ioctl Linux de clonage d'un fichier (reflink sur btrfs, XFS...)
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+
+def hash_bytes(data):
+    """Retourne l'empreinte SHA-256 d'un contenu binaire"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text):
+    """Retourne l'empreinte SHA-256 d'un texte encodé en UTF-8"""
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_inputs(*parts):
+    """Calcule une empreinte stable à partir de valeurs sérialisables en JSON"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hash_text(payload)
+
+
+def hash_path(path):
+    """Empreinte SHA-256 du contenu d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(source, target):
+    """Clone source vers target sans copier les données (copie sur écriture)"""
+    if fcntl is None:
+        raise OSError("reflink non disponible")
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, target)
+
+
+def clone_file(source, target, link=True):
+    """
+    Place une copie de source en target et retourne la méthode utilisée:
+    "reflink" ou "lien" (lien physique) si le système de fichiers le
+    permet et que link est vrai, sinon "copie". Le fichier est d'abord
+    écrit à côté de target puis renommé, pour ne jamais laisser de fichier
+    partiel.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    if link:
+        try:
+            _reflink(source, tmp_path)
+            os.replace(tmp_path, target)
+            return "reflink"
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        try:
+            os.link(source, tmp_path)
+            os.replace(tmp_path, target)
+            return "lien"
+        except OSError:
+            pass
+
+    shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+    return "copie"
+
+
+def _sync_file(source, target, version, source_hash, target_inputs, target_stat, link):
+    """
+    Synchronise un fichier (exécuté dans un thread du pool). source_hash
+    est None si le contenu de la source doit être haché. Si target contient
+    déjà ce contenu (target_inputs et target_stat sont ceux du manifeste),
+    rien n'est copié. Retourne (empreinte source, méthode ou None).
+    """
+    if source_hash is None:
+        source_hash = hash_path(source)
+    if target_inputs == hash_inputs(version, source_hash) and target_stat:
+        try:
+            stat = os.stat(target)
+        except OSError:
+            stat = None
+        if stat and [stat.st_size, stat.st_mtime_ns] == target_stat:
+            return source_hash, None
+    return source_hash, clone_file(source, target, link)
+
+
+def _write_page(output, render, args):
+    """Rend une page et l'écrit sur disque"""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    text = render(*args)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _write_chunk(tasks):
+    """Rend et écrit un lot de pages (exécuté dans un processus du pool)"""
+    for output, render, args in tasks:
+        _write_page(output, render, args)
+
+
+class BuildManifest:
+    """Manifeste des fichiers produits par un générateur"""
+
+    def __init__(self, generator, version, cache_dir=CACHE_DIR):
+        self.generator = generator
+        self.version = str(version)
+        self.path = Path(cache_dir) / f"{generator}.json"
+        self.outputs = {}
+        self.files = {}
+        self.seen = set()
+        self.written = 0
+        self.skipped = 0
+        # Bilan de sync_files: octets copiés / inchangés, méthodes de copie
+        self.bytes_copied = 0
+        self.bytes_skipped = 0
+        self.sync_methods = Counter()
+        # Ensemble optionnel qui reçoit le chemin des fichiers réécrits par
+        # write_text et write_many sans enregistrement de recherche (fichiers
+        # de données, pages sans @renders), partagé entre les étapes de
+        # scripts/build.py. Les pages avec enregistrement n'y sont pas: leur
+        # nombre, comme la mémoire, ne dépend pas de la taille du catalogue.
+        self.rendered = None
+        # Journal des enregistrements de recherche des pages écrites (voir
+        # scripts/search_records.py)
+        self.records = RecordLog(generator, Path(cache_dir) / "search")
+        self._load()
+
+    def _load(self):
+        """Charge le manifeste du build précédent, s'il est compatible"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # Un changement de version du générateur invalide toutes les sorties,
+        # mais on garde la liste pour pouvoir supprimer les orphelins
+        self.outputs = data.get("outputs", {})
+        if data.get("version") != self.version:
+            for entry in self.outputs.values():
+                entry["inputs"] = None
+        self.files = data.get("files", {})
+
+    def save(self):
+        """Écrit le manifeste sur disque"""
+        self.records.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "generator": self.generator,
+            "version": self.version,
+            "outputs": {key: self.outputs[key] for key in sorted(self.outputs)},
+            "files": {key: self.files[key] for key in sorted(self.files)},
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def hash_file(self, path, stat=None):
+        """
+        Empreinte du contenu d'un fichier, mise en cache selon taille et mtime.
+        stat évite un nouvel appel système quand il est déjà connu
+        (FileInfo.stat de l'inventaire).
+        """
+        path = Path(path)
+        if stat is None:
+            stat = path.stat()
+        file_hash = self.cached_hash(path, stat)
+        if file_hash is not None:
+            return file_hash
+
+        file_hash = hash_path(path)
+        self.files[str(path)] = [stat.st_size, stat.st_mtime_ns, file_hash]
+        return file_hash
+
+    def cached_hash(self, path, stat):
+        """Empreinte connue d'un fichier si sa taille et son mtime n'ont pas changé"""
+        cached = self.files.get(str(path))
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        return None
+
+    def owns(self, output):
+        """Indique si le fichier a été produit par ce générateur"""
+        return str(output) in self.outputs
+
+    def is_modified(self, output):
+        """Indique si une sortie de ce générateur a été modifiée à la main"""
+        entry = self.outputs.get(str(output))
+        if not entry or not Path(output).exists():
+            return False
+        return self.hash_file(output) != entry.get("output")
+
+    def release(self, output):
+        """Retire une sortie du manifeste sans la supprimer"""
+        self.outputs.pop(str(output), None)
+        self.records.remove(output)
+
+    def is_fresh(self, output, inputs_hash):
+        """Vérifie qu'une sortie existe, est intacte et correspond aux entrées"""
+        entry = self.outputs.get(str(output))
+        if not entry or entry.get("inputs") != inputs_hash:
+            return False
+
+        output = Path(output)
+        if not output.exists():
+            return False
+        return self.hash_file(output) == entry.get("output")
+
+    def mark(self, output):
+        """Marque une sortie comme toujours produite par ce build"""
+        self.seen.add(str(output))
+
+    def keep(self, output, inputs_hash, render, args):
+        """
+        Garde une sortie déjà produite sans la rendre, quand ses entrées
+        sont connues inchangées (ex. journal de scripts/catalog_db.py).
+        Retourne False si elle doit être rendue: absente du manifeste ou du
+        disque, modifiée à la main, ou produite à partir d'autres entrées
+        (build depuis le CSV entre-temps).
+        """
+        if not self.is_fresh(output, inputs_hash):
+            return False
+        self.mark(output)
+        self.records.keep(output, render, args)
+        self._skip()
+        return True
+
+    def record(self, output, inputs_hash):
+        """Enregistre une sortie qui vient d'être écrite"""
+        self.outputs[str(output)] = {
+            "inputs": inputs_hash,
+            "output": self.hash_file(output),
+        }
+        self.mark(output)
+
+    def write_text(self, output, inputs_hash, render, *args):
+        """
+        Écrit output avec le texte retourné par render(*args) si ses entrées
+        ont changé. Retourne True si le fichier a été réécrit.
+        """
+        self.mark(output)
+        if self.is_fresh(output, inputs_hash):
+            self.records.keep(output, render, args)
+            self._skip()
+            return False
+
+        _write_page(output, render, args)
+        self._rendered(output, render)
+        self.records.publish(output, render, args)
+        self.record(output, inputs_hash)
+        self._wrote(output)
+        return True
+
+    def _rendered(self, output, render):
+        """Note un fichier réécrit qui n'a pas d'enregistrement de recherche"""
+        if self.rendered is not None and getattr(render, "page", None) is None:
+            self.rendered.add(str(output))
+
+    def write_many(self, pages, jobs=1, chunk_size=WRITE_CHUNK_SIZE):
+        """
+        Écrit les pages périmées parmi pages, un itérable de tuples
+        (output, inputs_hash, render, args). Avec jobs > 1, le rendu et
+        l'écriture sont répartis par lots sur un pool de processus; render
+        doit alors être une fonction de module. Le contenu de chaque fichier
+        ne dépend que de ses arguments: le résultat est identique au mode
+        séquentiel. Retourne, dans l'ordre, les fichiers réécrits.
+        """
+        if jobs <= 1:
+            for output, inputs_hash, render, args in pages:
+                if self.write_text(output, inputs_hash, render, *args):
+                    yield output
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # Limite le nombre de lots en vol pour garder la mémoire bornée
+            pending = deque()
+            for chunk in self._stale_chunks(pages, chunk_size):
+                tasks = [(output, render, args) for output, _, render, args in chunk]
+                future = executor.submit(_write_chunk, tasks)
+                pending.append((chunk, future))
+                if len(pending) > jobs * 2:
+                    yield from self._finish_chunk(*pending.popleft())
+            while pending:
+                yield from self._finish_chunk(*pending.popleft())
+
+    def _stale_chunks(self, pages, chunk_size):
+        """Regroupe par lots les pages dont les entrées ont changé"""
+        chunk = []
+        for page in pages:
+            output, inputs_hash, render, args = page
+            self.mark(output)
+            if self.is_fresh(output, inputs_hash):
+                self.records.keep(output, render, args)
+                self._skip()
+                continue
+            chunk.append(page)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _finish_chunk(self, chunk, future):
+        """Attend un lot et enregistre ses sorties dans le manifeste"""
+        future.result()
+        for output, inputs_hash, render, args in chunk:
+            self._rendered(output, render)
+            self.records.publish(output, render, args)
+            self.record(output, inputs_hash)
+            self._wrote(output)
+            yield output
+
+    def _skip(self):
+        """Compte une sortie déjà à jour"""
+        self.skipped += 1
+        count("files_skipped")
+
+    def _wrote(self, output):
+        """Compte une page écrite (sa taille vient du hachage de record)"""
+        self.written += 1
+        count("files_written")
+        count("bytes_written", self.files[str(output)][0])
+
+    def sync_files(self, files, jobs=SYNC_THREADS, link=True):
+        """
+        Synchronise des fichiers statiques: files est une liste de
+        (source, target, stat), stat pouvant être None. Une cible n'est
+        recopiée que si le contenu de la source a changé: la taille et le
+        mtime suffisent pour une source déjà vue, sinon elle est hachée. Les
+        copies passent par clone_file (reflink ou lien physique si possible)
+        et sont faites en parallèle sur jobs threads. Retourne, dans l'ordre,
+        les cibles copiées.
+        """
+        tasks = []
+        for source, target, stat in files:
+            source = Path(source)
+            if stat is None:
+                stat = source.stat()
+            self.mark(target)
+            entry = self.outputs.get(str(target))
+            target_stat = self.files.get(str(target))
+            tasks.append(
+                (
+                    source,
+                    Path(target),
+                    stat,
+                    self.cached_hash(source, stat),
+                    entry and entry.get("inputs"),
+                    target_stat and target_stat[:2],
+                )
+            )
+
+        copied = []
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = [
+                executor.submit(
+                    _sync_file,
+                    source,
+                    target,
+                    self.version,
+                    known_hash,
+                    inputs,
+                    target_stat,
+                    link,
+                )
+                for source, target, _, known_hash, inputs, target_stat in tasks
+            ]
+            for (source, target, stat, _, _, _), future in zip(tasks, futures):
+                source_hash, method = future.result()
+                self.files[str(source)] = [stat.st_size, stat.st_mtime_ns, source_hash]
+                if method is None:
+                    self._skip()
+                    self.bytes_skipped += stat.st_size
+                    count("bytes_skipped", stat.st_size)
+                    continue
+
+                # La cible a le contenu de la source: inutile de la relire
+                target_stat = target.stat()
+                self.files[str(target)] = [
+                    target_stat.st_size,
+                    target_stat.st_mtime_ns,
+                    source_hash,
+                ]
+                self.record(target, hash_inputs(self.version, source_hash))
+                self.written += 1
+                self.bytes_copied += stat.st_size
+                self.sync_methods[method] += 1
+                count("files_copied")
+                count("bytes_copied", stat.st_size)
+                copied.append(target)
+        return copied
+
+    def sync_report(self):
+        """Résumé de sync_files: volume copié et volume évité"""
+        methods = ", ".join(
+            f"{method}: {count}" for method, count in sorted(self.sync_methods.items())
+        )
+        report = (
+            f"📊 {self.bytes_copied / 1e6:.1f} Mo copiés"
+            f" ({methods or 'aucun fichier'}),"
+            f" {self.bytes_skipped / 1e6:.1f} Mo inchangés"
+        )
+        return report
+
+    def prune_orphans(self):
+        """Supprime les sorties du build précédent qui n'ont pas été produites"""
+        removed = []
+        for key in sorted(set(self.outputs) - self.seen):
+            output = Path(key)
+            if output.exists():
+                output.unlink()
+                removed.append(output)
+                count("files_removed")
+            del self.outputs[key]
+            self.files.pop(key, None)
+            self.records.remove(key)
+
+            # Retire le dossier devenu vide (ex. static/pdf/.../<modele>)
+            parent = output.parent
+            if parent.is_dir() and not any(parent.iterdir()):
+                parent.rmdir()
+
+        # Oublie les empreintes des fichiers disparus
+        for key in [key for key in self.files if not Path(key).exists()]:
+            del self.files[key]
+
+        return removed
@@ -0,0 +1,252 @@
+"""
+Mesures des générateurs: durées, compteurs, mémoire et profilage
+
+Les générateurs signalent leur travail par count() (fichiers parcourus,
+écrits, inchangés, copiés, octets copiés...) et leurs lignes par fichier par
+progress(). Chaque étape est mesurée par stage() (temps réel et temps CPU du
+thread de l'étape); les compteurs sont rattachés à l'étape en cours dans le
+thread appelant. session() encadre une exécution complète:
+
+- écrit le rapport JSON (.build-cache/metrics.json par défaut): durée et
+  temps CPU de chaque étape, compteurs par étape et totaux, temps CPU du
+  processus et de ses processus de travail, pic de mémoire (RSS);
+- avec --quiet, remplace les lignes par fichier par un résumé au plus toutes
+  les PROGRESS_SECONDS secondes;
+- avec --profile, profile chaque étape avec cProfile et écrit les
+  statistiques pstats (.build-cache/profile.prof), puis affiche celles des
+  fonctions de HOT_FUNCTIONS.
+
+Les processus de travail (--jobs N) ne sont pas profilés: utiliser --jobs 1
+pour profiler le rendu des pages. Avec --profile, scripts/build.py lance les
+étapes une par une (voir run_stages): les profileurs des étapes ne sont
+jamais actifs en même temps.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CACHE_DIR = Path(".build-cache")
+METRICS_FILE = CACHE_DIR / "metrics.json"
+PROFILE_FILE = CACHE_DIR / "profile.prof"
+
+# Intervalle minimal entre deux lignes de progression avec --quiet
+PROGRESS_SECONDS = 2.0
+
+# Fonctions dont les statistiques sont affichées avec --profile
+HOT_FUNCTIONS = (
+    "generate_product_page",
+    "scan_manuals_directory",
+    "generate_index",
+    "write_shards",
+    "sync_files",
+)
+
+# Nombre de lignes du classement par temps cumulé affiché avec --profile
+PROFILE_TOP = 20
+
+
+class Metrics:
+    """Mesures d'une exécution, partagées par les threads des étapes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, default_stage="main"):
+        """Repart de zéro pour une nouvelle exécution"""
+        self.local = threading.local()
+        self.default_stage = default_stage
+        self.stages = {}
+        self.counters = {}
+        self.quiet = False
+        self.profiles = []
+        self.profiling = False
+        self.progress_count = 0
+        self.progress_time = 0.0
+
+    def current_stage(self):
+        return getattr(self.local, "stage", None) or self.default_stage
+
+    def count(self, name, value=1):
+        stage = self.current_stage()
+        with self.lock:
+            self.counters.setdefault(stage, Counter())[name] += value
+
+    def progress(self, message):
+        if not self.quiet:
+            print(message)
+            return
+        now = time.monotonic()
+        with self.lock:
+            self.progress_count += 1
+            if now - self.progress_time < PROGRESS_SECONDS:
+                return
+            self.progress_time = now
+            count = self.progress_count
+        print(f"  … {count} fichiers traités ({self.current_stage()})")
+
+
+METRICS = Metrics()
+
+
+def count(name, value=1):
+    """Ajoute value au compteur name de l'étape en cours"""
+    METRICS.count(name, value)
+
+
+def progress(message):
+    """Ligne par fichier; avec --quiet, résumé périodique à la place"""
+    METRICS.progress(message)
+
+
+def _peak_rss_mb():
+    """Pic de mémoire du processus et de ses processus de travail, en Mo"""
+    if resource is None:
+        return None
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 1e6,
+        "children": (
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 1e6
+        ),
+    }
+
+
+@contextmanager
+def stage(name):
+    """Mesure une étape exécutée dans le thread courant"""
+    previous = getattr(METRICS.local, "stage", None)
+    METRICS.local.stage = name
+    profile = None
+    if METRICS.profiling:
+        profile = cProfile.Profile()
+        profile.enable()
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "échec"
+        raise
+    finally:
+        entry = {
+            "status": status,
+            "wall_seconds": round(time.perf_counter() - wall, 4),
+            "cpu_seconds": round(time.thread_time() - cpu, 4),
+        }
+        if profile is not None:
+            profile.disable()
+        with METRICS.lock:
+            METRICS.stages[name] = entry
+            if profile is not None:
+                METRICS.profiles.append(profile)
+        METRICS.local.stage = previous
+
+
+def add_arguments(parser):
+    """Options communes --quiet, --profile et --metrics"""
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="résumé périodique au lieu d'une ligne par fichier",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=str(PROFILE_FILE),
+        metavar="FICHIER",
+        help=f"profile les étapes avec cProfile (défaut: {PROFILE_FILE})",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=str(METRICS_FILE),
+        metavar="FICHIER",
+        help=f"rapport JSON des mesures (défaut: {METRICS_FILE})",
+    )
+
+
+def build_report(command, wall_seconds):
+    """Rapport JSON de l'exécution"""
+    times = os.times()
+    totals = Counter()
+    for counters in METRICS.counters.values():
+        totals.update(counters)
+    stages = {}
+    for name, entry in METRICS.stages.items():
+        counters = METRICS.counters.get(name, Counter())
+        stages[name] = {**entry, "counters": dict(sorted(counters.items()))}
+    return {
+        "command": command,
+        "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "wall_seconds": round(wall_seconds, 4),
+        "cpu_seconds": {
+            "self": round(times.user + times.system, 4),
+            "children": round(times.children_user + times.children_system, 4),
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": stages,
+        "counters": dict(sorted(totals.items())),
+    }
+
+
+def _write_profile(path):
+    """Écrit les statistiques pstats et affiche celles des fonctions chaudes"""
+    stats = pstats.Stats(*METRICS.profiles)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(path)
+
+    output = io.StringIO()
+    stats.stream = output
+    stats.sort_stats("cumulative")
+    stats.print_stats("|".join(HOT_FUNCTIONS))
+    stats.print_stats(PROFILE_TOP)
+    print(output.getvalue())
+    print(f"📈 Profil: {path} (python -m pstats {path})")
+
+
+@contextmanager
+def session(command, args, stage_name=None):
+    """
+    Encadre une exécution: applique --quiet et --profile, puis écrit le
+    rapport JSON (et le profil) même si une étape échoue. Avec stage_name,
+    toute l'exécution est mesurée comme une seule étape (scripts lancés
+    seuls); sinon les étapes sont mesurées par stage() (scripts/build.py).
+    """
+    METRICS.reset(stage_name or command)
+    METRICS.quiet = args.quiet
+    METRICS.profiling = bool(args.profile)
+    if METRICS.profiling and getattr(args, "jobs", 1) > 1:
+        print("⚠️ --profile: le travail des processus (--jobs) n'est pas profilé")
+
+    start = time.perf_counter()
+    try:
+        with stage(stage_name) if stage_name else nullcontext():
+            yield METRICS
+    finally:
+        if METRICS.quiet and METRICS.progress_count:
+            print(f"  … {METRICS.progress_count} fichiers traités au total")
+        report = build_report(command, time.perf_counter() - start)
+        path = Path(args.metrics)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        if METRICS.profiles:
+            _write_profile(args.profile)
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Catalogue de produits dans une base SQLite (optionnel)
+Usage: python scripts/catalog-db.py import|export|status [--catalog BASE]
+Voir scripts/catalog_db.py; generate-products.py --catalog BASE lit la base.
+"""
+
+from catalog_db import main
+
+if __name__ == "__main__":
+    main()
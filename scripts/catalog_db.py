@@ -0,0 +1,479 @@
+"""
+Catalogue de produits dans une base SQLite (optionnel)
+
+Au lieu de relire scripts/data/produits.csv et data/specs.yaml à chaque
+build, le catalogue peut être gardé dans une base SQLite indexée:
+
+    products     une ligne par SKU: la ligne du CSV telle que lue par
+                 csv.DictReader (JSON: SKU d'origine, colonnes absentes ou
+                 supplémentaires comprises), les colonnes connues pour les
+                 requêtes, sa position dans le CSV et l'empreinte de la
+                 ligne et de ses specs. La clé est le SKU en majuscules.
+    specs        une ligne par spec (SKU en minuscules, clé, valeur JSON, rang)
+    manual_refs  manuel (clé de related_products.manual_key) -> SKU
+    builds       un numéro par import (ou modification) du catalogue
+    changes      journal des SKU ajoutés, modifiés ou retirés à chaque build
+    consumers    dernier build traité par chaque générateur
+
+import_catalog() importe le CSV et le YAML en une seule transaction et
+n'inscrit au journal que les SKU dont la ligne ou les specs ont changé.
+generate-products.py --catalog ne rend alors que les pages de ces SKU
+(changes_since), puis note le build traité (mark_processed). Les lignes
+relues (iter_products) sont identiques à celles du CSV: les pages, et leurs
+empreintes, sont les mêmes avec les deux sources, et l'export redonne le CSV
+importé.
+
+    python scripts/catalog-db.py import           # CSV + YAML -> base
+    python scripts/catalog-db.py export           # base -> CSV + YAML
+    python scripts/catalog-db.py status           # builds et changements
+    python scripts/generate-products.py --catalog scripts/data/catalog.sqlite
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import yaml
+
+from build_cache import hash_inputs
+from related_products import manual_key
+
+CATALOG_FILE = Path("scripts/data/catalog.sqlite")
+CSV_FILE = Path("scripts/data/produits.csv")
+SPECS_FILE = Path("data/specs.yaml")
+
+# Colonnes du CSV, dans l'ordre
+PRODUCT_FIELDS = (
+    "sku",
+    "name",
+    "category",
+    "price",
+    "price_note",
+    "description",
+    "image",
+    "manual_ref",
+    "in_stock",
+    "featured",
+)
+
+# Valeur d'une colonne absente du CSV, comme la lit generate-products.py
+# (colonnes connues de la table products seulement)
+FIELD_DEFAULTS = {"in_stock": "true", "featured": "false"}
+
+# Version du schéma: une base de version 1 est migrée, une base d'une autre
+# version est refusée
+SCHEMA_VERSION = 2
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS products (
+    sku TEXT PRIMARY KEY,
+    row TEXT NOT NULL,
+    {", ".join(f"{field} TEXT NOT NULL DEFAULT ''" for field in PRODUCT_FIELDS[1:])},
+    position INTEGER NOT NULL,
+    row_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_position ON products (position);
+CREATE INDEX IF NOT EXISTS products_category ON products (category);
+
+CREATE TABLE IF NOT EXISTS specs (
+    sku TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (sku, key)
+);
+
+CREATE TABLE IF NOT EXISTS manual_refs (
+    manual TEXT NOT NULL,
+    sku TEXT NOT NULL,
+    PRIMARY KEY (manual, sku)
+);
+CREATE INDEX IF NOT EXISTS manual_refs_sku ON manual_refs (sku);
+
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    source TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS changes (
+    build_id INTEGER NOT NULL REFERENCES builds (id),
+    sku TEXT NOT NULL,
+    operation TEXT NOT NULL CHECK (operation IN ('upsert', 'delete')),
+    PRIMARY KEY (build_id, sku)
+);
+CREATE INDEX IF NOT EXISTS changes_sku ON changes (sku);
+
+CREATE TABLE IF NOT EXISTS consumers (
+    name TEXT PRIMARY KEY,
+    build_id INTEGER NOT NULL
+);
+"""
+
+# Version 1 -> 2: la ligne d'origine n'était pas gardée. Elle est refaite à
+# partir des colonnes, et l'empreinte effacée pour que le prochain import
+# réécrive chaque ligne telle que lue dans le CSV.
+MIGRATE_V1 = f"""
+ALTER TABLE products ADD COLUMN row TEXT NOT NULL DEFAULT '{{}}';
+UPDATE products SET
+    row = json_object({", ".join(f"'{field}', {field}" for field in PRODUCT_FIELDS)}),
+    row_hash = '';
+"""
+
+# Taille des lots de executemany
+BATCH_SIZE = 5000
+
+
+def row_hash(product, product_specs):
+    """Empreinte d'une ligne du CSV et de ses specs"""
+    return hash_inputs(SCHEMA_VERSION, product, product_specs)
+
+
+def spec_rows(specs_data, skus):
+    """Lignes de la table specs pour ces SKU (en minuscules)"""
+    for sku in skus:
+        for rank, (key, value) in enumerate((specs_data.get(sku) or {}).items()):
+            yield str(sku), str(key), json.dumps(value, ensure_ascii=False), rank
+
+
+class CatalogSpecs:
+    """Specs lues dans la base, avec l'interface de SpecStore (get, len)"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __len__(self):
+        return self.db.connection.execute(
+            "SELECT COUNT(DISTINCT sku) FROM specs"
+        ).fetchone()[0]
+
+    def __contains__(self, sku):
+        return (
+            self.db.connection.execute(
+                "SELECT 1 FROM specs WHERE sku = ? LIMIT 1", (sku,)
+            ).fetchone()
+            is not None
+        )
+
+    def get(self, sku, default=None):
+        rows = self.db.connection.execute(
+            "SELECT key, value FROM specs WHERE sku = ? ORDER BY rank", (sku,)
+        ).fetchall()
+        if not rows:
+            return default
+        return {key: json.loads(value) for key, value in rows}
+
+    def close(self):
+        pass
+
+
+class CatalogDB:
+    """Base SQLite du catalogue"""
+
+    def __init__(self, path=CATALOG_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == 1:
+            self.connection.executescript(MIGRATE_V1)
+            version = SCHEMA_VERSION
+        if version not in (0, SCHEMA_VERSION):
+            self.connection.close()
+            raise RuntimeError(
+                f"{self.path}: schéma version {version}, attendu {SCHEMA_VERSION}"
+            )
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    # Lecture
+
+    def iter_products(self):
+        """Produits dans l'ordre du CSV, identiques aux lignes de csv.DictReader"""
+        cursor = self.connection.execute("SELECT row FROM products ORDER BY position")
+        for (row,) in cursor:
+            yield json.loads(row)
+
+    def product(self, sku):
+        """Ligne d'un SKU (recherche par l'index, sans tenir compte de la casse)"""
+        row = self.connection.execute(
+            "SELECT row FROM products WHERE sku = ?", (sku.upper(),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def specs(self):
+        """Specs par SKU en minuscules (interface de SpecStore)"""
+        return CatalogSpecs(self)
+
+    def products_for_manual(self, manual_ref):
+        """SKU qui renvoient à un manuel"""
+        rows = self.connection.execute(
+            "SELECT sku FROM manual_refs WHERE manual = ? ORDER BY sku",
+            (manual_key(manual_ref),),
+        )
+        return [sku for (sku,) in rows]
+
+    # Journal des changements
+
+    def last_build(self):
+        """Numéro du dernier build du catalogue (0 si aucun)"""
+        row = self.connection.execute("SELECT MAX(id) FROM builds").fetchone()
+        return row[0] or 0
+
+    def processed_build(self, consumer):
+        """Dernier build traité par un générateur, ou None"""
+        row = self.connection.execute(
+            "SELECT build_id FROM consumers WHERE name = ?", (consumer,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def changes_since(self, build_id):
+        """
+        SKU modifiés et retirés depuis build_id: (upserts, deletes). Seule
+        la dernière opération de chaque SKU compte.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT sku, operation FROM changes
+            WHERE build_id > ?
+            ORDER BY build_id
+            """,
+            (build_id,),
+        )
+        latest = dict(rows.fetchall())
+        upserts = {sku for sku, op in latest.items() if op == "upsert"}
+        deletes = {sku for sku, op in latest.items() if op == "delete"}
+        return upserts, deletes
+
+    def mark_processed(self, consumer, build_id):
+        """Note le dernier build traité par un générateur"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO consumers (name, build_id) VALUES (?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET build_id = excluded.build_id",
+                (consumer, build_id),
+            )
+
+    # Import et export
+
+    def import_rows(self, products, specs_data, source="import"):
+        """
+        Remplace le catalogue par products (lignes du CSV, dans l'ordre) et
+        specs_data ({sku en minuscules: specs}). Seules les lignes dont le
+        contenu ou la position a changé sont réécrites, et seuls les SKU
+        modifiés ou disparus sont inscrits au journal, sous un nouveau build.
+        Retourne (build, upserts, deletes); build vaut None si rien n'a changé.
+        """
+        connection = self.connection
+        known = {
+            sku: (digest, position)
+            for sku, digest, position in connection.execute(
+                "SELECT sku, row_hash, position FROM products"
+            )
+        }
+        seen = set()
+        changed = []
+        moved = []
+
+        for position, product in enumerate(products):
+            sku = product["sku"].upper()
+            product_specs = specs_data.get(sku.lower(), {}) or {}
+            digest = row_hash(product, product_specs)
+            seen.add(sku)
+            previous = known.get(sku)
+            if previous is None or previous[0] != digest:
+                values = [
+                    FIELD_DEFAULTS.get(field, "")
+                    if product.get(field) is None
+                    else product[field]
+                    for field in PRODUCT_FIELDS[1:]
+                ]
+                row = json.dumps(product, ensure_ascii=False)
+                changed.append((sku, row, *values, position, digest))
+            elif previous[1] != position:
+                moved.append((position, sku))
+        removed = sorted(set(known) - seen)
+        # Specs sans produit du CSV: gardées pour l'export
+        orphans = [key for key in specs_data if str(key).upper() not in seen]
+
+        if not changed and not moved and not removed and not orphans:
+            return None, 0, 0
+
+        # Colonnes de changed: sku, row, PRODUCT_FIELDS[1:], position, row_hash
+        manual_field = PRODUCT_FIELDS.index("manual_ref") + 1
+        with connection:
+            columns = ", ".join(("sku", "row", *PRODUCT_FIELDS[1:]))
+            placeholders = ", ".join("?" * (len(PRODUCT_FIELDS) + 3))
+            for start in range(0, len(changed), BATCH_SIZE):
+                batch = changed[start : start + BATCH_SIZE]
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO products ({columns}, position, row_hash)"
+                    f" VALUES ({placeholders})",
+                    batch,
+                )
+                connection.executemany(
+                    "DELETE FROM specs WHERE sku = ?",
+                    ((row[0].lower(),) for row in batch),
+                )
+                connection.executemany(
+                    "DELETE FROM manual_refs WHERE sku = ?", ((row[0],) for row in batch)
+                )
+                connection.executemany(
+                    "INSERT INTO specs (sku, key, value, rank) VALUES (?, ?, ?, ?)",
+                    spec_rows(specs_data, (row[0].lower() for row in batch)),
+                )
+                connection.executemany(
+                    "INSERT OR IGNORE INTO manual_refs (manual, sku) VALUES (?, ?)",
+                    (
+                        (manual_key(row[manual_field]), row[0])
+                        for row in batch
+                        if row[manual_field]
+                    ),
+                )
+            connection.executemany(
+                "UPDATE products SET position = ? WHERE sku = ?", moved
+            )
+            connection.executemany(
+                "DELETE FROM products WHERE sku = ?", ((sku,) for sku in removed)
+            )
+            connection.executemany(
+                "DELETE FROM manual_refs WHERE sku = ?", ((sku,) for sku in removed)
+            )
+            connection.executemany(
+                "DELETE FROM specs WHERE sku = ?", ((sku.lower(),) for sku in removed)
+            )
+
+            # Les specs sans produit sont réécrites à chaque import
+            connection.execute(
+                "DELETE FROM specs WHERE upper(sku) NOT IN (SELECT sku FROM products)"
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO specs (sku, key, value, rank)"
+                " VALUES (?, ?, ?, ?)",
+                spec_rows(specs_data, orphans),
+            )
+
+            if not changed and not removed:
+                return None, 0, 0
+
+            build = connection.execute(
+                "INSERT INTO builds (created, source) VALUES (?, ?)",
+                (time.time(), source),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO changes (build_id, sku, operation) VALUES (?, ?, ?)",
+                [(build, row[0], "upsert") for row in changed]
+                + [(build, sku, "delete") for sku in removed],
+            )
+        return build, len(changed), len(removed)
+
+    def export_rows(self):
+        """(lignes du CSV telles qu'importées, specs par SKU) du catalogue"""
+        products = list(self.iter_products())
+        specs_data = {}
+        for sku, key, value in self.connection.execute(
+            "SELECT sku, key, value FROM specs ORDER BY sku, rank"
+        ):
+            specs_data.setdefault(sku, {})[key] = json.loads(value)
+        return products, specs_data
+
+
+def read_csv(csv_file):
+    """Lignes du CSV des produits"""
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def read_specs(specs_file):
+    """Specs de data/specs.yaml ({} sans fichier)"""
+    if not Path(specs_file).exists():
+        return {}
+    with open(specs_file, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+
+
+def import_catalog(db, csv_file=CSV_FILE, specs_file=SPECS_FILE):
+    """Importe le CSV et le YAML dans la base (voir CatalogDB.import_rows)"""
+    return db.import_rows(read_csv(csv_file), read_specs(specs_file), str(csv_file))
+
+
+def export_catalog(db, csv_file=CSV_FILE, specs_file=SPECS_FILE):
+    """Réécrit le CSV et le YAML à partir de la base"""
+    products, specs_data = db.export_rows()
+    # Colonnes du CSV importé, dans son ordre (toutes ses lignes les ont)
+    fieldnames = list(products[0]) if products else list(PRODUCT_FIELDS)
+    with open(csv_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(products)
+    with open(specs_file, "w", encoding="utf-8") as f:
+        yaml.dump(
+            specs_data,
+            f,
+            Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+            allow_unicode=True,
+            sort_keys=False,
+        )
+    return len(products)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Catalogue de produits dans une base SQLite"
+    )
+    parser.add_argument(
+        "command",
+        choices=("import", "export", "status"),
+        help="import: CSV + YAML -> base; export: base -> CSV + YAML; "
+        "status: derniers builds et générateurs",
+    )
+    parser.add_argument("--catalog", type=Path, default=CATALOG_FILE)
+    parser.add_argument("--csv", type=Path, default=CSV_FILE)
+    parser.add_argument("--specs", type=Path, default=SPECS_FILE)
+    return parser.parse_args()
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+    with CatalogDB(args.catalog) as db:
+        if args.command == "import":
+            build, upserts, deletes = import_catalog(db, args.csv, args.specs)
+            if build is None:
+                print(f"✓ {args.catalog}: catalogue inchangé ({len(db)} produits)")
+            else:
+                print(
+                    f"✅ Build {build}: {upserts} produits ajoutés ou modifiés,"
+                    f" {deletes} retirés ({len(db)} produits)"
+                )
+        elif args.command == "export":
+            exported = export_catalog(db, args.csv, args.specs)
+            print(f"✅ {exported} produits exportés vers {args.csv} et {args.specs}")
+        else:
+            print(f"📦 {args.catalog}: {len(db)} produits, build {db.last_build()}")
+            for name, build_id in db.connection.execute(
+                "SELECT name, build_id FROM consumers ORDER BY name"
+            ):
+                upserts, deletes = db.changes_since(build_id)
+                print(
+                    f"  {name}: build {build_id},"
+                    f" {len(upserts)} modifiés et {len(deletes)} retirés depuis"
+                )
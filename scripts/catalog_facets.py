@@ -0,0 +1,269 @@
+"""
+Specs typées en colonnes et facettes précalculées du catalogue de produits
+
+generate-products.py remplit un CatalogFacets pendant qu'il parcourt le CSV
+et écrit deux petits fichiers JSON sous static/catalog/:
+
+specs.json, les specs numériques en colonnes (une liste par clé de spec,
+alignée sur la liste des SKU; null quand le produit n'a pas la spec):
+
+    {"version": 1, "skus": ["SA92B", ...],
+     "columns": {"largeur": {"unit": "mm", "low": [2337.0, null, ...]},
+                 "vitesse_rotation": {"unit": "rpm", "low": [...], "high": [...]}}}
+
+"high" n'est présent que pour les colonnes qui ont au moins un intervalle
+("150-200 RPM"). Les valeurs viennent de spec_values.parse_spec().
+
+facets.json, un bitmap par valeur de facette (bit i = i-ème SKU), encodé en
+base64 pour que le filtre de la liste des produits se réduise à des ET
+binaires, et les permutations des identifiants pour chaque tri:
+
+    {"version": 1, "count": 9, "skus": [...],
+     "facets": {"categorie": {"label": "Catégorie",
+                              "values": [{"value": "Souffleuse", "bitmap": "Aw=="}]},
+                "largeur": {"label": "Largeur", "values": [
+                    {"value": "60-80", "label": "60 à 80 po", "bitmap": "..."}]}},
+     "sort": {"name": [2, 3, 8, ...], "price": [7, 4, ...],
+              "price_desc": [5, 0, ...]}}
+
+Les facettes discrètes sont la catégorie, la disponibilité (in_stock) et
+les produits vedettes (featured). Le tri par prix a une permutation par
+sens, croissant ("price") et décroissant ("price_desc"): les produits sans
+prix sont à la fin dans les deux cas.
+
+Les tranches des facettes numériques sont définies dans RANGE_FACETS, dans
+l'unité d'affichage; un intervalle est rangé dans chaque tranche qu'il touche.
+
+Pendant le parcours du catalogue, les colonnes, les identifiants des
+facettes et les prix sont gardés dans des tableaux typés (array, NaN pour
+une spec absente), sans objet Python par valeur: 16 octets par spec
+numérique et par produit, plus le SKU et le nom (tri) de chaque produit.
+C'est le coût mémoire de l'index avec --stream, proportionnel au
+catalogue: sur 40 000 produits à cinq specs (catalogue de
+scripts/benchmarks/bench-products-streaming.py), environ 10 Mo pendant le
+parcours et 19 Mo au plus pendant l'écriture, specs.json étant assemblé
+colonne par colonne.
+"""
+
+import base64
+import json
+import math
+from array import array
+from pathlib import Path
+
+from build_cache import hash_text
+from spec_values import UNITS, parse_spec
+
+CATALOG_DIR = Path("static/catalog")
+SPECS_FILE = CATALOG_DIR / "specs.json"
+FACETS_FILE = CATALOG_DIR / "facets.json"
+
+# Version du format des fichiers de static/catalog/
+FORMAT_VERSION = 1
+
+# Facettes numériques: clé de spec -> libellé, unité d'affichage et bornes
+# des tranches (dans cette unité)
+RANGE_FACETS = {
+    "largeur": {"label": "Largeur", "unit": "po", "edges": [60, 80, 100]},
+    "poids": {"label": "Poids", "unit": "kg", "edges": [250, 500, 750]},
+}
+
+# Valeur d'une colonne pour un produit qui n'a pas la spec
+MISSING = math.nan
+
+
+def encode_bitmap(ids, size):
+    """Bitmap base64 des identifiants ids parmi size (bit i de l'octet i // 8)"""
+    bits = bytearray((size + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def range_buckets(edges, unit):
+    """Tranches (valeur, libellé, borne basse, borne haute) en unité canonique"""
+    factor = UNITS[unit][1]
+    bounds = [None, *edges, None]
+    buckets = []
+    for low, high in zip(bounds, bounds[1:]):
+        if low is None:
+            value, label = f"-{high}", f"moins de {high} {unit}"
+        elif high is None:
+            value, label = f"{low}-", f"{low} {unit} et plus"
+        else:
+            value, label = f"{low}-{high}", f"{low} à {high} {unit}"
+        buckets.append((
+            value,
+            label,
+            float("-inf") if low is None else low * factor,
+            float("inf") if high is None else high * factor,
+        ))
+    return buckets
+
+
+class CatalogFacets:
+    """Colonnes de specs et facettes, remplies produit par produit"""
+
+    def __init__(self):
+        self.skus = []
+        # Clé de spec -> {unit, low, high, ranged}, tableaux alignés sur
+        # self.skus (ranged: au moins un intervalle)
+        self.columns = {}
+        # Facettes discrètes: valeur -> identifiants
+        self.categories = {}
+        self.stock = {}
+        self.featured = array("I")
+        # Clés de tri, alignées sur self.skus
+        self.names = []
+        self.prices = array("d")
+
+    def add(self, product, product_specs):
+        """Ajoute un produit (ligne du CSV) et ses specs"""
+        product_id = len(self.skus)
+        self.skus.append(product["sku"].upper())
+
+        category = product.get("category", "")
+        self.categories.setdefault(category, array("I")).append(product_id)
+        in_stock = product.get("in_stock", "true").lower() == "true"
+        self.stock.setdefault(in_stock, array("I")).append(product_id)
+        if product.get("featured", "false").lower() == "true":
+            self.featured.append(product_id)
+
+        self.names.append(product.get("name", "").casefold())
+        try:
+            self.prices.append(float(product.get("price") or "inf"))
+        except ValueError:
+            self.prices.append(float("inf"))
+
+        for key, text in (product_specs or {}).items():
+            value = parse_spec(text)
+            if value is None:
+                continue
+            column = self.columns.get(key)
+            if column is None:
+                column = {
+                    "unit": value.unit,
+                    "low": array("d"),
+                    "high": array("d"),
+                    "ranged": False,
+                }
+                self.columns[key] = column
+            elif column["unit"] != value.unit:
+                # Même clé dans une autre grandeur: valeur ignorée
+                continue
+            padding = array("d", [MISSING]) * (product_id - len(column["low"]))
+            column["low"].extend(padding)
+            column["high"].extend(padding)
+            column["low"].append(value.low)
+            column["high"].append(value.high)
+            if value.high != value.low:
+                column["ranged"] = True
+
+    def _column_values(self, values):
+        """Valeurs d'une colonne pour le JSON: None pour une spec absente"""
+        padding = [None] * (len(self.skus) - len(values))
+        return [None if math.isnan(value) else value for value in values] + padding
+
+    def specs_json(self):
+        """
+        Texte de static/catalog/specs.json, assemblé colonne par colonne
+        (une seule colonne convertie en liste à la fois)
+        """
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        columns = []
+        for key, column in sorted(self.columns.items()):
+            entry = {"unit": column["unit"], "low": self._column_values(column["low"])}
+            if column["ranged"]:
+                entry["high"] = self._column_values(column["high"])
+            columns.append(f"{dumps(key)}:{dumps(entry)}")
+        return (
+            f'{{"version":{FORMAT_VERSION},"skus":{dumps(self.skus)},'
+            f'"columns":{{{",".join(columns)}}}}}'
+        )
+
+    def range_facet(self, key, label, unit, edges):
+        """Facette numérique d'une colonne, une entrée par tranche non vide"""
+        column = self.columns.get(key)
+        if column is None or UNITS[unit][0] != column["unit"]:
+            return None
+        values = []
+        for value, bucket_label, low, high in range_buckets(edges, unit):
+            # NaN (spec absente) n'est dans aucune tranche
+            ids = [
+                i
+                for i, (start, end) in enumerate(zip(column["low"], column["high"]))
+                if start < high and end >= low
+            ]
+            if ids:
+                values.append({
+                    "value": value,
+                    "label": bucket_label,
+                    "bitmap": encode_bitmap(ids, len(self.skus)),
+                })
+        return {"label": label, "values": values}
+
+    def facets(self):
+        """Contenu de static/catalog/facets.json"""
+        size = len(self.skus)
+        facets = {
+            "categorie": {
+                "label": "Catégorie",
+                "values": [
+                    {"value": category, "bitmap": encode_bitmap(ids, size)}
+                    for category, ids in sorted(self.categories.items())
+                ],
+            },
+            "in_stock": {
+                "label": "Disponibilité",
+                "values": [
+                    {
+                        "value": "true" if in_stock else "false",
+                        "label": "En stock" if in_stock else "Sur commande",
+                        "bitmap": encode_bitmap(ids, size),
+                    }
+                    for in_stock, ids in sorted(self.stock.items(), reverse=True)
+                ],
+            },
+        }
+        if self.featured:
+            facets["featured"] = {
+                "label": "Vedettes",
+                "values": [
+                    {
+                        "value": "true",
+                        "label": "Produits vedettes",
+                        "bitmap": encode_bitmap(self.featured, size),
+                    }
+                ],
+            }
+        for key, spec in RANGE_FACETS.items():
+            facet = self.range_facet(key, **spec)
+            if facet is not None:
+                facets[key] = facet
+        return {
+            "version": FORMAT_VERSION,
+            "count": size,
+            "skus": self.skus,
+            "facets": facets,
+            "sort": {
+                "name": sorted(range(size), key=lambda i: (self.names[i], i)),
+                "price": sorted(range(size), key=lambda i: (self.prices[i], i)),
+                "price_desc": sorted(
+                    range(size),
+                    key=lambda i: (math.isinf(self.prices[i]), -self.prices[i], i),
+                ),
+            },
+        }
+
+    def write(self, manifest):
+        """
+        Écrit static/catalog/specs.json et facets.json avec le manifeste du
+        générateur, seulement si leur contenu a changé. Retourne les
+        fichiers réécrits.
+        """
+        written = []
+        facets = json.dumps(self.facets(), ensure_ascii=False, separators=(",", ":"))
+        for output, text in ((SPECS_FILE, self.specs_json()), (FACETS_FILE, facets)):
+            if manifest.write_text(output, hash_text(text), str, text):
+                written.append(output)
+        return written
@@ -0,0 +1,92 @@
+"""
+Mode --output data des générateurs: pages regroupées dans un fichier de données
+
+Au lieu d'un fichier Markdown par produit ou par modèle, les pages d'une
+section sont écrites dans un seul fichier JSON de data/ (data/products.json,
+data/manuals.json). Le content adapter de la section
+(content/<section>/_content.gotmpl, Hugo 0.126+) crée les pages à partir de
+ce fichier au moment du build Hugo.
+
+Chaque enregistrement suit le format attendu par .AddPage: kind, path
+(relatif à la section), title, dates, params (les mêmes champs que le
+frontmatter des pages Markdown, lus par layouts/produits et layouts/manuels)
+et content (corps Markdown de la page).
+"""
+
+import json
+from pathlib import Path
+
+from build_cache import hash_text
+
+DATA_DIR = Path("data")
+PRODUCTS_FILE = DATA_DIR / "products.json"
+MANUALS_FILE = DATA_DIR / "manuals.json"
+
+# Fichier de données de chaque section de content/
+SECTION_FILES = {
+    "produits": PRODUCTS_FILE,
+    "manuels": MANUALS_FILE,
+}
+
+# Modes de sortie des générateurs (option --output)
+OUTPUT_MODES = ("pages", "data")
+
+# Version du format des fichiers de données
+FORMAT_VERSION = 1
+
+
+def page_record(path, frontmatter, body, kind="page"):
+    """Enregistrement d'une page à partir de son frontmatter et de son corps"""
+    params = {
+        key: value
+        for key, value in frontmatter.items()
+        if key not in ("title", "draft")
+    }
+    record = {
+        "kind": kind,
+        "path": path,
+        "title": frontmatter["title"],
+        "params": params,
+        "content": {"mediaType": "text/markdown", "value": body},
+    }
+    if frontmatter.get("date"):
+        record["dates"] = {"date": frontmatter["date"]}
+    return record
+
+
+def render_data_file(records):
+    """Texte du fichier de données (JSON minifié)"""
+    return json.dumps(
+        {"version": FORMAT_VERSION, "pages": records},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def write_data_file(manifest, output, records):
+    """
+    Écrit le fichier de données avec le manifeste du générateur, seulement
+    si son contenu a changé. Retourne True si le fichier a été réécrit.
+    """
+    text = render_data_file(records)
+    return manifest.write_text(output, hash_text(text), str, text)
+
+
+def read_records(path):
+    """Enregistrements d'un fichier de données (liste vide sans fichier)"""
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    return json.loads(text).get("pages", [])
+
+
+def add_output_argument(parser):
+    """Option --output commune aux générateurs de pages"""
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_MODES,
+        default="pages",
+        help="pages: un fichier Markdown par page; data: un seul fichier "
+        "de données par section, lu par le content adapter de Hugo",
+    )
@@ -0,0 +1,144 @@
+"""
+Inventaire des fichiers d'une arborescence en un seul parcours
+
+scan(root) liste chaque dossier une seule fois avec os.scandir et classe
+chaque fichier par extension, catégorie (premier dossier sous la racine) et
+modèle (second dossier). Les scripts interrogent ensuite l'inventaire en
+mémoire au lieu de relancer iterdir(), glob() ou rglob() pour chaque
+dossier et chaque extension. Le type des entrées vient de scandir (sans
+appel à stat sur la plupart des systèmes de fichiers) et le stat de chaque
+fichier n'est fait qu'à la demande, une seule fois.
+
+L'ordre des fichiers est celui de os.scandir, comme avec glob(), et les
+parcours récursifs suivent l'ordre de rglob(): les fichiers d'un dossier,
+puis ceux de chaque sous-dossier.
+"""
+
+import os
+from pathlib import Path
+
+from build_metrics import count
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+class FileInfo:
+    """Fichier de l'inventaire; Path et stat ne sont créés qu'à la demande"""
+
+    __slots__ = ("fspath", "name", "ext", "parts", "_entry", "_path", "_stat")
+
+    def __init__(self, entry, parts):
+        self.fspath = entry.path
+        self.name = name = entry.name
+        dot = name.rfind(".")
+        self.ext = name[dot:] if 0 < dot < len(name) - 1 else ""
+        # Dossiers entre la racine et le fichier
+        self.parts = parts
+        self._entry = entry
+        self._path = None
+        self._stat = None
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = Path(self.fspath)
+        return self._path
+
+    @property
+    def stem(self):
+        return self.name[: -len(self.ext)] if self.ext else self.name
+
+    @property
+    def category(self):
+        return self.parts[0] if self.parts else None
+
+    @property
+    def model(self):
+        return self.parts[1] if len(self.parts) > 1 else None
+
+    @property
+    def stat(self):
+        if self._stat is None:
+            self._stat = self._entry.stat()
+        return self._stat
+
+    def __fspath__(self):
+        return self.fspath
+
+    def __repr__(self):
+        return f"FileInfo({self.fspath!r})"
+
+
+class Inventory:
+    """Dossiers et fichiers d'une arborescence, indexés par chemin relatif"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        # Chemin relatif (tuple de noms) -> sous-dossiers / fichiers directs
+        self._subdirs = {}
+        self._files = {}
+        self.exists = self.root.is_dir()
+        if self.exists:
+            self._scan()
+
+    def _scan(self):
+        """Parcourt l'arborescence, chaque dossier n'étant listé qu'une fois"""
+        pending = [(str(self.root), ())]
+        while pending:
+            path, parts = pending.pop()
+            subdirs = []
+            files = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        # Comme rglob(), on ne descend pas dans les liens
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            pending.append((entry.path, parts + (entry.name,)))
+                        elif entry.is_file():
+                            files.append(FileInfo(entry, parts))
+            except OSError as e:
+                print(f"⚠️ Lecture impossible: {path}: {e}")
+            self._subdirs[parts] = subdirs
+            self._files[parts] = files
+            count("dirs_scanned")
+            count("files_scanned", len(files))
+
+    def subdirs(self, *parts):
+        """Noms des sous-dossiers d'un dossier (vide s'il n'existe pas)"""
+        return self._subdirs.get(parts, [])
+
+    def has_file(self, *parts):
+        """Indique si le fichier parts[-1] existe dans le dossier parts[:-1]"""
+        name = parts[-1]
+        return any(f.name == name for f in self._files.get(parts[:-1], ()))
+
+    def files(self, *parts, extensions=None):
+        """
+        Fichiers directement dans un dossier, comme glob("*<ext>") pour
+        chaque extension, dans l'ordre des extensions
+        """
+        files = self._files.get(parts, [])
+        if extensions is None:
+            return list(files)
+        return [f for ext in extensions for f in files if f.ext == ext]
+
+    def walk(self, *parts, extensions=None):
+        """Fichiers d'un dossier et de ses sous-dossiers, dans l'ordre de rglob()"""
+        stack = [parts]
+        while stack:
+            current = stack.pop()
+            for f in self._files.get(current, ()):
+                if extensions is None or f.ext in extensions:
+                    yield f
+            stack.extend(
+                current + (name,) for name in reversed(self.subdirs(*current))
+            )
+
+    def __iter__(self):
+        return self.walk()
+
+
+def scan(root):
+    """Construit l'inventaire de root (vide si le dossier n'existe pas)"""
+    return Inventory(root)
@@ -0,0 +1,120 @@
+"""
+Métadonnées des noms de fichiers PDF de manuels
+
+Exemples de noms: "SA92B-SA98B OM 0440SB92-A 21900001 rev3 01-19.pdf",
+"OM-0440SB92-F.pdf". parse_filename() en extrait la langue, le numéro de
+document (OM), la révision et la date avec les expressions de la table
+RULES, compilées une fois. Chaque motif commence par la partie qui
+consomme du texte ("OM", "rev", le mois, le séparateur du code de langue)
+et vérifie le caractère qui précède par un lookbehind placé après: le
+moteur d'expressions peut alors sauter directement aux positions
+candidates au lieu d'essayer le motif à chaque caractère. Sans cache, une
+recherche par règle est ainsi plus rapide que l'ancienne extraction
+d'index-manuals.py (voir scripts/benchmarks/bench-filename-info.py).
+
+Un code de langue n'est reconnu que s'il forme un segment entier du nom
+("-A" suivi d'une espace, d'un tiret, d'un point ou de la fin du nom): un
+nom comme "BLADE-ASSEMBLY.pdf" n'est donc pas classé Anglais.
+
+Les résultats sont mis en cache par nom de fichier: les mêmes noms
+reviennent d'un modèle et d'un build à l'autre (watch, build.py).
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class FilenameInfo(NamedTuple):
+    """Métadonnées d'un nom de fichier (chaîne vide si absente)"""
+
+    lang: str = ""
+    doc_number: str = ""
+    revision: str = ""
+    date: str = ""
+
+
+# Code de langue (segment du nom) -> langue affichée
+LANGUAGE_CODES = {
+    "A": "Anglais",
+    "E": "Anglais",
+    "EN": "Anglais",
+    "ANG": "Anglais",
+    "F": "Français",
+    "FR": "Français",
+}
+
+
+def _language(match):
+    return LANGUAGE_CODES[match.group("lang_code")]
+
+
+def _doc_number(match):
+    return match.group("doc_value")
+
+
+def _revision(match):
+    return match.group("rev_value")
+
+
+def _date(match):
+    year = match.group("date_year")
+    if len(year) == 2:
+        year = "20" + year
+    return f"{match.group('date_month')}/{year}"
+
+
+_CODES = "|".join(sorted(LANGUAGE_CODES, key=len, reverse=True))
+
+# Table des règles: (champ, motif, conversion). Pour chaque champ, la
+# première correspondance dans le nom l'emporte.
+RULES = [
+    (
+        "doc_number",
+        # "OM" qui ne suit ni lettre ni chiffre
+        r"OM(?<![A-Za-z0-9]OM)[\s_-]+(?P<doc_value>\d+[A-Za-z0-9]*)",
+        _doc_number,
+    ),
+    (
+        "revision",
+        # "rev" qui ne suit pas une lettre ("Preview2" n'est pas une révision)
+        r"(?i:rev)(?<![A-Za-z]...)\.?\s*(?P<rev_value>\d+)",
+        _revision,
+    ),
+    (
+        "date",
+        # Mois qui ne suit pas un chiffre
+        r"(?P<date_month>0[1-9]|1[0-2])(?<!\d..)[-/](?P<date_year>\d{4}|\d{2})(?!\d)",
+        _date,
+    ),
+    (
+        "lang",
+        # Séparateur qui suit une lettre ou un chiffre
+        rf"[-_ ](?<=[A-Za-z0-9].)(?P<lang_code>{_CODES})(?=$|[\s._-])",
+        _language,
+    ),
+]
+
+# (champ, recherche compilée, conversion)
+_SEARCHES = [
+    (field, re.compile(pattern).search, convert) for field, pattern, convert in RULES
+]
+
+# Taille du cache (un build complet en voit quelques milliers)
+CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_filename(filename):
+    """Métadonnées d'un nom de fichier (FilenameInfo)"""
+    fields = {}
+    for field, search, convert in _SEARCHES:
+        match = search(filename)
+        if match:
+            fields[field] = convert(match)
+    return FilenameInfo(**fields)
+
+
+def parse_filenames(filenames):
+    """Métadonnées d'une liste de noms, dans l'ordre (noms répétés analysés une fois)"""
+    return [parse_filename(name) for name in filenames]
@@ -0,0 +1,262 @@
+"""
+Sérialisation rapide du frontmatter YAML des pages générées
+
+dump_frontmatter(data) produit exactement le même texte que
+yaml.dump(data, allow_unicode=True, sort_keys=False), mais sans passer par
+l'émetteur YAML en pur Python, qui est le principal coût CPU des scripts:
+
+- un émetteur par gabarits couvre les schémas fixes des pages (produits:
+  price, specs, images, documents, sku; manuels: manuals) tant que chaque
+  valeur peut s'écrire sans guillemets doubles;
+- sinon, avec libyaml, on utilise CSafeDumper (émetteur en C) lorsque sa
+  sortie est garantie identique;
+- dans tous les autres cas on se rabat sur yaml.dump.
+"""
+
+import re
+from functools import lru_cache
+
+import yaml
+
+try:
+    from yaml import CSafeDumper
+except ImportError:  # PyYAML compilé sans libyaml
+    CSafeDumper = None
+
+# Largeur de ligne par défaut de l'émetteur PyYAML
+BEST_WIDTH = 80
+
+# Texte qui s'écrit tel quel en YAML (sans guillemets) en style bloc
+SIMPLE_TEXT = re.compile(
+    r"(?:[^\W_]|[/±(])"
+    r"(?:[\w .,'()/+%°±\"&*!?|>~=;-]|:(?! |$)|(?<! )#)*"
+    r"(?<! )"
+)
+
+# Caractères hors du plan multilingue de base (emoji...): libyaml les écrit
+# en échappement "\U0001F525" entre guillemets, PyYAML tels quels
+ASTRAL = re.compile("[\U00010000-\U0010FFFF]")
+
+# Mots et suites d'espaces d'un texte, pour le repli des longues lignes
+WORDS_AND_SPACES = re.compile(r" +|[^ ]+")
+
+# Clés connues des schémas produits et manuels, préformatées
+KNOWN_KEYS = (
+    "title",
+    "slug",
+    "description",
+    "date",
+    "categories",
+    "tags",
+    "years",
+    "price",
+    "price_note",
+    "image",
+    "images",
+    "manual_ref",
+    "in_stock",
+    "featured",
+    "sku",
+    "specs",
+    "documents",
+    "manuals",
+    "file",
+    "lang",
+    "version",
+    "draft",
+)
+KEY_PREFIXES = {key: f"{key}:" for key in KNOWN_KEYS}
+
+_resolver = yaml.resolver.Resolver()
+
+
+class _NotSimple(Exception):
+    """La valeur demande l'émetteur YAML complet"""
+
+
+@lru_cache(maxsize=65536)
+def _format_text(value):
+    """
+    Écrit une chaîne comme le ferait PyYAML, si elle est simple. Retourne le
+    texte et un booléen indiquant s'il s'agit d'un scalaire sans guillemets
+    (seul cas où le texte peut être replié sur plusieurs lignes).
+    """
+    if value == "":
+        return "''", False
+    if not SIMPLE_TEXT.fullmatch(value):
+        raise _NotSimple(value)
+
+    # Une chaîne qui serait relue comme un autre type (date, nombre,
+    # booléen...) est mise entre apostrophes
+    tag = _resolver.resolve(yaml.ScalarNode, value, (True, False))
+    if tag == "tag:yaml.org,2002:str":
+        return value, True
+    if "'" in value:
+        raise _NotSimple(value)
+    return f"'{value}'", False
+
+
+def _fold_plain(head, text, indent):
+    """
+    Replie un scalaire sans guillemets comme Emitter.write_plain: on passe à
+    la ligne sur une espace isolée dès que la colonne dépasse BEST_WIDTH
+    """
+    column = len(head) + 1
+    if column + len(text) <= BEST_WIDTH:
+        return f"{head} {text}"
+
+    parts = [head, " "]
+    for token in WORDS_AND_SPACES.findall(text):
+        if token == " " and column > BEST_WIDTH:
+            parts.append("\n" + indent)
+            column = len(indent)
+        else:
+            parts.append(token)
+            column += len(token)
+    return "".join(parts)
+
+
+def _format_float(value):
+    """Même représentation que SafeRepresenter.represent_float"""
+    if value != value:
+        return ".nan"
+    if value == float("inf"):
+        return ".inf"
+    if value == -float("inf"):
+        return "-.inf"
+    text = repr(value).lower()
+    if "." not in text and "e" in text:
+        text = text.replace("e", ".0e", 1)
+    return text
+
+
+def _format_scalar(value):
+    """Retourne le texte d'un scalaire et s'il peut être replié"""
+    if isinstance(value, str):
+        return _format_text(value)
+    if value is True:
+        return "true", False
+    if value is False:
+        return "false", False
+    if value is None:
+        return "null", False
+    if isinstance(value, int):
+        return str(value), False
+    if isinstance(value, float):
+        return _format_float(value), False
+    raise _NotSimple(value)
+
+
+def _emit_scalar(lines, head, value, indent):
+    """Émet "head valeur"; indent est l'indentation des lignes de suite"""
+    text, foldable = _format_scalar(value)
+    if foldable:
+        lines.append(_fold_plain(head, text, indent))
+    elif " " in text and len(head) + 1 + len(text) > BEST_WIDTH:
+        # Seuls les scalaires sans guillemets sont repliés par _fold_plain
+        raise _NotSimple(text)
+    else:
+        lines.append(f"{head} {text}")
+
+
+def _format_key(key):
+    prefix = KEY_PREFIXES.get(key)
+    if prefix is not None:
+        return prefix
+    # PyYAML écrit une clé complexe ("? ") quand la clé et son étiquette
+    # ("!!str", 5 caractères) atteignent 128 caractères
+    if not isinstance(key, str) or len(key) + 5 >= 128:
+        raise _NotSimple(key)
+    text, plain = _format_text(key)
+    if not plain:
+        raise _NotSimple(key)
+    return f"{text}:"
+
+
+def _emit_mapping(lines, data, indent, first_prefix=None):
+    """Émet un dictionnaire en style bloc; first_prefix remplace l'indentation
+    de la première clé (élément de liste: "- ")"""
+    prefix = first_prefix or indent
+    for key, value in data.items():
+        head = prefix + _format_key(key)
+        prefix = indent
+        _emit_value(lines, head, value, indent)
+
+
+def _emit_value(lines, head, value, indent):
+    if isinstance(value, dict):
+        if not value:
+            lines.append(f"{head} {{}}")
+        else:
+            lines.append(head)
+            _emit_mapping(lines, value, indent + "  ")
+    elif isinstance(value, list):
+        if not value:
+            lines.append(f"{head} []")
+        else:
+            lines.append(head)
+            # Les listes d'un dictionnaire ne sont pas indentées par PyYAML
+            for item in value:
+                if isinstance(item, dict) and item:
+                    _emit_mapping(lines, item, indent + "  ", indent + "- ")
+                elif isinstance(item, (dict, list)):
+                    raise _NotSimple(item)
+                else:
+                    _emit_scalar(lines, f"{indent}-", item, indent + "  ")
+    else:
+        _emit_scalar(lines, head, value, indent + "  ")
+
+
+def dump_with_templates(data):
+    """Émetteur par gabarits; lève _NotSimple si une valeur sort du cadre"""
+    if not isinstance(data, dict) or not data:
+        raise _NotSimple(data)
+    lines = []
+    _emit_mapping(lines, data, "")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _c_printable(text):
+    """Texte écrit sans échappement par les deux émetteurs"""
+    return text.isprintable() and (text.isascii() or not ASTRAL.search(text))
+
+
+def _c_simple_key(key):
+    """Clé écrite en style simple par les deux émetteurs (libyaml compte les
+    octets, PyYAML les caractères plus l'étiquette "!!str")"""
+    return _c_printable(key) and len(key.encode("utf-8")) < 128 and len(key) + 5 < 128
+
+
+def _c_emitter_safe(data):
+    """
+    L'émetteur C ne replie pas les chaînes entre guillemets doubles comme
+    l'émetteur Python: on ne l'utilise que si aucune chaîne n'en a besoin
+    (caractères non imprimables ou hors du plan de base, sauts de ligne,
+    clés trop longues)
+    """
+    if isinstance(data, dict):
+        return all(
+            (not isinstance(key, str) or _c_simple_key(key))
+            and _c_emitter_safe(value)
+            for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return all(_c_emitter_safe(item) for item in data)
+    if isinstance(data, str):
+        return _c_printable(data)
+    return True
+
+
+def dump_frontmatter(data):
+    """Équivalent rapide de yaml.dump(data, allow_unicode=True, sort_keys=False)"""
+    try:
+        return dump_with_templates(data)
+    except _NotSimple:
+        pass
+
+    if CSafeDumper is not None and _c_emitter_safe(data):
+        return yaml.dump(
+            data, Dumper=CSafeDumper, allow_unicode=True, sort_keys=False
+        )
+    return yaml.dump(data, allow_unicode=True, sort_keys=False)
@@ -0,0 +1,10 @@
+"""
+Générateurs de contenu du site
+
+Chaque module expose une fonction qui fait tout le travail d'un générateur
+(generate_products, process_manual_folders, process_product_folders,
+index_manuals, build_search_index) et une fonction main() qui lit les
+arguments de la ligne de commande. Les scripts scripts/<nom>.py historiques
+appellent main(). scripts/build.py enchaîne les fonctions dans un seul
+processus (voir scripts/pipeline.py).
+"""
@@ -0,0 +1,324 @@
+"""
+Indexation automatique des manuels PDF
+Scanne le dossier static/pdf/ et génère les pages de manuels correspondantes
+Usage: python scripts/index-manuals.py [--jobs N] [--output data]
+(ou étape "manuels" de scripts/build.py)
+
+Avec --output data, les pages des catégories et des modèles sont écrites dans
+data/manuals.json et créées par le content adapter
+content/manuels/_content.gotmpl (voir scripts/data_pages.py).
+"""
+
+import argparse
+import os
+import re
+from pathlib import Path
+
+from build_cache import BuildManifest, hash_inputs
+from build_metrics import add_arguments, progress, session
+from data_pages import MANUALS_FILE, add_output_argument, page_record, write_data_file
+from file_inventory import scan
+from filename_info import parse_filename
+from frontmatter import dump_frontmatter
+from search_records import renders
+
+# Version du générateur: à incrémenter quand le format des pages change,
+# y compris par un module partagé (frontmatter.py, filename_info.py, data_pages.py)
+GENERATOR_VERSION = "2"
+
+# Configuration
+STATIC_DIR = Path("static")
+PDF_BASE_DIR = STATIC_DIR / "pdf" / "manuels"
+CONTENT_DIR = Path("content/manuels")
+
+
+def scan_manuals_directory():
+    """Scanne le répertoire des manuels et organise les données"""
+    manuals = {}
+
+    inventory = scan(PDF_BASE_DIR)
+    if not inventory.exists:
+        print(f"⚠️ Dossier {PDF_BASE_DIR} non trouvé")
+        return manuals
+
+    for category in inventory.subdirs():
+        # Les dossiers "_" (magasin des PDF des dossiers simples,
+        # voir scripts/asset_store.py) ne sont pas des catégories
+        if category.startswith("_"):
+            continue
+        manuals[category] = {}
+
+        for model in inventory.subdirs(category):
+            manuals[category][model] = {
+                "pdfs": [],
+                "path": f"{category}/{model}",
+            }
+
+            # Scanne les PDF
+            for pdf_file in inventory.walk(category, model, extensions=(".pdf",)):
+                # Ignore les dossiers archives et désuets
+                path_text = pdf_file.fspath.lower()
+                if "archives" in path_text or "désuet" in path_text:
+                    continue
+
+                rel_path = pdf_file.path.relative_to(STATIC_DIR)
+                info = parse_filename(pdf_file.name)
+
+                manuals[category][model]["pdfs"].append(
+                    {
+                        "file": f"{rel_path}",
+                        "title": pdf_file.stem,
+                        "lang": info.lang,
+                        "date": info.date,
+                        "version": info.revision,
+                    }
+                )
+
+    return manuals
+
+
+def manual_page(category, model, data):
+    """Frontmatter et corps Markdown de la page d'un modèle"""
+    # Détermine les années si présentes dans le nom
+    years = ""
+    year_match = re.search(r"(\d{4})", model)
+    if year_match:
+        years = year_match.group(1)
+
+    # Nettoie le titre
+    title = model.replace("-", " ").replace("_", " ")
+
+    # Construit le frontmatter
+    frontmatter = {
+        "title": title,
+        "description": f"Manuels de pièces pour {title}",
+        "date": "2024-01-01",
+        "categories": [category.capitalize()],
+        "years": years,
+        "draft": False,
+        "manuals": [],
+    }
+
+    # Ajoute les PDF au frontmatter
+    for pdf in data["pdfs"]:
+        frontmatter["manuals"].append(
+            {
+                "title": pdf["title"][:50] + "..."
+                if len(pdf["title"]) > 50
+                else pdf["title"],
+                "file": pdf["file"],
+                "lang": pdf["lang"],
+                "date": pdf["date"],
+                "version": pdf["version"],
+                "description": f"Manuel {pdf['lang']}" if pdf["lang"] else "",
+            }
+        )
+
+    # Génère le contenu
+    body = f"""# {title}
+
+Cette page contient tous les manuels de pièces disponibles pour le modèle **{title}**.
+
+## Documents disponibles
+
+{{ range .Params.manuals }}
+### {{ .title }}
+
+- **Langue**: {{ .lang }}
+- **Date**: {{ .date }}
+- **Version**: {{ .version }}
+
+[📥 Télécharger le PDF]({{ .file }})
+
+{{ end }}
+
+## Informations complémentaires
+
+Pour toute question concernant ce modèle ou pour commander des pièces, n'hésitez pas à [nous contacter](/contact/).
+
+---
+
+*Dernière mise à jour: {{ now.Format "2 janvier 2006" }}*
+"""
+
+    return frontmatter, body
+
+
+@renders(manual_page)
+def generate_manual_page(category, model, data):
+    """Génère une page de manuel en Markdown"""
+    frontmatter, body = manual_page(category, model, data)
+    return f"---\n{dump_frontmatter(frontmatter)}---\n\n{body}"
+
+
+def category_index(category):
+    """Frontmatter et corps Markdown de la page d'une catégorie de manuels"""
+    frontmatter = {
+        "title": category.capitalize(),
+        "description": f"Manuels de pièces pour {category.lower()}",
+    }
+    body = f"""# {category.capitalize()}
+
+Retrouvez ci-dessous tous les manuels de pièces pour nos équipements de type **{category.lower()}**.
+"""
+    return frontmatter, body
+
+
+@renders(category_index)
+def generate_category_index(category):
+    """Génère la page d'index d'une catégorie de manuels"""
+    frontmatter, body = category_index(category)
+    return f"""---
+title: "{frontmatter['title']}"
+description: "{frontmatter['description']}"
+---
+
+{body}"""
+
+
+def iter_manual_pages(manuals, manifest):
+    """
+    Pipeline de génération: pour chaque modèle, retourne le fichier de sortie,
+    l'empreinte de ses entrées, la fonction de rendu et ses arguments
+    """
+    for category, model, data, output_file in iter_models(manuals, manifest):
+        # La page ne dépend que de la liste des PDF du modèle
+        yield (
+            output_file,
+            hash_inputs(GENERATOR_VERSION, category, model, data),
+            generate_manual_page,
+            (category, model, data),
+        )
+
+
+def preserved(manifest, output_file):
+    """
+    Indique si une page a été écrite à la main ou par un autre script: elle
+    n'est alors ni réécrite ni supprimée comme orpheline. Une page de ce
+    générateur modifiée à la main lui est retirée.
+    """
+    if manifest.is_modified(output_file):
+        manifest.release(output_file)
+    if output_file.exists() and not manifest.owns(output_file):
+        progress(f"  ⏭️  {output_file} (existe déjà, préservé)")
+        return True
+    return False
+
+
+def iter_models(manuals, manifest):
+    """
+    Modèles qui ont des PDF, avec le fichier de leur page. Les pages écrites
+    à la main ou par un autre script sont préservées et ignorées.
+    """
+    for category, models in manuals.items():
+        category_dir = CONTENT_DIR / category.lower()
+
+        for model, data in models.items():
+            if not data["pdfs"]:
+                continue
+
+            # Crée un slug pour le fichier
+            model_slug = (
+                re.sub(r"[^\w\s-]", "", model).strip().lower().replace(" ", "-")
+            )
+            output_file = category_dir / f"{model_slug}.md"
+            if preserved(manifest, output_file):
+                continue
+
+            yield category, model, data, output_file
+
+
+def data_records(manuals, manifest):
+    """Enregistrements de data/manuals.json (mode --output data)"""
+    records = []
+    for category in manuals:
+        index_file = CONTENT_DIR / category.lower() / "_index.md"
+        if not preserved(manifest, index_file):
+            frontmatter, body = category_index(category)
+            records.append(
+                page_record(category.lower(), frontmatter, body, kind="section")
+            )
+
+    for category, model, data, output_file in iter_models(manuals, manifest):
+        frontmatter, body = manual_page(category, model, data)
+        path = output_file.relative_to(CONTENT_DIR).with_suffix("").as_posix()
+        records.append(page_record(path, frontmatter, body))
+    return records
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Génère les pages de manuels à partir des PDF"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="nombre de processus pour le rendu et l'écriture des pages",
+    )
+    add_output_argument(parser)
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def index_manuals(jobs=1, pages=None, output="pages"):
+    """
+    Génère les pages de manuels. pages est un ensemble partagé par les
+    étapes de scripts/build.py (voir BuildManifest.rendered).
+    output vaut "pages" (un fichier par page) ou "data" (data/manuals.json).
+    """
+    # Scanne les répertoires
+    manuals = scan_manuals_directory()
+
+    if not manuals:
+        print("⚠️ Aucun manuel trouvé")
+        return
+
+    manifest = BuildManifest("index-manuals", GENERATOR_VERSION)
+    manifest.rendered = pages
+
+    if output == "data":
+        records = data_records(manuals, manifest)
+        if write_data_file(manifest, MANUALS_FILE, records):
+            progress(f"  ✓ {MANUALS_FILE}")
+        for orphan in manifest.prune_orphans():
+            progress(f"  🗑️ Supprimé: {orphan}")
+        manifest.save()
+        print(f"\n✅ {len(records)} pages de manuels dans {MANUALS_FILE}")
+        return
+
+    # Crée la page d'index de chaque catégorie, sauf si elle est écrite à la main
+    for category in manuals:
+        index_file = CONTENT_DIR / category.lower() / "_index.md"
+        if preserved(manifest, index_file):
+            continue
+        if manifest.write_text(
+            index_file,
+            hash_inputs(GENERATOR_VERSION, category),
+            generate_category_index,
+            category,
+        ):
+            progress(f"  ✓ {index_file}")
+
+    # Génère et écrit chaque page de modèle seulement si ses PDF ont changé
+    generated_count = 0
+    manual_pages = iter_manual_pages(manuals, manifest)
+    for output_file in manifest.write_many(manual_pages, jobs=jobs):
+        progress(f"  ✓ {output_file}")
+        generated_count += 1
+
+    for orphan in manifest.prune_orphans():
+        progress(f"  🗑️ Supprimé: {orphan}")
+    manifest.save()
+
+    print(f"\n✅ {generated_count} pages de manuels générées")
+    print(f"📁 Emplacement: {CONTENT_DIR}/")
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+    print("📁 Indexation des manuels PDF...")
+    with session("index-manuals", args, "manuels"):
+        index_manuals(jobs=args.jobs, output=args.output)
@@ -0,0 +1,347 @@
+"""
+Génération automatique des pages produits à partir de data/produits.csv
+Usage: python scripts/generate-products.py [--stream] [--jobs N] [--output data]
+                                           [--catalog scripts/data/catalog.sqlite]
+(ou étape "produits" de scripts/build.py)
+
+Les produits similaires de chaque SKU et les SKU qui renvoient à chaque
+manuel sont précalculés dans data/related.json (voir
+scripts/related_products.py). Les specs numériques (en colonnes) et les
+facettes de la liste des produits sont écrites dans static/catalog/ pendant
+le même parcours du CSV (voir scripts/catalog_facets.py).
+
+Avec --output data, les pages sont écrites dans data/products.json et créées
+par le content adapter content/produits/_content.gotmpl (voir
+scripts/data_pages.py). Une page content/produits/<sku>.md qui n'a pas été
+écrite par ce script est alors préservée et son produit n'est pas ajouté au
+fichier de données.
+
+Avec --catalog, le catalogue est lu dans la base SQLite de
+scripts/catalog_db.py au lieu du CSV et de specs.yaml. Seules les pages des
+SKU modifiés depuis le dernier build traité (journal de la base) sont
+rendues; les autres sont gardées sans être relues.
+"""
+
+import argparse
+import csv
+import os
+import yaml
+from pathlib import Path
+
+from build_cache import BuildManifest, hash_inputs
+from build_metrics import add_arguments, progress, session
+from catalog_db import CatalogDB
+from catalog_facets import CatalogFacets
+from data_pages import PRODUCTS_FILE, add_output_argument, page_record, write_data_file
+from frontmatter import dump_frontmatter
+from related_products import RELATED_FILE, RelatedProducts
+from search_records import renders
+from spec_store import SpecStore
+
+# Version du générateur: à incrémenter quand le format des pages change,
+# y compris par un module partagé (frontmatter.py, catalog_facets.py,
+# related_products.py, data_pages.py)
+GENERATOR_VERSION = "2"
+
+# Configuration
+CONTENT_DIR = Path("content/produits")
+DATA_DIR = Path("scripts/data")
+CSV_FILE = DATA_DIR / "produits.csv"
+SPECS_FILE = Path("data/specs.yaml")
+
+
+def slugify(text):
+    """Convertit un texte en slug URL-friendly"""
+    return text.lower().replace(" ", "-").replace("/", "-").replace("\\", "-")
+
+
+def load_specs():
+    """Charge les spécifications depuis le fichier YAML"""
+    if SPECS_FILE.exists():
+        with open(SPECS_FILE, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    return {}
+
+
+def product_page(product, specs_data):
+    """Frontmatter et corps Markdown de la page d'un produit"""
+    sku = product["sku"].lower()
+    name = product["name"]
+    category = product["category"]
+    price = product["price"]
+    price_note = product.get("price_note", "")
+    description = product["description"]
+    image = product.get("image", "")
+    manual_ref = product.get("manual_ref", "")
+    in_stock = product.get("in_stock", "true").lower() == "true"
+    featured = product.get("featured", "false").lower() == "true"
+
+    # Récupère les specs spécifiques au produit
+    product_specs = specs_data.get(sku, {})
+
+    # Construit le frontmatter YAML
+    frontmatter = {
+        "title": name,
+        "description": description,
+        "date": "2024-01-01",  # Date par défaut
+        "categories": [category],
+        "tags": [category.lower(), "équipement", "hiver"],
+        "price": float(price) if price else 0,
+        "price_note": price_note,
+        "image": image if image else "images/produits/placeholder.jpg",
+        "manual_ref": f"/{manual_ref}/" if manual_ref else "",
+        "in_stock": in_stock,
+        "featured": featured,
+        "sku": sku.upper(),
+        "specs": product_specs,
+        "draft": False,
+    }
+
+    # Génère le corps Markdown (assemblé en une seule fois)
+    parts = [
+        f"""{name}
+
+## Description
+
+{description}
+
+## Caractéristiques principales
+
+"""
+    ]
+
+    # Ajoute les specs dans le contenu
+    if product_specs:
+        for key, value in product_specs.items():
+            parts.append(f"- **{key.capitalize()}**: {value}\n")
+
+    parts.append(f"""
+
+## Informations complémentaires
+
+- **Référence (SKU)**: {sku.upper()}
+- **Disponibilité**: {"En stock" if in_stock else "Sur commande"}
+- **Garantie**: {product_specs.get("garantie", "Voir détails en magasin")}
+
+Pour plus d'informations ou pour commander ce produit, [contactez-nous](/contact/?produit={slugify(name)}).
+""")
+
+    return frontmatter, "".join(parts)
+
+
+@renders(product_page)
+def generate_product_page(product, specs_data):
+    """Génère le contenu Markdown d'un produit"""
+    frontmatter, body = product_page(product, specs_data)
+    return f"---\n{dump_frontmatter(frontmatter)}---\n\n{body}"
+
+
+def iter_products(csv_file):
+    """Lit le CSV ligne par ligne sans le charger en entier"""
+    with open(csv_file, "r", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_pages(products, specs_data, catalogs=()):
+    """
+    Pipeline de génération: pour chaque produit, retourne le fichier de sortie,
+    l'empreinte de ses entrées, la fonction de rendu et ses arguments.
+    Chaque produit est aussi ajouté aux catalogs (CatalogFacets,
+    RelatedProducts) pendant le même parcours.
+    """
+    for product in products:
+        sku = product["sku"].lower()
+        product_specs = specs_data.get(sku, {})
+        for catalog in catalogs:
+            catalog.add(product, product_specs)
+
+        # Seules la ligne CSV et l'entrée specs.yaml du produit comptent
+        inputs_hash = hash_inputs(GENERATOR_VERSION, product, product_specs)
+
+        # Les specs déjà lues sont réutilisées pour le rendu
+        page_specs = {sku: product_specs}
+        yield (
+            CONTENT_DIR / f"{sku}.md",
+            inputs_hash,
+            generate_product_page,
+            (product, page_specs),
+        )
+
+
+def skip_unchanged(pages, manifest, changed):
+    """
+    Ne rend que les pages des SKU de changed; celles des autres SKU, déjà
+    produites, sont gardées telles quelles
+    """
+    for page in pages:
+        output = page[0]
+        if output.stem.upper() in changed or not manifest.keep(*page):
+            yield page
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Génère les pages produits à partir du CSV"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="lit specs.yaml SKU par SKU au lieu de tout charger en mémoire",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="nombre de processus pour le rendu et l'écriture des pages",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        metavar="BASE",
+        help="lit le catalogue dans cette base SQLite (scripts/catalog-db.py)"
+        " et ne rend que les produits modifiés depuis le dernier build",
+    )
+    add_output_argument(parser)
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def data_records(products, specs_data, manifest, catalogs=()):
+    """Enregistrements de data/products.json (mode --output data)"""
+    records = []
+    for product in products:
+        sku = product["sku"].lower()
+        product_specs = specs_data.get(sku, {})
+        for catalog in catalogs:
+            catalog.add(product, product_specs)
+        page_file = CONTENT_DIR / f"{sku}.md"
+        # Le content adapter ne doit pas créer une page qui existe déjà
+        if page_file.exists() and not manifest.owns(page_file):
+            progress(f"  ⏭️  {page_file} (existe déjà, préservé)")
+            continue
+        frontmatter, body = product_page(product, {sku: product_specs})
+        records.append(page_record(sku, frontmatter, body))
+    return records
+
+
+def generate_products(
+    jobs=1, stream=False, pages=None, output="pages", catalog=None
+):
+    """
+    Génère les pages produits. pages est un ensemble partagé par les
+    étapes de scripts/build.py, qui reçoit le chemin des fichiers réécrits
+    sans enregistrement de recherche (voir BuildManifest.rendered). output
+    vaut "pages" (un fichier par produit) ou "data" (data/products.json).
+    catalog est le chemin d'une base SQLite du catalogue, lue au lieu du
+    CSV et de specs.yaml.
+    """
+    # Crée le dossier de contenu s'il n'existe pas
+    CONTENT_DIR.mkdir(parents=True, exist_ok=True)
+
+    if catalog is not None:
+        if not Path(catalog).exists():
+            print(f"⚠️ Base {catalog} non trouvée (scripts/catalog-db.py import)")
+            return
+        db = CatalogDB(catalog)
+        generate_from_catalog(db, jobs, pages, output)
+        db.close()
+        return
+
+    # Charge les spécifications
+    specs_data = SpecStore(SPECS_FILE) if stream else load_specs()
+    print(f"✓ Spécifications chargées: {len(specs_data)} produits")
+
+    # Charge et traite le CSV
+    if not CSV_FILE.exists():
+        print(f"⚠️ Fichier {CSV_FILE} non trouvé")
+        return
+
+    write_products(lambda: iter_products(CSV_FILE), specs_data, jobs, pages, output)
+
+    if stream:
+        specs_data.close()
+
+
+def generate_from_catalog(db, jobs, pages, output):
+    """
+    Génère les pages produits à partir de la base du catalogue. Seuls les
+    SKU modifiés depuis le dernier build traité par ce générateur sont
+    rendus (tous au premier passage ou après un changement de version).
+    """
+    consumer = f"generate-products@{GENERATOR_VERSION}"
+    build = db.last_build()
+    since = db.processed_build(consumer)
+    changed = None
+    if since is not None:
+        changed, removed = db.changes_since(since)
+        print(
+            f"✓ Catalogue {db.path}: {len(db)} produits,"
+            f" {len(changed)} modifiés et {len(removed)} retirés"
+            f" depuis le build {since}"
+        )
+    else:
+        print(f"✓ Catalogue {db.path}: {len(db)} produits")
+
+    write_products(db.iter_products, db.specs(), jobs, pages, output, changed)
+    db.mark_processed(consumer, build)
+
+
+def write_products(products, specs_data, jobs, pages, output, changed=None):
+    """
+    Écrit les pages (ou data/products.json), data/related.json et
+    static/catalog/, en un seul parcours de products (fonction qui retourne
+    un itérateur des produits). changed limite le rendu des pages à ces SKU (les pages
+    des autres SKU sont gardées si elles existent déjà).
+    """
+    manifest = BuildManifest("generate-products", GENERATOR_VERSION)
+    manifest.rendered = pages
+
+    generated_count = 0
+    catalog = CatalogFacets()
+    related = RelatedProducts()
+    catalogs = (catalog, related)
+    if output == "data":
+        # Un seul fichier, réécrit seulement si son contenu a changé
+        records = data_records(products(), specs_data, manifest, catalogs)
+        if write_data_file(manifest, PRODUCTS_FILE, records):
+            progress(f"  ✓ {PRODUCTS_FILE}")
+        generated_count = len(records)
+    else:
+        # Génère et écrit chaque fichier seulement si ses entrées ont changé
+        product_pages = iter_pages(products(), specs_data, catalogs)
+        if changed is not None:
+            product_pages = skip_unchanged(product_pages, manifest, changed)
+        for output_file in manifest.write_many(product_pages, jobs=jobs):
+            progress(f"  ✓ {output_file}")
+            generated_count += 1
+
+    # Produits similaires et renvois des manuels vers les produits
+    if related.write(manifest):
+        progress(f"  ✓ {RELATED_FILE}")
+
+    # Specs en colonnes et facettes de la liste des produits
+    for catalog_file in catalog.write(manifest):
+        progress(f"  ✓ {catalog_file}")
+
+    for orphan in manifest.prune_orphans():
+        progress(f"  🗑️ Supprimé: {orphan}")
+    manifest.save()
+
+    if output == "data":
+        print(f"\n✅ {generated_count} pages produits dans {PRODUCTS_FILE}")
+        return
+
+    print(f"\n✅ {generated_count} pages produits générées avec succès")
+    print(f"⏭️  {manifest.skipped} pages inchangées")
+    print(f"📁 Emplacement: {CONTENT_DIR}/")
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+    print("🔄 Génération des pages produits...")
+    with session("generate-products", args, "produits"):
+        generate_products(
+            jobs=args.jobs, stream=args.stream, output=args.output, catalog=args.catalog
+        )
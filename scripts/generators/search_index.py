@@ -0,0 +1,803 @@
+"""
+Generates the search index from content files and PDF manuals
+Usage: python scripts/generate-search-index.py [--jobs N]
+(or the "recherche" stage of scripts/build.py)
+
+The index is written as shards under static/search/ so that the client only
+downloads what a query needs:
+- manifest.json: shard list plus the section and URL prefix dictionaries,
+  loaded when the search box gets focus
+- terms/<prefix>.<hash>.json: inverted index shard mapping each token
+  (lowercased, accent-folded, lightly stemmed for French) starting with
+  <prefix> to a delta-encoded posting list of document IDs
+- docs/<section>.<hash>.json: document metadata for one section (produits,
+  manuels/<category>, ...), stored by column: one array per field, sections
+  and URL prefixes as indices into the manifest dictionaries. Document IDs
+  are assigned section by section, so each shard covers a contiguous ID range.
+
+Shard names contain a hash of their content, so they can be cached as
+immutable; only manifest.json keeps a fixed name. Every file is minified and
+written next to its .gz and .br (if brotli is installed) variants, streaming
+the JSON encoder output to the three files so that the serialized index is
+never held in memory as a whole.
+
+Generated pages are indexed from the search records their generator
+published while writing them (see scripts/search_records.py): title,
+description, body, SKU, specs and manual titles come straight from the
+generator, without reading or parsing the page again. Only pages without an
+up-to-date record (hand-written or hand-edited) are read and their YAML
+frontmatter parsed.
+
+With --service-index (also an option of scripts/build.py, in watch mode
+too), the same documents and postings are also written to a memory-mapped
+binary file for the optional search service (see scripts/search_postings.py
+and scripts/search_service.py).
+
+Each page of the PDF manuals under static/pdf/manuels/ is indexed as its own
+document (text, part numbers, section headings) linking to file.pdf#page=N.
+The PDFs of the simple manual folders, published once in the _fichiers/
+store, are indexed once each, with the category found in the store record.
+Text extraction is cached by PDF content hash (see scripts/pdf_text.py).
+
+- lookup.<hash>.json: identifier lookup for search-as-you-type. Every SKU,
+  model name and manual doc number ("0440SB92") is normalized to a lookup
+  key (accent-folded, lowercase, letters and digits only: "SA-92 B" ->
+  "sa92b") mapped to the documents it identifies. Keys are sorted, so the
+  search worker finds prefixes ("sa 92", "SA92") and one-typo variants
+  ("sa29b") by binary search; an index of the character bigrams of each key
+  ("sa", "a9", "92", ...) to the sorted, delta-encoded IDs of the keys
+  containing them finds the keys that contain the query elsewhere.
+
+The tokenizer, stemmer and lookup keys are mirrored in
+static/js/search-worker.js: any change here must be made there as well.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import unicodedata
+import yaml
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+
+from asset_store import read_record
+from build_metrics import add_arguments, count, session
+from data_pages import SECTION_FILES, read_records
+from file_inventory import scan
+from filename_info import parse_filename
+from pdf_text import extract_all
+from search_postings import INDEX_FILE, write_postings
+from search_records import RecordStore, search_record
+
+try:
+    import brotli
+except ImportError:  # brotli not installed: no .br variants
+    brotli = None
+
+# libyaml loader when available, much faster on large frontmatters
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+CONTENT_DIR = Path("content")
+STATIC_DIR = Path("static")
+PDF_DIR = STATIC_DIR / "pdf" / "manuels"
+OUTPUT_DIR = Path("static/search")
+MANIFEST_FILE = OUTPUT_DIR / "manifest.json"
+
+# Paths of the data files, as found among the paths written by a build
+DATA_PATHS = {str(data_file) for data_file in SECTION_FILES.values()}
+
+# Terms are sharded by their first character, or first two characters once
+# the index is large enough to give each shard about TERMS_PER_SHARD terms
+TERMS_PER_SHARD = 2000
+
+# Part numbers shown in the description of a PDF page
+MAX_DESCRIPTION_PARTS = 6
+
+# Columns of the document table, in order
+DOC_FIELDS = ["title", "description", "url", "section"]
+
+# Manifest format, checked by static/js/search-worker.js
+FORMAT_VERSION = 3
+
+# Hex digits of the content hash in shard file names
+HASH_LENGTH = 10
+
+# Encoder output is buffered into blocks of this size before being hashed,
+# compressed and written
+WRITE_BLOCK = 64 * 1024
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Variants written next to each JSON file
+COMPRESSED_SUFFIXES = (".gz", ".br") if brotli else (".gz",)
+
+# Minified, with non-ASCII characters kept as is
+ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+LIGATURES = str.maketrans({"œ": "oe", "æ": "ae"})
+
+STOPWORDS = frozenset(
+    """
+    a au aux avec ce ces d dans de des du elle en est et il la le les l leur
+    ou par pas pour qu que qui se ses son sur un une vos votre nous vous
+    the of and or for to in on with
+    """.split()
+)
+
+# Light French stemming: only the first matching suffix is removed, and
+# only if at least MIN_STEM characters remain
+SUFFIXES = (
+    "issements",
+    "issement",
+    "atrices",
+    "atrice",
+    "ateurs",
+    "ateur",
+    "ations",
+    "ation",
+    "ements",
+    "ement",
+    "euses",
+    "euse",
+    "ments",
+    "ment",
+    "eurs",
+    "eur",
+    "iques",
+    "ique",
+    "ables",
+    "able",
+    "ives",
+    "ive",
+    "aux",
+    "es",
+    "s",
+    "x",
+    "e",
+)
+MIN_STEM = 3
+
+
+def parse_frontmatter(content):
+    """
+    YAML frontmatter parser. Nested fields (specs, manuals) are kept; an
+    invalid frontmatter falls back to one "key: value" pair per line.
+    """
+    if not content.startswith("---"):
+        return {}, content
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return {}, content
+
+    frontmatter_text = parts[1].strip()
+    body = parts[2].strip()
+
+    try:
+        metadata = yaml.load(frontmatter_text, Loader=YAML_LOADER)
+    except yaml.YAMLError:
+        metadata = None
+    if isinstance(metadata, dict):
+        return metadata, body
+
+    metadata = {}
+    for line in frontmatter_text.split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            metadata[key] = value
+
+    return metadata, body
+
+
+def fold(text):
+    """Lowercase and strip accents"""
+    text = unicodedata.normalize("NFD", text.lower().translate(LIGATURES))
+    return COMBINING_MARKS.sub("", text)
+
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Light French stemmer; tokens containing digits (SKUs) are kept as is"""
+    if not token.isalpha():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[: -len(suffix)]
+    return token
+
+
+def is_indexed(token):
+    """Stopwords and single letters are not indexed"""
+    if not token or token in STOPWORDS:
+        return False
+    return len(token) >= 2 or token.isdigit()
+
+
+def tokenize(text):
+    """Split text into normalized search tokens"""
+    return [stem(token) for token in TOKEN_SPLIT.split(fold(text)) if is_indexed(token)]
+
+
+def token_set(text):
+    """Distinct normalized tokens of a text (duplicates are stemmed once)"""
+    return {
+        stem(token) for token in set(TOKEN_SPLIT.split(fold(text))) if is_indexed(token)
+    }
+
+
+def lookup_key(text):
+    """Normalized identifier: "SA-92 B" -> "sa92b" """
+    return "".join(TOKEN_SPLIT.split(fold(text)))
+
+
+def lookup_grams(key):
+    """Distinct character bigrams of a lookup key"""
+    return {key[i : i + 2] for i in range(len(key) - 1)}
+
+
+def content_files():
+    """Markdown pages of content/ that are indexed, by path"""
+    return {
+        md_entry.fspath: md_entry.path
+        for md_entry in scan(CONTENT_DIR).walk(extensions=(".md",))
+        if not md_entry.name.startswith("_")
+    }
+
+
+def _entry(rel_path, record):
+    """Search entry for a page at rel_path (relative to content/)"""
+    # Use forward slashes for URLs and include baseURL prefix
+    url = "/tempete/" + str(rel_path).replace("\\", "/").replace(
+        ".md", "/"
+    ).replace("_index/", "")
+
+    # SKU, specs and manual titles are indexed with the body, as one text
+    content = "\n".join(
+        text
+        for text in (
+            record["body"],
+            record["sku"],
+            *(f"{key} {value}" for key, value in record["specs"].items()),
+            *record["manuals"],
+        )
+        if text
+    )
+
+    # Identifiers found by the lookup: SKU, model name of the manual pages
+    # and doc numbers of their manuals
+    keys = [record["sku"]]
+    if rel_path.parts[0] == "manuels" and rel_path.name != "_index.md":
+        keys.append(record["title"])
+    keys.extend(parse_filename(title).doc_number for title in record["manuals"])
+
+    parts = rel_path.parts
+    return {
+        "title": record["title"],
+        "description": record["description"],
+        "url": url,
+        "content": content,
+        "keys": [key for key in keys if key],
+        "section": parts[0],
+        # Manuals are sharded by category
+        "shard": "/".join(parts[:2]) if len(parts) > 2 else parts[0],
+    }
+
+
+def page_entry(md_file, record=None):
+    """
+    Search entry for one content page, from its search record if given;
+    otherwise the page is read and parsed
+    """
+    if record is None:
+        content = md_file.read_text(encoding="utf-8")
+        metadata, body = parse_frontmatter(content)
+        record = search_record(md_file, metadata, body)
+    return _entry(md_file.relative_to(CONTENT_DIR), record)
+
+
+def data_entries(section, data_file):
+    """
+    Search entries for the pages of a data file (--output data, see
+    scripts/data_pages.py), at the URL the content adapter gives them
+    """
+    entries = []
+    for record in read_records(data_file):
+        if record["kind"] == "section":
+            rel_path = Path(section, record["path"], "_index.md")
+        else:
+            rel_path = Path(section, record["path"] + ".md")
+        frontmatter = dict(record["params"], title=record["title"])
+        entries.append(
+            _entry(
+                rel_path,
+                search_record(rel_path, frontmatter, record["content"]["value"]),
+            )
+        )
+    return entries
+
+
+def all_data_entries():
+    """Search entries of every data file"""
+    entries = []
+    for section, data_file in SECTION_FILES.items():
+        entries.extend(data_entries(section, data_file))
+    return entries
+
+
+def generate_index():
+    """
+    Collect the searchable entries from the content files: pages written by
+    a generator come from their search record, the others are read back
+    """
+    index = []
+    records = RecordStore()
+    records.refresh()
+
+    parsed = 0
+    for path, md_file in content_files().items():
+        record = records.get(path)
+        parsed += record is None
+        try:
+            index.append(page_entry(md_file, record))
+        except Exception as e:
+            print(f"Warning: Error with {md_file}: {e}")
+    count("pages_parsed", parsed)
+
+    index.extend(all_data_entries())
+    return index
+
+
+def pdf_page_entry(pdf, page, category):
+    """Search entry for one page of a PDF manual"""
+    rel_path = pdf.relative_to(STATIC_DIR).as_posix()
+    number = page["page"]
+    headings = page["headings"]
+    parts = page["parts"]
+
+    title = f"{pdf.stem} (p. {number})"
+    if headings:
+        title = f"{pdf.stem}: {headings[-1]} (p. {number})"
+    description = " / ".join(headings)
+    if parts:
+        shown = ", ".join(parts[:MAX_DESCRIPTION_PARTS])
+        if len(parts) > MAX_DESCRIPTION_PARTS:
+            shown += ", ..."
+        description = f"{description} - {shown}" if description else shown
+
+    return {
+        "title": title,
+        "description": description,
+        "url": f"/tempete/{rel_path}#page={number}",
+        # Part numbers are normalized ("BER 0103" -> "BER0103") so that both
+        # spellings are found
+        "content": page["text"] + "\n" + " ".join(parts),
+        "section": "manuels",
+        # PDF pages get their own document shard, fetched only when matched
+        "shard": f"manuels/{category}/pdf",
+        "page": number,
+    }
+
+
+def pdf_categories():
+    """
+    PDF manuals to index, with their category: those of the category
+    folders, and each PDF of the simple folders once, from the record of
+    their store (scripts/asset_store.py)
+    """
+    inventory = scan(PDF_DIR)
+    categories = {}
+    # As in scan_manuals_directory(), "_" folders are not categories
+    for category in inventory.subdirs():
+        if not category.startswith("_"):
+            for pdf in inventory.walk(category, extensions=(".pdf",)):
+                categories[pdf.path] = category
+    for web_path, origin in read_record("pdf/manuels").items():
+        pdf = STATIC_DIR / web_path
+        if "category" in origin and pdf.is_file():
+            categories[pdf] = origin["category"]
+    return categories
+
+
+def generate_pdf_index(jobs=1):
+    """Collect one searchable entry per page of the PDF manuals"""
+    categories = pdf_categories()
+    index = []
+    for pdf, pages in extract_all(sorted(categories), jobs=jobs).items():
+        entries = [pdf_page_entry(pdf, page, categories[pdf]) for page in pages]
+        # The doc number of a manual leads to its first page
+        doc_number = parse_filename(pdf.name).doc_number
+        if entries and doc_number:
+            entries[0]["keys"] = [doc_number]
+        index.extend(entries)
+    return index
+
+
+def delta_encode(ids):
+    """Sorted IDs as differences from the previous one"""
+    previous = 0
+    deltas = []
+    for doc_id in ids:
+        deltas.append(doc_id - previous)
+        previous = doc_id
+    return deltas
+
+
+def build_inverted_index(entries):
+    """
+    Build the document table and the inverted index.
+    Posting lists are sorted document IDs, delta-encoded.
+    """
+    docs = []
+    postings = {}
+
+    for doc_id, entry in enumerate(entries):
+        docs.append([entry[field] for field in DOC_FIELDS])
+        text = " ".join(
+            (entry["title"], entry["description"], entry.get("content", ""))
+        )
+        for token in token_set(text):
+            postings.setdefault(token, []).append(doc_id)
+
+    index = {token: delta_encode(postings[token]) for token in sorted(postings)}
+    return docs, index
+
+
+def build_lookup(entries):
+    """
+    Identifier lookup table: the sorted lookup keys, the document IDs of each
+    key and the bigram index over the key IDs
+    """
+    key_docs = {}
+    for doc_id, entry in enumerate(entries):
+        for text in entry.get("keys", ()):
+            key = lookup_key(text)
+            if len(key) < 2:
+                continue
+            ids = key_docs.setdefault(key, [])
+            if not ids or ids[-1] != doc_id:
+                ids.append(doc_id)
+
+    keys = sorted(key_docs)
+    grams = {}
+    for key_id, key in enumerate(keys):
+        for gram in lookup_grams(key):
+            grams.setdefault(gram, []).append(key_id)
+
+    return {
+        "keys": keys,
+        "docs": [key_docs[key] for key in keys],
+        "grams": {gram: delta_encode(grams[gram]) for gram in sorted(grams)},
+    }
+
+
+def shard_name(key):
+    """File name for a shard key ("manuels/souffleuses" -> "manuels-souffleuses")"""
+    return re.sub(r"[^\w-]+", "-", key)
+
+
+def split_url(url):
+    """
+    Split a URL into a prefix shared with other documents and its own suffix:
+    "/tempete/produits/sa92b/" -> ("/tempete/produits/", "sa92b/"),
+    "/tempete/pdf/x.pdf#page=3" -> ("/tempete/pdf/x.pdf#page=", "3")
+    """
+    head, separator, page = url.rpartition("#page=")
+    if separator:
+        return head + separator, page
+    cut = url.rstrip("/").rfind("/") + 1
+    return url[:cut], url[cut:]
+
+
+def doc_columns(entries, sections, prefixes):
+    """
+    Document shard stored by column. sections and prefixes map each section
+    and URL prefix to its index in the manifest dictionaries, and are
+    extended with the new ones.
+    """
+    columns = {
+        "title": [],
+        "description": [],
+        "url_prefix": [],
+        "url": [],
+        "section": [],
+    }
+    for entry in entries:
+        prefix, suffix = split_url(entry["url"])
+        columns["title"].append(entry["title"])
+        columns["description"].append(entry["description"])
+        columns["url_prefix"].append(prefixes.setdefault(prefix, len(prefixes)))
+        columns["url"].append(suffix)
+        columns["section"].append(sections.setdefault(entry["section"], len(sections)))
+    return columns
+
+
+class _Variants:
+    """Temporary JSON file and its compressed variants, written together"""
+
+    def __init__(self, path):
+        self.paths = {
+            suffix: path.with_name(f".{path.name}{suffix}.tmp")
+            for suffix in ("",) + COMPRESSED_SUFFIXES
+        }
+        self.files = {suffix: open(tmp, "wb") for suffix, tmp in self.paths.items()}
+        self.gzip = gzip.GzipFile(
+            filename="",
+            fileobj=self.files[".gz"],
+            mode="wb",
+            compresslevel=GZIP_LEVEL,
+            mtime=0,
+        )
+        self.brotli = None
+        if brotli:
+            self.brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        self.digest = hashlib.sha256()
+
+    def write(self, block):
+        self.digest.update(block)
+        self.files[""].write(block)
+        self.gzip.write(block)
+        if self.brotli:
+            self.files[".br"].write(self.brotli.process(block))
+
+    def close(self):
+        self.gzip.close()
+        if self.brotli:
+            self.files[".br"].write(self.brotli.finish())
+        for f in self.files.values():
+            f.close()
+
+    def discard(self):
+        for tmp in self.paths.values():
+            tmp.unlink(missing_ok=True)
+
+
+def write_json(path, data, hashed=True):
+    """
+    Stream minified JSON to path and its compressed variants. With hashed,
+    the content hash is added to the file name ("a.json" -> "a.<hash>.json")
+    and a file that already exists with the same content is left untouched.
+    Returns the final path and the byte size of each variant.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    variants = _Variants(path)
+    try:
+        block = []
+        size = 0
+        for chunk in ENCODER.iterencode(data):
+            block.append(chunk)
+            size += len(chunk)
+            if size >= WRITE_BLOCK:
+                variants.write("".join(block).encode("utf-8"))
+                block = []
+                size = 0
+        variants.write("".join(block).encode("utf-8"))
+    finally:
+        variants.close()
+
+    if hashed:
+        digest = variants.digest.hexdigest()[:HASH_LENGTH]
+        path = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+    sizes = {suffix: tmp.stat().st_size for suffix, tmp in variants.paths.items()}
+    if hashed and path.exists():
+        variants.discard()
+        count("files_skipped")
+    else:
+        for suffix, tmp in variants.paths.items():
+            os.replace(tmp, f"{path}{suffix}")
+        count("files_written")
+    return path, sizes
+
+
+def write_shards(entries, service_index=None):
+    """
+    Write the term shards, the document shards and then the manifest, and
+    remove the files of the previous index; with service_index, also write
+    the binary index of the search service there. Returns the manifest, the
+    number of terms and the total byte size of each variant.
+    """
+    # Group documents by shard so that each shard is a contiguous ID range
+    # (PDF pages in page order rather than "#page=10" before "#page=2")
+    entries = sorted(
+        entries,
+        key=lambda entry: (
+            entry["shard"],
+            entry["url"].partition("#")[0],
+            entry.get("page", 0),
+        ),
+    )
+    docs, index = build_inverted_index(entries)
+
+    written = []
+    totals = dict.fromkeys(("",) + COMPRESSED_SUFFIXES, 0)
+
+    def write(name, data, hashed=True):
+        path, sizes = write_json(OUTPUT_DIR / name, data, hashed)
+        written.append(path)
+        for suffix, size in sizes.items():
+            totals[suffix] += size
+        return path.relative_to(OUTPUT_DIR).as_posix()
+
+    sections = {}
+    prefixes = {}
+    manifest = {
+        "version": FORMAT_VERSION,
+        "prefix": 1 if len(index) < TERMS_PER_SHARD * 36 else 2,
+        "terms": {},
+        "docs": [],
+    }
+
+    start = 0
+    while start < len(entries):
+        key = entries[start]["shard"]
+        end = start
+        while end < len(entries) and entries[end]["shard"] == key:
+            end += 1
+        columns = doc_columns(entries[start:end], sections, prefixes)
+        manifest["docs"].append(
+            {
+                "section": key,
+                "file": write(f"docs/{shard_name(key)}.json", columns),
+                "start": start,
+                "count": end - start,
+            }
+        )
+        start = end
+
+    shards = {}
+    for token, deltas in index.items():
+        shards.setdefault(token[: manifest["prefix"]], {})[token] = deltas
+    for key, shard in shards.items():
+        manifest["terms"][key] = write(f"terms/{key}.json", shard)
+    manifest["lookup"] = write("lookup.json", build_lookup(entries))
+
+    manifest["sections"] = list(sections)
+    manifest["url_prefixes"] = list(prefixes)
+    write(MANIFEST_FILE.name, manifest, hashed=False)
+
+    # The previous shards are removed only once the new manifest is in place
+    kept = {
+        f"{path}{suffix}" for path in written for suffix in ("",) + COMPRESSED_SUFFIXES
+    }
+    for entry in scan(OUTPUT_DIR).walk():
+        if entry.fspath not in kept and not entry.name.startswith("."):
+            entry.path.unlink()
+            count("files_removed")
+
+    if service_index is not None:
+        postings = {token: list(accumulate(deltas)) for token, deltas in index.items()}
+        count("service_index_bytes", write_postings(service_index, docs, postings))
+
+    return manifest, len(index), totals
+
+
+def _kilobytes(size):
+    return f"{size / 1024:.1f} KB"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generates the search index from content files and PDF manuals"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="number of processes used to extract text from new PDF manuals",
+    )
+    parser.add_argument(
+        "--service-index",
+        type=Path,
+        nargs="?",
+        const=INDEX_FILE,
+        metavar="FILE",
+        help="also write the binary index of scripts/search-service.py "
+        f"(default: {INDEX_FILE})",
+    )
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def write_index(entries, pdf_count, service_index=None):
+    """Write the shards of the given entries and print a summary"""
+    manifest, term_count, totals = write_shards(entries, service_index)
+    count("documents_indexed", len(entries))
+    count("terms_indexed", term_count)
+    for suffix, size in totals.items():
+        count(f"search_bytes{suffix.replace('.', '_')}", size)
+
+    print(
+        f"Index generated: {len(entries)} pages indexed "
+        f"({pdf_count} PDF pages), {term_count} tokens"
+    )
+    print(
+        f"Shards: {len(manifest['terms'])} term shards, "
+        f"{len(manifest['docs'])} document shards"
+    )
+    sizes = [f"{_kilobytes(totals[''])} JSON"]
+    for suffix, label in ((".gz", "gzip"), (".br", "brotli")):
+        if suffix in totals:
+            saved = 1 - totals[suffix] / totals[""] if totals[""] else 0
+            sizes.append(f"{_kilobytes(totals[suffix])} {label} (-{saved:.0%})")
+    print(f"Size: {', '.join(sizes)}")
+    if brotli is None:
+        print("⚠️ brotli not installed: no .br variants (pip install brotli)")
+    print(f"Directory: {OUTPUT_DIR}/")
+    if service_index is not None:
+        print(f"Search service index: {service_index}")
+
+
+def build_search_index(jobs=1, service_index=None):
+    """Build and write the whole index (see write_shards for service_index)"""
+    entries = generate_index()
+    pdf_entries = generate_pdf_index(jobs=jobs)
+    entries.extend(pdf_entries)
+    write_index(entries, len(pdf_entries), service_index)
+
+
+class LiveIndex:
+    """
+    Search entries kept in memory between builds by the watch mode
+    (scripts/watcher.py). Only new, removed or changed pages are parsed
+    again, and the PDF manuals only when asked; the shards, and the binary
+    index of the search service if service_index is given, are then
+    rewritten as a whole, with the same result as build_search_index.
+    """
+
+    def __init__(self, jobs=1, service_index=None):
+        self.jobs = jobs
+        self.service_index = service_index
+        self.records = RecordStore()
+        self.entries = {}
+        self.data_entries = None
+        self.pdf_entries = None
+
+    def update(self, pages=None, changed=(), refresh_pdf=False):
+        """
+        pages holds the paths written by this build without a search record
+        (see BuildManifest.rendered), changed lists other paths that may
+        have changed on disk (hand-edited pages). Pages with a record are
+        found in the records appended since the last update.
+        """
+        if pages is None:
+            pages = set()
+        # Only the records appended since the last update are read
+        stale = set(pages).union(changed, self.records.refresh())
+
+        files = content_files()
+        for path in set(self.entries) - set(files):
+            del self.entries[path]
+        for path, md_file in files.items():
+            if path in self.entries and path not in stale:
+                continue
+            try:
+                self.entries[path] = page_entry(md_file, self.records.get(path))
+            except Exception as e:
+                self.entries.pop(path, None)
+                print(f"Warning: Error with {md_file}: {e}")
+
+        # Data files are small in number and re-read as a whole
+        if self.data_entries is None or stale & DATA_PATHS:
+            self.data_entries = all_data_entries()
+
+        if refresh_pdf or self.pdf_entries is None:
+            self.pdf_entries = generate_pdf_index(jobs=self.jobs)
+
+        entries = list(self.entries.values()) + self.data_entries + self.pdf_entries
+        write_index(entries, len(self.pdf_entries), self.service_index)
+
+
+def main():
+    args = parse_args()
+    print("Generating search index...")
+    with session("generate-search-index", args, "recherche"):
+        build_search_index(jobs=args.jobs, service_index=args.service_index)
@@ -0,0 +1,265 @@
+"""
+Traitement des dossiers de manuels simples
+Usage: python scripts/process-simple-manuals.py [--jobs N]
+(ou étape "manuels-simples" de scripts/build.py)
+Structure attendue: content/manuels/<categorie>/<modele>/
+  - info.yaml (métadonnées)
+  - *.pdf (le manuel)
+
+Le script publie le PDF dans static/pdf/manuels/_fichiers/ (une seule copie
+par contenu, voir scripts/asset_store.py) et génère le fichier .md. Le
+registre du magasin donne à generate-search-index.py la catégorie de chaque
+PDF publié, dont le texte est indexé comme celui des autres manuels.
+"""
+
+import argparse
+import os
+import yaml
+from pathlib import Path
+
+from asset_store import AssetStore, record_path
+from build_cache import BuildManifest, hash_inputs
+from build_metrics import add_arguments, progress, session
+from file_inventory import IMAGE_EXTENSIONS, scan
+from filename_info import parse_filename
+from image_variants import build_variants
+from frontmatter import dump_frontmatter
+from search_records import renders
+
+# Version du générateur: à incrémenter quand le format des pages change,
+# y compris par un module partagé (frontmatter.py, image_variants.py,
+# asset_store.py, filename_info.py)
+GENERATOR_VERSION = "2"
+
+CONTENT_DIR = Path("content/manuels")
+STATIC_PDF_DIR = Path("static/pdf/manuels")
+STATIC_IMAGES_DIR = Path("static/images/manuels")
+
+
+def process_manual_folders(jobs=1, pages=None):
+    """
+    Traite tous les dossiers de manuels. pages est un ensemble partagé par
+    les étapes de scripts/build.py (voir BuildManifest.rendered).
+    """
+
+    manifest = BuildManifest("process-simple-manuals", GENERATOR_VERSION)
+    manifest.rendered = pages
+
+    inventory = scan(CONTENT_DIR)
+    # Images à synchroniser vers static/, copiées en parallèle à la fin avec
+    # les PDF du magasin (un seul exemplaire de chaque contenu)
+    assets = []
+    store = AssetStore(manifest, STATIC_PDF_DIR, "pdf/manuels")
+    # Photos à décliner en tailles responsives, et pages à générer ensuite
+    photos = []
+    page_specs = []
+
+    for category in inventory.subdirs():
+        if category.startswith("_"):
+            continue
+
+        category_dir = CONTENT_DIR / category
+
+        for model_name in inventory.subdirs(category):
+            if model_name.startswith("_"):
+                continue
+
+            model_dir = category_dir / model_name
+            yaml_file = model_dir / "info.yaml"
+            pdf_files = inventory.files(category, model_name, extensions=(".pdf",))
+
+            has_info = inventory.has_file(category, model_name, "info.yaml")
+            if not has_info or not pdf_files:
+                continue
+
+            # Lire les métadonnées
+            with open(yaml_file, "r", encoding="utf-8") as f:
+                metadata = yaml.safe_load(f)
+
+            # Copier les images
+            image_paths = []
+            image_target_dir = STATIC_IMAGES_DIR / category / model_name
+            image_target_dir.mkdir(parents=True, exist_ok=True)
+            image_files = inventory.files(
+                category, model_name, extensions=IMAGE_EXTENSIONS
+            )
+            image_files = [f for f in image_files if f.name != "desktop.ini"]
+
+            for img_file in image_files:
+                target_img = image_target_dir / img_file.name
+                web_path = f"images/manuels/{category}/{model_name}/{img_file.name}"
+                assets.append((img_file.path, target_img, img_file.stat))
+                photos.append((img_file.path, img_file.stat, web_path, target_img))
+                image_paths.append(web_path)
+
+            manuals_data = []
+
+            for pdf_file in pdf_files:
+                # Publier le PDF (ou retrouver la copie d'un PDF identique)
+                pdf_path = store.add(
+                    pdf_file.path,
+                    pdf_file.stat,
+                    {"category": category, "model": model_name},
+                )
+
+                # Construire les données du manuel
+                # La langue du nom du fichier l'emporte sur celle de info.yaml
+                lang = parse_filename(pdf_file.name).lang or metadata.get(
+                    "lang", "Français"
+                )
+
+                # Utiliser le nom du fichier PDF comme titre (conserver les tirets)
+                pdf_title = pdf_file.stem
+
+                manuals_data.append(
+                    {
+                        "title": pdf_title,
+                        "file": pdf_path,
+                        "lang": lang,
+                        "date": metadata.get("date", ""),
+                        "version": metadata.get("version", ""),
+                        "description": metadata.get("description", ""),
+                    }
+                )
+
+            md_file = category_dir / f"{model_name}.md"
+            page_specs.append(
+                (
+                    md_file,
+                    yaml_file,
+                    (metadata, model_name, category, manuals_data),
+                    image_paths,
+                )
+            )
+
+    # Déclinaisons WebP/JPEG des photos, encodées en parallèle
+    variants, variant_assets = build_variants(photos, "manuels", jobs)
+    assets.extend(variant_assets)
+    assets.extend(store.assets)
+
+    for md_file, yaml_file, page_args, image_paths in page_specs:
+        metadata, model_name, category, manuals_data = page_args
+        images_data = [variants[path] for path in image_paths]
+
+        # Générer le fichier markdown si info.yaml ou les fichiers ont changé
+        inputs_hash = hash_inputs(
+            GENERATOR_VERSION,
+            category,
+            model_name,
+            manifest.hash_file(yaml_file),
+            manuals_data,
+            images_data,
+        )
+
+        if manifest.write_text(
+            md_file,
+            inputs_hash,
+            generate_markdown,
+            metadata,
+            model_name,
+            category,
+            manuals_data,
+            images_data,
+        ):
+            progress(f"  ✓ Généré: {md_file}")
+
+    for target in manifest.sync_files(assets):
+        icon = "📄" if target.suffix == ".pdf" else "🖼️"
+        progress(f"  {icon} Copié: {target.name}")
+
+    # Registre du magasin, pour l'indexation du texte des PDF
+    if store.write_record():
+        progress(f"  ✓ {record_path(store.web_dir)}")
+
+    for orphan in manifest.prune_orphans():
+        progress(f"  🗑️ Supprimé: {orphan}")
+    manifest.save()
+    print(manifest.sync_report())
+    print(store.report())
+
+
+def manual_page(metadata, model_name, category, manuals_data, images_data=None):
+    """Frontmatter et corps Markdown de la page d'un modèle"""
+
+    if images_data is None:
+        images_data = []
+
+    frontmatter = {
+        "title": metadata.get("title", model_name),
+        "slug": model_name,
+        "description": metadata.get("description", f"Manuels pour {model_name}"),
+        "years": metadata.get("years", ""),
+        "draft": False,
+        "manuals": manuals_data,
+    }
+
+    if "specs" in metadata:
+        frontmatter["specs"] = metadata["specs"]
+
+    if images_data:
+        frontmatter["images"] = images_data
+
+    # Hugo template parts (using regular strings, not f-strings)
+    # Note: Les manuels sont déjà affichés par le template layouts/manuels/single.html
+    hugo_template = """## Informations complémentaires
+
+Pour toute question concernant ce modèle ou pour commander des pièces, n'hésitez pas à [nous contacter](/contact/).
+"""
+
+    return frontmatter, (
+        f"""# {metadata.get("title", model_name)}
+
+{metadata.get("description", "")}
+
+## Caractéristiques
+
+{generate_specs_table(metadata.get("specs", {}))}
+
+"""
+        + hugo_template
+    )
+
+
+@renders(manual_page)
+def generate_markdown(metadata, model_name, category, manuals_data, images_data=None):
+    """Génère le contenu markdown"""
+    frontmatter, body = manual_page(
+        metadata, model_name, category, manuals_data, images_data
+    )
+    return f"---\n{dump_frontmatter(frontmatter)}---\n\n{body}"
+
+
+def generate_specs_table(specs):
+    """Génère un tableau de spécifications"""
+    if not specs:
+        return ""
+
+    lines = []
+    for key, value in specs.items():
+        lines.append(f"- **{key}**: {value}")
+
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Traite les dossiers de manuels simples"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="nombre de processus pour l'encodage des images",
+    )
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+    print("📁 Traitement des dossiers de manuels...")
+    with session("process-simple-manuals", args, "manuels-simples"):
+        process_manual_folders(jobs=args.jobs)
+    print("\n✅ Traitement terminé!")
@@ -0,0 +1,252 @@
+"""
+Traitement des dossiers de produits simples
+Usage: python scripts/process-simple-products.py [--jobs N]
+(ou étape "produits-simples" de scripts/build.py)
+Structure attendue: content/produits/<produit>/
+  - info.yaml (métadonnées)
+  - *.jpg, *.png, *.jpeg (images)
+  - *.pdf (documents/fiches techniques)
+
+Le script copie les images vers static/images/produits/ et génère le fichier .md
+"""
+
+import argparse
+import os
+import yaml
+from pathlib import Path
+
+from asset_store import AssetStore
+from build_cache import BuildManifest, hash_inputs
+from build_metrics import add_arguments, progress, session
+from file_inventory import IMAGE_EXTENSIONS, scan
+from image_variants import build_variants
+from frontmatter import dump_frontmatter
+from search_records import renders
+
+# Version du générateur: à incrémenter quand le format des pages change,
+# y compris par un module partagé (frontmatter.py, image_variants.py, asset_store.py)
+GENERATOR_VERSION = "2"
+
+CONTENT_DIR = Path("content/produits")
+STATIC_PDF_DIR = Path("static/pdf/produits")
+STATIC_IMAGES_DIR = Path("static/images/produits")
+
+
+def process_product_folders(jobs=1, pages=None):
+    """
+    Traite tous les dossiers de produits. pages est un ensemble partagé par
+    les étapes de scripts/build.py (voir BuildManifest.rendered).
+    """
+
+    manifest = BuildManifest("process-simple-products", GENERATOR_VERSION)
+    manifest.rendered = pages
+
+    inventory = scan(CONTENT_DIR)
+    # Images à synchroniser vers static/, copiées en parallèle à la fin avec
+    # les PDF du magasin (un seul exemplaire de chaque contenu)
+    assets = []
+    store = AssetStore(manifest, STATIC_PDF_DIR, "pdf/produits")
+    # Photos à décliner en tailles responsives, et pages à générer ensuite
+    photos = []
+    page_specs = []
+
+    for product_name in inventory.subdirs():
+        if product_name.startswith("_"):
+            continue
+
+        product_dir = CONTENT_DIR / product_name
+        yaml_file = product_dir / "info.yaml"
+
+        if not inventory.has_file(product_name, "info.yaml"):
+            continue
+
+        # Lire les métadonnées
+        with open(yaml_file, "r", encoding="utf-8") as f:
+            metadata = yaml.safe_load(f)
+
+        # Copier les images
+        image_paths = []
+        image_target_dir = STATIC_IMAGES_DIR / product_name
+        image_target_dir.mkdir(parents=True, exist_ok=True)
+        image_files = inventory.files(product_name, extensions=IMAGE_EXTENSIONS)
+        image_files = [f for f in image_files if f.name != "desktop.ini"]
+
+        for img_file in image_files:
+            target_img = image_target_dir / img_file.name
+            web_path = f"images/produits/{product_name}/{img_file.name}"
+            assets.append((img_file.path, target_img, img_file.stat))
+            photos.append((img_file.path, img_file.stat, web_path, target_img))
+            image_paths.append(web_path)
+
+        # Copier les PDFs et créer la liste des documents
+        documents_data = []
+        pdf_files = inventory.files(product_name, extensions=(".pdf",))
+        pdf_files = [f for f in pdf_files if f.name != "desktop.ini"]
+
+        for pdf_file in pdf_files:
+            pdf_path = store.add(pdf_file.path, pdf_file.stat)
+
+            # Utiliser le nom du fichier (sans extension) comme titre (conserver les tirets)
+            pdf_title = pdf_file.stem
+
+            documents_data.append(
+                {
+                    "title": pdf_title,
+                    "file": pdf_path,
+                }
+            )
+
+        md_file = product_dir / "index.md"
+        page_specs.append(
+            (md_file, yaml_file, (metadata, product_name), image_paths, documents_data)
+        )
+
+    # Déclinaisons WebP/JPEG des photos, encodées en parallèle
+    variants, variant_assets = build_variants(photos, "produits", jobs)
+    assets.extend(variant_assets)
+    assets.extend(store.assets)
+
+    for md_file, yaml_file, page_args, image_paths, documents_data in page_specs:
+        metadata, product_name = page_args
+        images_data = [variants[path] for path in image_paths]
+
+        # Générer le fichier markdown si info.yaml ou les fichiers ont changé
+        inputs_hash = hash_inputs(
+            GENERATOR_VERSION,
+            product_name,
+            manifest.hash_file(yaml_file),
+            images_data,
+            documents_data,
+        )
+
+        if manifest.write_text(
+            md_file,
+            inputs_hash,
+            generate_markdown,
+            metadata,
+            product_name,
+            images_data,
+            documents_data,
+        ):
+            progress(f"  ✓ Généré: {md_file}")
+
+    for target in manifest.sync_files(assets):
+        icon = "📄" if target.suffix == ".pdf" else "🖼️"
+        progress(f"  {icon} Copié: {target.name}")
+
+    for orphan in manifest.prune_orphans():
+        progress(f"  🗑️ Supprimé: {orphan}")
+    manifest.save()
+    print(manifest.sync_report())
+    print(store.report())
+
+
+def product_page(metadata, product_name, images_data, documents_data):
+    """Frontmatter et corps Markdown de la page d'un produit"""
+
+    if images_data is None:
+        images_data = []
+
+    frontmatter = {
+        "title": metadata.get("title", product_name),
+        "slug": product_name,
+        "description": metadata.get("description", f"Produit {product_name}"),
+        "date": metadata.get("date", "2024-01-01"),
+        "draft": False,
+    }
+
+    # Catégories
+    if "categories" in metadata:
+        frontmatter["categories"] = metadata["categories"]
+
+    # Prix
+    if "price" in metadata:
+        frontmatter["price"] = metadata["price"]
+    if "price_note" in metadata:
+        frontmatter["price_note"] = metadata["price_note"]
+
+    # Images
+    if images_data:
+        frontmatter["images"] = images_data
+
+    # Documents/PDFs
+    if documents_data:
+        frontmatter["documents"] = documents_data
+
+    # Specs
+    if "specs" in metadata:
+        frontmatter["specs"] = metadata["specs"]
+
+    # SKU
+    if "sku" in metadata:
+        frontmatter["sku"] = metadata["sku"]
+
+    # In stock
+    if "in_stock" in metadata:
+        frontmatter["in_stock"] = metadata["in_stock"]
+
+    # Générer le contenu
+    content = f"""{metadata.get("description", "")}
+
+"""
+
+    # Ajouter les specs dans le contenu
+    if "specs" in metadata:
+        content += "## Caractéristiques\n\n"
+        for key, value in metadata["specs"].items():
+            content += f"- **{key}**: {value}\n"
+        content += "\n"
+
+    content += """## Informations complémentaires
+
+"""
+
+    if "sku" in metadata:
+        content += f"- **Référence (SKU)**: {metadata['sku']}\n"
+
+    content += f"- **Disponibilité**: {'En stock' if metadata.get('in_stock', True) else 'Sur commande'}\n"
+
+    if "garantie" in metadata.get("specs", {}):
+        content += f"- **Garantie**: {metadata['specs']['garantie']}\n"
+    else:
+        content += "- **Garantie**: Voir détails en magasin\n"
+
+    content += f"""
+
+Pour plus d'informations ou pour commander ce produit, [contactez-nous](/contact/?produit={product_name}).
+"""
+
+    return frontmatter, content
+
+
+@renders(product_page)
+def generate_markdown(metadata, product_name, images_data, documents_data):
+    """Génère le contenu markdown"""
+    frontmatter, body = product_page(
+        metadata, product_name, images_data, documents_data
+    )
+    return f"---\n{dump_frontmatter(frontmatter)}---\n\n{body}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Traite les dossiers de produits simples"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="nombre de processus pour l'encodage des images",
+    )
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+    print("📦 Traitement des dossiers de produits...")
+    with session("process-simple-products", args, "produits-simples"):
+        process_product_folders(jobs=args.jobs)
+    print("\n✅ Traitement terminé!")
@@ -0,0 +1,240 @@
+"""
+Déclinaisons responsives des photos de produits et de manuels
+
+Chaque photo est réencodée en WebP et en JPEG à plusieurs largeurs
+(WIDTHS, sans jamais agrandir l'original). Les fichiers encodés sont mis en
+cache par empreinte du contenu de la photo dans .build-cache/images/<groupe>/
+(un groupe par générateur, pour que deux générateurs lancés en parallèle ne
+suppriment pas les déclinaisons l'un de l'autre): une photo inchangée, même
+renommée ou déplacée, n'est jamais réencodée.
+L'encodage des nouvelles photos est réparti sur un pool de processus.
+
+Pour chaque photo, build_variants() retourne l'entrée du frontmatter
+"images" utilisée par le partial responsive-image.html:
+
+    src: images/produits/x/photo.jpg-1600w.jpg    # plus grande version JPEG
+    original: images/produits/x/photo.jpg
+    width: 1600
+    height: 1200
+    sources:
+    - type: image/webp
+      srcset:
+      - src: images/produits/x/photo.jpg-480w.webp
+        width: 480
+      ...
+
+et la liste des fichiers à synchroniser du cache vers static/.
+
+L'encodage utilise Pillow (optionnel): sans lui, les entrées restent les
+chemins des originaux, comme avant.
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from build_cache import CACHE_DIR, BuildManifest, hash_inputs
+from build_metrics import count, progress
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow non installé
+    Image = None
+
+# À incrémenter quand les largeurs, formats ou réglages d'encodage changent
+VARIANTS_VERSION = "1"
+
+VARIANTS_CACHE_DIR = CACHE_DIR / "images"
+
+# Largeurs générées, en pixels
+WIDTHS = (480, 960, 1600)
+
+# Formats, du préféré au format de repli: (extension, type MIME, format
+# Pillow, options d'encodage)
+FORMATS = (
+    ("webp", "image/webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "image/jpeg", "JPEG", {"quality": 82, "optimize": True}),
+)
+
+
+def target_widths(width):
+    """Largeurs à générer pour une photo: celles de WIDTHS plus étroites que
+    l'original, ou l'original seul s'il est plus petit que toutes"""
+    return [w for w in WIDTHS if w < width] or [width]
+
+
+def _variant_file(cache_dir, image_hash, width, ext):
+    return cache_dir / f"{image_hash}-{width}w.{ext}"
+
+
+def _meta_file(cache_dir, image_hash):
+    return cache_dir / f"{image_hash}.json"
+
+
+def encode_variants(source, image_hash, cache_dir):
+    """
+    Encode toutes les déclinaisons d'une photo dans le cache (exécuté dans
+    un processus du pool). Retourne {"width", "height", "widths"}, ou None
+    si la photo est illisible.
+    """
+    try:
+        with Image.open(source) as image:
+            # Applique l'orientation EXIF des photos prises au téléphone
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            width, height = image.size
+            widths = target_widths(width)
+
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            for w in widths:
+                h = max(1, round(height * w / width))
+                resized = image
+                if w != width:
+                    resized = image.resize((w, h), Image.LANCZOS)
+                for ext, _, pil_format, options in FORMATS:
+                    output = _variant_file(cache_dir, image_hash, w, ext)
+                    tmp_path = output.with_name(f".{output.name}.tmp")
+                    resized.save(tmp_path, pil_format, **options)
+                    tmp_path.replace(output)
+    except Exception as e:
+        print(f"⚠️ Image illisible: {source}: {e}")
+        return None
+
+    meta = {"width": width, "height": height, "widths": widths}
+    with open(_meta_file(cache_dir, image_hash), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return meta
+
+
+def _cache_outputs(cache_dir, image_hash, meta):
+    """Fichiers du cache produits pour une photo"""
+    outputs = [_meta_file(cache_dir, image_hash)]
+    for w in meta["widths"]:
+        outputs.extend(
+            _variant_file(cache_dir, image_hash, w, ext) for ext, *_ in FORMATS
+        )
+    return outputs
+
+
+def _read_meta(cache_dir, image_hash):
+    with open(_meta_file(cache_dir, image_hash), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _variant_path(web_path, width, ext):
+    """
+    Chemin publié d'une déclinaison: photo.jpg -> photo.jpg-480w.webp.
+    L'extension de l'original est gardée: photo.jpg et photo.png d'un même
+    dossier ont des déclinaisons distinctes.
+    """
+    return f"{web_path}-{width}w.{ext}"
+
+
+def _frontmatter_entry(web_path, meta):
+    """Entrée du frontmatter "images" pour une photo"""
+    widths = meta["widths"]
+    largest = widths[-1]
+    return {
+        "src": _variant_path(web_path, largest, "jpg"),
+        "original": web_path,
+        "width": largest,
+        "height": max(1, round(meta["height"] * largest / meta["width"])),
+        "sources": [
+            {
+                "type": mime,
+                "srcset": [
+                    {"src": _variant_path(web_path, w, ext), "width": w}
+                    for w in widths
+                ],
+            }
+            for ext, mime, _, _ in FORMATS
+        ],
+    }
+
+
+def _is_cached(manifest, cache_dir, image_hash, inputs_hash):
+    """Vérifie que toutes les déclinaisons d'une photo sont dans le cache"""
+    if not manifest.is_fresh(_meta_file(cache_dir, image_hash), inputs_hash):
+        return None
+    meta = _read_meta(cache_dir, image_hash)
+    outputs = _cache_outputs(cache_dir, image_hash, meta)
+    if not all(manifest.is_fresh(output, inputs_hash) for output in outputs):
+        return None
+    for output in outputs:
+        manifest.mark(output)
+    return meta
+
+
+def build_variants(photos, group, jobs=1):
+    """
+    photos est une liste de (source, stat, web_path, static_path), où
+    web_path est le chemin publié de l'original (images/produits/...) et
+    static_path sa copie dans static/. Retourne ({web_path: entrée du
+    frontmatter}, [(fichier du cache, cible dans static/, None)]) pour
+    BuildManifest.sync_files. Sans Pillow, ou pour une photo illisible,
+    l'entrée est le chemin de l'original. group nomme le cache du
+    générateur appelant (.build-cache/images/<group>/).
+    """
+    entries = {web_path: web_path for _, _, web_path, _ in photos}
+    if Image is None:
+        if photos:
+            print("⚠️ Pillow non installé: les images ne sont pas redimensionnées")
+        return entries, []
+
+    cache_dir = VARIANTS_CACHE_DIR / group
+    manifest = BuildManifest(f"image-variants-{group}", VARIANTS_VERSION)
+    hashes = {}
+    metas = {}
+    missing = {}
+    for source, stat, web_path, _ in photos:
+        image_hash = manifest.hash_file(source, stat)
+        hashes[web_path] = image_hash
+        if image_hash in metas or image_hash in missing:
+            continue
+        inputs_hash = hash_inputs(VARIANTS_VERSION, image_hash)
+        meta = _is_cached(manifest, cache_dir, image_hash, inputs_hash)
+        if meta is not None:
+            metas[image_hash] = meta
+        else:
+            missing[image_hash] = source
+
+    # Encode les photos nouvelles ou modifiées
+    image_hashes = list(missing)
+    sources = [missing[image_hash] for image_hash in image_hashes]
+    cache_dirs = [cache_dir] * len(sources)
+    if jobs > 1 and len(sources) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(encode_variants, sources, image_hashes, cache_dirs)
+            )
+    else:
+        results = list(map(encode_variants, sources, image_hashes, cache_dirs))
+
+    for image_hash, source, meta in zip(image_hashes, sources, results):
+        if meta is None:
+            continue
+        metas[image_hash] = meta
+        inputs_hash = hash_inputs(VARIANTS_VERSION, image_hash)
+        for output in _cache_outputs(cache_dir, image_hash, meta):
+            manifest.record(output, inputs_hash)
+        count("images_encoded")
+        widths = ", ".join(str(w) for w in meta["widths"])
+        progress(f"  🖼️ Déclinaisons: {Path(source).name} ({widths} px)")
+
+    manifest.prune_orphans()
+    manifest.save()
+
+    assets = []
+    for _, _, web_path, static_path in photos:
+        image_hash = hashes[web_path]
+        meta = metas.get(image_hash)
+        if meta is None:
+            continue
+        entries[web_path] = _frontmatter_entry(web_path, meta)
+        for w in meta["widths"]:
+            for ext, *_ in FORMATS:
+                target = _variant_path(str(static_path), w, ext)
+                variant = _variant_file(cache_dir, image_hash, w, ext)
+                assets.append((variant, Path(target), None))
+    return entries, assets
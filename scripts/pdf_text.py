@@ -0,0 +1,189 @@
+"""
+Extraction du texte des manuels PDF pour l'index de recherche
+
+Pour chaque page d'un PDF on garde le texte, les numéros de pièces (670861,
+BER0103...) et les titres de section (PARTS, THREE POINT HITCH...). Le
+résultat est mis en cache par empreinte du contenu du PDF dans
+.build-cache/pdf-text/<sha256>.json: un manuel inchangé, même renommé ou
+déplacé, n'est jamais relu. Les PDF absents du cache sont extraits sur un
+pool de processus.
+
+L'extraction utilise pypdf (optionnel): sans lui, les PDF ne sont pas
+indexés et un avertissement est affiché. pypdf n'est importé qu'à la
+première extraction: les générateurs qui n'utilisent que le tokenizer de
+l'index de recherche (produits similaires) n'en paient pas le chargement.
+"""
+
+import importlib.util
+import json
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cache import CACHE_DIR, BuildManifest, hash_inputs
+from build_metrics import count, progress
+
+# pypdf installé (importé par extract_pdf, dans les processus du pool)
+HAS_PYPDF = importlib.util.find_spec("pypdf") is not None
+
+# À incrémenter quand le format des pages extraites change
+EXTRACTOR_VERSION = "1"
+
+TEXT_CACHE_DIR = CACHE_DIR / "pdf-text"
+
+# Numéros de pièces: 6 ou 7 chiffres, ou code d'option "BER 0103"
+PART_NUMBER = re.compile(r"\b(?:BER ?\d{4}|\d{6,7})\b")
+
+# En-tête courant des pages ("OM 0440SB92-A 39")
+RUNNING_HEADER = re.compile(r"^OM[ -]?\d{4}\w*(?:-\w+)?(?: \d+)?$")
+
+# Fin de titre répétée sur les pages suivantes ("SAFETY PRECAUTIONS - continued")
+CONTINUED = re.compile(r"\s*-\s*(?:continued|suite)$", re.IGNORECASE)
+
+# En-têtes de tableaux de pièces et lignes de table des matières
+TABLE_HEADER = re.compile(r"^R[EÉ]F\b|\.{5}")
+
+# Lettres doublées du texte en relief des pages de couverture
+# ("OOPPEERRAATTOORR''SS" -> "OPERATOR'S")
+DOUBLED = re.compile(r"\b(?=[\d']*[^\W\d_])(?:(\w)\1|''){3,}\b")
+
+# Nombre maximum de titres retenus par page et longueur d'un titre
+MAX_HEADINGS = 2
+MAX_HEADING_LENGTH = 80
+
+# Les avertissements de pypdf sur les PDF mal formés noient la sortie
+logging.getLogger("pypdf").setLevel(logging.ERROR)
+
+
+def _undouble(match):
+    return match.group(0)[::2]
+
+
+def clean_text(text):
+    """Normalise les espaces et corrige les lettres doublées"""
+    text = DOUBLED.sub(_undouble, text)
+    return "\n".join(" ".join(line.split()) for line in text.splitlines())
+
+
+def find_headings(lines):
+    """
+    Titres de section d'une page: la première ligne (titre du chapitre),
+    puis les lignes en majuscules qui suivent, jusqu'au premier paragraphe
+    ou en-tête de tableau
+    """
+    headings = []
+    for line in lines:
+        if RUNNING_HEADER.match(line):
+            continue
+        if TABLE_HEADER.search(line) or len(line) > MAX_HEADING_LENGTH:
+            break
+        line = CONTINUED.sub("", line)
+        if not line[0].isupper() or (headings and line != line.upper()):
+            break
+        if line not in headings:
+            headings.append(line)
+        if len(headings) >= MAX_HEADINGS:
+            break
+    return headings
+
+
+def find_part_numbers(text):
+    """Numéros de pièces distincts d'un texte, dans l'ordre d'apparition"""
+    parts = {}
+    for match in PART_NUMBER.finditer(text):
+        parts.setdefault(match.group(0).replace(" ", ""), None)
+    return list(parts)
+
+
+def extract_pdf(path):
+    """
+    Extrait les pages d'un PDF (exécuté dans un processus du pool).
+    Retourne une liste de {"page", "text", "headings", "parts"}; un PDF
+    illisible ou vide donne une liste vide.
+    """
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(path)
+        pages = []
+        for number, page in enumerate(reader.pages, start=1):
+            text = clean_text(page.extract_text() or "")
+            lines = [line for line in text.splitlines() if line]
+            if not lines:
+                continue
+            pages.append(
+                {
+                    "page": number,
+                    "text": "\n".join(lines),
+                    "headings": find_headings(lines),
+                    "parts": find_part_numbers(text),
+                }
+            )
+        return pages
+    except Exception as e:
+        print(f"⚠️ Extraction impossible: {path}: {e}")
+        return []
+
+
+def _cache_file(pdf_hash):
+    return TEXT_CACHE_DIR / f"{pdf_hash}.json"
+
+
+def _read_cache(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_cache(path, pages):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(pages, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def extract_all(pdf_files, jobs=1):
+    """
+    Retourne {pdf: pages} pour chaque PDF de pdf_files. Seuls les PDF dont
+    le contenu n'est pas déjà en cache sont extraits, sur jobs processus.
+    """
+    if not HAS_PYPDF:
+        print("⚠️ pypdf non installé: le texte des PDF n'est pas indexé")
+        return {}
+
+    manifest = BuildManifest("pdf-text", EXTRACTOR_VERSION)
+    cached = {}
+    missing = {}
+    for pdf in pdf_files:
+        pdf_hash = manifest.hash_file(pdf)
+        output = _cache_file(pdf_hash)
+        inputs_hash = hash_inputs(EXTRACTOR_VERSION, pdf_hash)
+        manifest.mark(output)
+        if manifest.is_fresh(output, inputs_hash):
+            cached[pdf] = output
+        else:
+            # Un même contenu présent à plusieurs endroits n'est extrait qu'une fois
+            missing.setdefault(output, (inputs_hash, []))[1].append(pdf)
+
+    sources = [pdfs[0] for _, pdfs in missing.values()]
+    if jobs > 1 and len(sources) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(extract_pdf, sources))
+    else:
+        results = [extract_pdf(pdf) for pdf in sources]
+
+    extracted = {}
+    for (output, (inputs_hash, pdfs)), pages in zip(missing.items(), results):
+        _write_cache(output, pages)
+        manifest.record(output, inputs_hash)
+        count("pdfs_extracted")
+        count("pdf_pages_extracted", len(pages))
+        for pdf in pdfs:
+            extracted[pdf] = pages
+            progress(f"  📄 Texte extrait: {pdf} ({len(pages)} pages)")
+
+    manifest.prune_orphans()
+    manifest.save()
+
+    return {
+        pdf: extracted[pdf] if pdf in extracted else _read_cache(cached[pdf])
+        for pdf in pdf_files
+    }
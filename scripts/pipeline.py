@@ -0,0 +1,161 @@
+"""
+Exécution des générateurs comme étapes d'un graphe de dépendances
+
+Chaque étape (Stage) est une fonction sans argument et la liste des étapes
+dont elle dépend. run_stages() lance en parallèle, sur des threads, les
+étapes dont toutes les dépendances sont terminées: les générateurs passent
+l'essentiel de leur temps en entrées/sorties ou dans leurs propres pools de
+processus. Les données à transmettre d'une étape à l'autre (pages rendues,
+...) sont partagées en mémoire par les fonctions des étapes elles-mêmes.
+
+Si une étape échoue, les étapes qui en dépendent ne sont pas lancées, mais
+les étapes indépendantes vont jusqu'au bout.
+"""
+
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import build_metrics
+
+
+class Stage:
+    """Étape du build: nom, fonction à appeler, étapes à attendre"""
+
+    def __init__(self, name, run, after=()):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        # Renseignés par run_stages
+        self.status = "en attente"
+        self.elapsed = 0.0
+        self.error = None
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, after={self.after!r})"
+
+
+def check_graph(stages):
+    """Vérifie que les dépendances existent et ne forment pas de cycle"""
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Noms d'étapes en double")
+    for stage in stages:
+        for name in stage.after:
+            if name not in by_name:
+                raise ValueError(f"Étape {stage.name}: dépendance inconnue {name}")
+
+    # Tri topologique: il reste des étapes si et seulement s'il y a un cycle
+    remaining = {stage.name: set(stage.after) for stage in stages}
+    while remaining:
+        ready = [name for name, after in remaining.items() if not after]
+        if not ready:
+            raise ValueError(f"Cycle entre les étapes: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for after in remaining.values():
+            after.difference_update(ready)
+
+
+def select_stages(stages, names):
+    """
+    Sous-graphe des étapes nommées et de toutes celles qui en dépendent,
+    directement ou non. Les dépendances vers les étapes non retenues sont
+    considérées comme satisfaites.
+    """
+    selected = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for stage in stages:
+            if stage.name not in selected and selected.intersection(stage.after):
+                selected.add(stage.name)
+                changed = True
+
+    return [
+        Stage(
+            stage.name,
+            stage.run,
+            after=[name for name in stage.after if name in selected],
+        )
+        for stage in stages
+        if stage.name in selected
+    ]
+
+
+def _run_stage(stage):
+    """Appelle une étape en mesurant sa durée (exécuté dans un thread)"""
+    start = time.perf_counter()
+    try:
+        with build_metrics.stage(stage.name):
+            stage.run()
+    finally:
+        stage.elapsed = time.perf_counter() - start
+
+
+def run_stages(stages, parallel=True):
+    """
+    Exécute les étapes dans l'ordre du graphe. Avec parallel, les étapes
+    indépendantes sont lancées en même temps. Retourne True si toutes les
+    étapes ont réussi.
+    """
+    check_graph(stages)
+    if parallel and build_metrics.METRICS.profiling and len(stages) > 1:
+        # Un seul profileur peut être actif à la fois (Python 3.12+), et
+        # cProfile ne suit que le thread qui l'active
+        print("⚠️ --profile: étapes lancées une par une")
+        parallel = False
+    pending = list(stages)
+    done = set()
+    failed = set()
+    workers = len(stages) if parallel else 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        running = {}
+        while pending or running:
+            for stage in list(pending):
+                if any(name in failed for name in stage.after):
+                    stage.status = "ignorée"
+                    failed.add(stage.name)
+                    pending.remove(stage)
+                elif all(name in done for name in stage.after):
+                    if not parallel and running:
+                        break
+                    print(f"\n▶️  {stage.name}")
+                    stage.status = "en cours"
+                    running[executor.submit(_run_stage, stage)] = stage
+                    pending.remove(stage)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    stage.status = "échec"
+                    stage.error = e
+                    failed.add(stage.name)
+                    traceback.print_exc()
+                    print(f"❌ {stage.name}: {e}")
+                else:
+                    stage.status = "ok"
+                    done.add(stage.name)
+
+    return not failed
+
+
+def timing_report(stages, total):
+    """Tableau des durées par étape (temps réel, temps CPU du thread)"""
+    width = max(len("total"), *(len(stage.name) for stage in stages))
+    lines = ["⏱️  Durée des étapes:"]
+    for stage in stages:
+        measures = build_metrics.METRICS.stages.get(stage.name, {})
+        cpu = measures.get("cpu_seconds", 0.0)
+        lines.append(
+            f"  {stage.name:<{width}}  {stage.elapsed:>7.2f} s"
+            f"  (CPU {cpu:>6.2f} s)  {stage.status}"
+        )
+    lines.append(f"  {'total':<{width}}  {total:>7.2f} s")
+    return "\n".join(lines)
@@ -0,0 +1,264 @@
+"""
+Produits similaires et renvois des manuels vers les produits, précalculés
+
+generate-products.py écrit data/related.json, lu par les gabarits de Hugo au
+lieu de comparer les pages entre elles au rendu:
+
+    {"version": 1,
+     "products": {"SA92B": [{"sku": "SA98B", "score": 0.83}, ...]},
+     "manuals": {"manuels/souffleuses/sa92b": ["SA92B", "SA98B"]}}
+
+Chaque produit est décrit par un vecteur TF-IDF creux: catégorie, manuel
+(manual_ref), clés de ses specs et mots du nom et de la description
+(normalisés comme pour l'index de recherche). Chaque groupe de
+caractéristiques a son poids (FEATURE_WEIGHTS). Les vecteurs sont normés,
+et le score de deux produits est leur cosinus.
+
+Les caractéristiques sont collectées pendant le parcours du catalogue qui
+écrit les pages (RelatedProducts.add, appelé par iter_pages de
+scripts/generators/products.py): le CSV et specs.yaml ne sont lus qu'une
+fois. Chaque caractéristique reçoit un identifiant entier, et celles des
+produits sont gardées bout à bout dans des tableaux typés (array), sans
+objet Python par produit: avec --stream, la mémoire reste de l'ordre de
+quelques octets par caractéristique.
+
+Les paires ne sont pas toutes comparées: un index inversé des
+caractéristiques donne, pour chaque produit, un produit scalaire partiel
+avec ceux qui en partagent au moins une. Les caractéristiques trop
+fréquentes (plus de MAX_SHARED_DF produits, ex. une catégorie entière) n'y
+entrent pas, pour que le coût reste proche du linéaire; elles comptent dans
+le cosinus exact, calculé pour les meilleurs candidats seulement. Un
+produit qui ne partage que des caractéristiques fréquentes (grande
+catégorie, mots courants) est comparé aux premiers produits de chacune
+(FALLBACK_SAMPLE au plus), des moins fréquentes aux plus fréquentes.
+"""
+
+import heapq
+import json
+import math
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from build_cache import hash_text
+from generators.search_index import tokenize
+
+RELATED_FILE = Path("data/related.json")
+
+# Version du format de data/related.json
+FORMAT_VERSION = 1
+
+# Produits similaires retenus par produit
+RELATED_COUNT = 4
+
+# Poids de chaque groupe de caractéristiques
+FEATURE_WEIGHTS = {
+    "category": 1.0,
+    "manual": 2.0,
+    "spec": 0.5,
+    "word": 1.0,
+}
+
+# Au-delà, une caractéristique ne sert plus à trouver des candidats
+MAX_SHARED_DF = 200
+
+# Produits gardés pour chaque caractéristique fréquente, candidats des
+# produits qui n'en ont pas d'autres
+FALLBACK_SAMPLE = 50
+
+# Candidats dont le cosinus exact est calculé, par produit retenu
+RERANK_FACTOR = 5
+
+
+def manual_key(manual_ref):
+    """Clé d'un manuel: chemin de sa page, sans barres obliques aux bouts"""
+    return manual_ref.strip("/").lower()
+
+
+def product_features(product, product_specs):
+    """Caractéristiques d'un produit, avec leur nombre d'occurrences"""
+    features = Counter()
+    features[("category", product.get("category", "").lower())] += 1
+    if product.get("manual_ref"):
+        features[("manual", manual_key(product["manual_ref"]))] += 1
+    for key in product_specs or {}:
+        features[("spec", str(key).lower())] += 1
+    text = f"{product.get('name', '')} {product.get('description', '')}"
+    for token in tokenize(text):
+        features[("word", token)] += 1
+    return features
+
+
+class RelatedProducts:
+    """Caractéristiques des produits, remplies produit par produit"""
+
+    def __init__(self, count=RELATED_COUNT):
+        self.count = count
+        self.skus = []
+        # Caractéristique -> identifiant, et fréquence de chaque identifiant
+        self.feature_ids = {}
+        self.df = array("I")
+        # Caractéristiques de tous les produits, bout à bout: celles du
+        # produit i vont de offsets[i] à offsets[i + 1]
+        self.offsets = array("Q", [0])
+        self.features = array("I")
+        self.tf = array("H")
+        # Manuel -> SKU qui y renvoient
+        self.references = defaultdict(list)
+
+    def add(self, product, product_specs):
+        """Ajoute un produit (ligne du CSV) et ses specs"""
+        sku = product["sku"].upper()
+        self.skus.append(sku)
+        for feature, tf in product_features(product, product_specs).items():
+            feature_id = self.feature_ids.setdefault(feature, len(self.df))
+            if feature_id == len(self.df):
+                self.df.append(0)
+            self.df[feature_id] += 1
+            self.features.append(feature_id)
+            self.tf.append(min(tf, 0xFFFF))
+        self.offsets.append(len(self.features))
+        if product.get("manual_ref"):
+            self.references[manual_key(product["manual_ref"])].append(sku)
+
+    def _weights(self):
+        """Poids TF-IDF normés, alignés sur self.features"""
+        total = len(self.skus)
+        group_weight = array("d", bytes(8 * len(self.df)))
+        for (group, _), feature_id in self.feature_ids.items():
+            group_weight[feature_id] = FEATURE_WEIGHTS[group]
+        idf = array(
+            "d", (math.log((1 + total) / (1 + n)) + 1 for n in self.df)
+        )
+
+        weights = array("d", bytes(8 * len(self.features)))
+        for i in range(total):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            norm = 0.0
+            for k in range(start, end):
+                feature_id = self.features[k]
+                weight = (
+                    group_weight[feature_id]
+                    * (1 + math.log(self.tf[k]))
+                    * idf[feature_id]
+                )
+                weights[k] = weight
+                norm += weight * weight
+            norm = math.sqrt(norm)
+            if norm:
+                for k in range(start, end):
+                    weights[k] /= norm
+        return weights
+
+    def _postings(self, weights):
+        """
+        Index inversé des caractéristiques peu fréquentes (identifiants et
+        poids des produits), et premiers produits des caractéristiques
+        fréquentes
+        """
+        postings = {}
+        samples = {}
+        for i in range(len(self.skus)):
+            for k in range(self.offsets[i], self.offsets[i + 1]):
+                feature_id = self.features[k]
+                df = self.df[feature_id]
+                if df == 1:
+                    # Propre à ce produit: ne donne aucun candidat
+                    continue
+                if df <= MAX_SHARED_DF:
+                    entry = postings.get(feature_id)
+                    if entry is None:
+                        entry = postings[feature_id] = (array("I"), array("d"))
+                    entry[0].append(i)
+                    entry[1].append(weights[k])
+                else:
+                    sample = samples.setdefault(feature_id, array("I"))
+                    if len(sample) < FALLBACK_SAMPLE:
+                        sample.append(i)
+        return postings, samples
+
+    def _fallback(self, i, vector, samples, limit):
+        """
+        Candidats d'un produit sans caractéristique peu fréquente en commun:
+        premiers produits de ses caractéristiques fréquentes, de la moins
+        fréquente à la plus fréquente
+        """
+        candidates = {}
+        common = sorted(
+            (feature_id for feature_id in vector if feature_id in samples),
+            key=lambda feature_id: (self.df[feature_id], feature_id),
+        )
+        for feature_id in common:
+            for other in samples[feature_id]:
+                if other != i:
+                    candidates[other] = None
+                    if len(candidates) >= limit:
+                        return list(candidates)
+        return list(candidates)
+
+    def neighbors(self):
+        """Les count produits les plus proches de chaque produit (cosinus)"""
+        weights = self._weights()
+        postings, samples = self._postings(weights)
+        limit = self.count * RERANK_FACTOR
+
+        for i, sku in enumerate(self.skus):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            vector = dict(zip(self.features[start:end], weights[start:end]))
+
+            # Produit scalaire partiel, accumulé sur les caractéristiques peu
+            # fréquentes (index inversé)
+            partial = defaultdict(float)
+            for feature_id, weight in vector.items():
+                entry = postings.get(feature_id)
+                if entry is not None:
+                    for other, other_weight in zip(*entry):
+                        partial[other] += weight * other_weight
+            partial.pop(i, None)
+
+            candidates = heapq.nlargest(limit, partial, key=partial.get)
+            if len(candidates) < self.count:
+                seen = set(candidates)
+                candidates += [
+                    other
+                    for other in self._fallback(i, vector, samples, limit)
+                    if other not in seen
+                ]
+
+            # Cosinus exact pour les meilleurs candidats seulement
+            scores = []
+            for other in candidates:
+                other_start, other_end = self.offsets[other], self.offsets[other + 1]
+                score = sum(
+                    vector.get(self.features[k], 0.0) * weights[k]
+                    for k in range(other_start, other_end)
+                )
+                scores.append((-score, self.skus[other]))
+            scores.sort()
+            yield sku, [
+                {"sku": other, "score": round(-score, 4)}
+                for score, other in scores[: self.count]
+            ]
+
+    def to_json(self):
+        """
+        Texte de data/related.json, assemblé produit par produit (sans
+        dictionnaire de tous les produits en mémoire)
+        """
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        products = ",".join(
+            f"{dumps(sku)}:{dumps(related)}" for sku, related in self.neighbors()
+        )
+        manuals = {key: sorted(skus) for key, skus in sorted(self.references.items())}
+        return (
+            f'{{"version":{FORMAT_VERSION},"products":{{{products}}},'
+            f'"manuals":{dumps(manuals)}}}'
+        )
+
+    def write(self, manifest):
+        """
+        Écrit data/related.json avec le manifeste du générateur, seulement si
+        son contenu a changé. Retourne True si le fichier a été réécrit.
+        """
+        text = self.to_json()
+        return manifest.write_text(RELATED_FILE, hash_text(text), str, text)
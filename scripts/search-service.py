@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Service de recherche HTTP local (optionnel)
+Usage: python scripts/search-service.py [--index FICHIER] [--port 8765]
+Voir scripts/search_service.py; l'index est écrit par
+generate-search-index.py --service-index.
+"""
+
+from search_service import main
+
+if __name__ == "__main__":
+    main()
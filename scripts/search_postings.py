@@ -0,0 +1,222 @@
+"""
+Index de recherche binaire, lu par projection en mémoire (mmap)
+
+generate-search-index.py --service-index écrit, à côté des fragments JSON du
+site, le même index (mêmes documents, mêmes identifiants, mêmes termes) dans
+un seul fichier binaire lu par le service de recherche
+(scripts/search_service.py). Le fichier n'est jamais chargé en entier:
+l'ouverture ne lit que l'en-tête, quelle que soit la taille du corpus, et le
+système ne charge que les pages touchées par les requêtes.
+
+Format (entiers little-endian, sections alignées sur 8 octets):
+
+    en-tête      "TPSI", version, nombre de termes, nombre de documents,
+                 puis position de chaque section
+    term_offsets n_terms + 1 entiers 64 bits: début de chaque terme
+    terms        termes UTF-8 triés, bout à bout (recherche dichotomique)
+    post_offsets n_terms + 1 entiers 64 bits: début de chaque liste
+    postings     identifiants de documents, entiers 32 bits triés
+    doc_offsets  n_docs + 1 entiers 64 bits: début de chaque document
+    docs         [titre, description, url, section] en JSON UTF-8
+
+Le fichier est remplacé atomiquement (os.replace): un service qui lit
+l'ancien n'est pas perturbé et peut rouvrir le nouveau.
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from itertools import accumulate
+from pathlib import Path
+
+# Emplacement par défaut (généré, comme le reste de .build-cache/)
+INDEX_FILE = Path(".build-cache/search-index.bin")
+
+MAGIC = b"TPSI"
+FORMAT_VERSION = 1
+
+# Magie, version, nombres de termes et de documents, positions des sections
+HEADER = struct.Struct("<4sIQQ6Q")
+SECTIONS = ("term_offsets", "terms", "post_offsets", "postings", "doc_offsets", "docs")
+
+# Au-delà, seuls les premiers termes d'un préfixe (mot en cours de saisie)
+# sont réunis
+MAX_PREFIX_TERMS = 256
+
+
+def _offsets(chunks):
+    """Positions de début de chaque morceau, plus la fin"""
+    return array("Q", [0, *accumulate(len(chunk) for chunk in chunks)])
+
+
+def write_postings(path, docs, index):
+    """
+    Écrit l'index binaire. docs est la liste des documents
+    [titre, description, url, section] dans l'ordre de leurs identifiants,
+    index associe chaque terme à sa liste triée d'identifiants.
+    """
+    terms = sorted(index)
+    term_bytes = [term.encode("utf-8") for term in terms]
+    postings = [array("I", index[term]) for term in terms]
+    post_offsets = _offsets(postings)
+    doc_bytes = [
+        json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for doc in docs
+    ]
+
+    sections = [
+        _offsets(term_bytes).tobytes(),
+        b"".join(term_bytes),
+        array("Q", (offset * 4 for offset in post_offsets)).tobytes(),
+        b"".join(posting.tobytes() for posting in postings),
+        _offsets(doc_bytes).tobytes(),
+        b"".join(doc_bytes),
+    ]
+
+    positions = []
+    position = HEADER.size
+    for section in sections:
+        position += -position % 8
+        positions.append(position)
+        position += len(section)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(terms), len(docs), *positions))
+        for start, section in zip(positions, sections):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+    return position
+
+
+class PostingsIndex:
+    """Index binaire ouvert en lecture seule"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self.stat = os.fstat(self._file.fileno())
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        header = HEADER.unpack_from(view)
+        magic, version, self.term_count, self.doc_count, *positions = header
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{self.path}: format d'index inconnu")
+
+        ends = [*positions[1:], len(view)]
+        sections = {
+            name: view[start:end]
+            for name, start, end in zip(SECTIONS, positions, ends)
+        }
+        # Chaque section est suivie du bourrage qui aligne la suivante
+        term_size = (self.term_count + 1) * 8
+        doc_size = (self.doc_count + 1) * 8
+        self._term_offsets = sections["term_offsets"][:term_size].cast("Q")
+        self._terms = sections["terms"]
+        self._post_offsets = sections["post_offsets"][:term_size].cast("Q")
+        self._postings = sections["postings"]
+        self._doc_offsets = sections["doc_offsets"][:doc_size].cast("Q")
+        self._docs = sections["docs"]
+        self._views = [
+            view,
+            *sections.values(),
+            self._term_offsets,
+            self._post_offsets,
+            self._doc_offsets,
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in reversed(getattr(self, "_views", ())):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+    def term(self, i):
+        """Terme numéro i (ordre trié)"""
+        return bytes(self._terms[self._term_offsets[i] : self._term_offsets[i + 1]])
+
+    def lower_bound(self, term):
+        """Numéro du premier terme >= term (bytes UTF-8)"""
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def postings(self, i):
+        """Identifiants des documents du terme numéro i (entiers 32 bits)"""
+        start, end = self._post_offsets[i], self._post_offsets[i + 1]
+        return self._postings[start:end].cast("I")
+
+    def lookup(self, term, is_prefix=False):
+        """
+        Identifiants triés des documents qui contiennent term; s'il n'est pas
+        un terme de l'index et is_prefix, ceux des termes qui commencent par
+        term
+        """
+        key = term.encode("utf-8")
+        i = self.lower_bound(key)
+        if i < self.term_count and self.term(i) == key:
+            return self.postings(i)
+        if not is_prefix:
+            return ()
+        matches = []
+        for j in range(i, min(i + MAX_PREFIX_TERMS, self.term_count)):
+            if not self.term(j).startswith(key):
+                break
+            matches.append(self.postings(j))
+        if len(matches) == 1:
+            return matches[0]
+        return sorted(set().union(*matches))
+
+    def search(self, terms):
+        """
+        Identifiants triés des documents qui contiennent tous les termes
+        normalisés, le dernier pouvant être un préfixe (comme
+        static/js/search-worker.js)
+        """
+        if not terms:
+            return ()
+        found = sorted(
+            (
+                self.lookup(term, is_prefix=i == len(terms) - 1)
+                for i, term in enumerate(terms)
+            ),
+            key=len,
+        )
+        if len(found) == 1 or not found[0]:
+            return found[0]
+        # Intersection à partir de la liste la plus courte
+        ids = set(found[0])
+        for postings in found[1:]:
+            ids.intersection_update(postings)
+            if not ids:
+                return ()
+        return sorted(ids)
+
+    def doc(self, doc_id):
+        """Document numéro doc_id: titre, description, url et section"""
+        start, end = self._doc_offsets[doc_id], self._doc_offsets[doc_id + 1]
+        title, description, url, section = json.loads(bytes(self._docs[start:end]))
+        return {
+            "title": title,
+            "description": description,
+            "url": url,
+            "section": section,
+        }
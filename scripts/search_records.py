@@ -0,0 +1,213 @@
+"""
+Enregistrements de recherche publiés par les générateurs
+
+Quand un générateur écrit une page, son manifeste de build (voir
+scripts/build_cache.py) ajoute l'enregistrement de recherche de la page à
+un journal JSONL propre au générateur, .build-cache/search/<générateur>.jsonl:
+
+    {"path": "content/produits/sa92b.md", "title": "...", "description": "...",
+     "body": "...", "sku": "SA92B", "specs": {"largeur": "92 pouces (2337 mm)"},
+     "manuals": ["OM-0440SB92-A", ...], "stat": [taille, mtime_ns]}
+
+Une page supprimée ou abandonnée par le générateur y est notée
+{"path": ..., "deleted": true}. Le journal n'est jamais réécrit par les
+générateurs: seule la dernière ligne de chaque page compte, et
+RecordStore.refresh() le compacte quand les lignes périmées dominent.
+
+L'enregistrement vient du frontmatter et du corps de la page tels que le
+générateur les construit (fonction déclarée avec @renders), sans relire ni
+reparser le fichier: les specs, le SKU et les titres des manuels sont
+indexés tels quels. generate-search-index.py ne lit que les pages sans
+enregistrement (pages écrites à la main) et celles dont la taille ou la date
+de modification ne correspond plus à "stat" (pages retouchées à la main).
+
+Quand le journal d'un générateur est absent au début d'un build (premier
+build, cache vidé), les pages déjà à jour y sont aussi notées.
+"""
+
+import json
+import os
+from pathlib import Path
+
+CACHE_DIR = Path(".build-cache")
+RECORDS_DIR = CACHE_DIR / "search"
+
+# Le journal est compacté au-delà de ce nombre de lignes périmées, si elles
+# sont plus nombreuses que les lignes utiles
+COMPACT_MIN_LINES = 1000
+
+
+def renders(page):
+    """
+    Déclare la fonction page(*args) -> (frontmatter, corps) d'une fonction
+    de rendu: le manifeste en tire l'enregistrement de recherche de chaque
+    page qu'il écrit avec cette fonction
+    """
+
+    def decorate(render):
+        render.page = page
+        return render
+
+    return decorate
+
+
+def search_record(path, frontmatter, body):
+    """Enregistrement de recherche d'une page (path: chemin du fichier)"""
+    manuals = [
+        str(entry["title"])
+        for key in ("manuals", "documents")
+        for entry in frontmatter.get(key) or ()
+        if isinstance(entry, dict) and entry.get("title")
+    ]
+    specs = frontmatter.get("specs") or {}
+    return {
+        "path": str(path),
+        "title": str(frontmatter.get("title") or Path(path).stem),
+        "description": str(frontmatter.get("description") or ""),
+        "body": body,
+        "sku": str(frontmatter.get("sku") or ""),
+        "specs": (
+            {str(key): str(value) for key, value in specs.items()}
+            if isinstance(specs, dict)
+            else {}
+        ),
+        "manuals": manuals,
+    }
+
+
+class RecordLog:
+    """Journal des enregistrements d'un générateur, ouvert en ajout"""
+
+    def __init__(self, generator, records_dir=RECORDS_DIR):
+        self.path = Path(records_dir) / f"{generator}.jsonl"
+        self.missing = not self.path.exists()
+        self._file = None
+
+    def _write(self, record):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def publish(self, output, render, args):
+        """Note la page output, rendue par render(*args), si render a @renders"""
+        page = getattr(render, "page", None)
+        if page is not None:
+            frontmatter, body = page(*args)
+            record = search_record(output, frontmatter, body)
+            stat = os.stat(output)
+            record["stat"] = [stat.st_size, stat.st_mtime_ns]
+            self._write(record)
+
+    def keep(self, output, render, args):
+        """Note une page déjà à jour si le journal était absent"""
+        if self.missing:
+            self.publish(output, render, args)
+
+    def remove(self, output):
+        """Note que la page output n'est plus produite par le générateur"""
+        # Seules les pages Markdown ont un enregistrement
+        if str(output).endswith(".md"):
+            self._write({"path": str(output), "deleted": True})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordStore:
+    """
+    Enregistrements de tous les générateurs, par chemin de page. Gardé en
+    mémoire par le mode --watch: refresh() ne lit que les lignes ajoutées
+    depuis l'appel précédent.
+    """
+
+    def __init__(self, records_dir=RECORDS_DIR):
+        self.records_dir = Path(records_dir)
+        self.records = {}
+        # Journal -> (position lue, numéro de fichier, lignes lues)
+        self._positions = {}
+        # Chemin de page -> journal qui l'a noté en dernier
+        self._owners = {}
+
+    def get(self, path):
+        """Enregistrement de la page path, si le fichier n'a pas changé depuis"""
+        record = self.records.get(path)
+        if record is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if record.get("stat") != [stat.st_size, stat.st_mtime_ns]:
+            return None
+        return record
+
+    def refresh(self):
+        """Lit les lignes ajoutées aux journaux; retourne les pages modifiées"""
+        changed = set()
+        logs = []
+        if self.records_dir.is_dir():
+            logs = sorted(self.records_dir.glob("*.jsonl"))
+        for log in set(self._positions) - set(logs):
+            changed |= self._forget(log)
+        for log in logs:
+            changed |= self._read(log)
+        return changed
+
+    def _forget(self, log):
+        """Retire les pages d'un journal disparu ou remplacé"""
+        self._positions.pop(log, None)
+        paths = {path for path, owner in self._owners.items() if owner == log}
+        for path in paths:
+            del self._owners[path]
+            self.records.pop(path, None)
+        return paths
+
+    def _read(self, log):
+        stat = log.stat()
+        position, inode, lines = self._positions.get(log, (0, None, 0))
+        changed = set()
+        if inode != stat.st_ino or stat.st_size < position:
+            # Journal compacté ou recréé: relu en entier
+            changed |= self._forget(log)
+            position, lines = 0, 0
+
+        with open(log, "rb") as f:
+            f.seek(position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Ligne en cours d'écriture: relue au prochain appel
+                    break
+                position += len(line)
+                lines += 1
+                record = json.loads(line)
+                path = record["path"]
+                changed.add(path)
+                if record.get("deleted"):
+                    # Une page reprise par un autre générateur reste indexée
+                    if self._owners.get(path) == log:
+                        del self._owners[path]
+                        del self.records[path]
+                else:
+                    self.records[path] = record
+                    self._owners[path] = log
+        self._positions[log] = (position, stat.st_ino, lines)
+
+        live = sum(1 for owner in self._owners.values() if owner == log)
+        if lines - live > max(COMPACT_MIN_LINES, live):
+            self._compact(log)
+        return changed
+
+    def _compact(self, log):
+        """Réécrit un journal avec une seule ligne par page encore produite"""
+        tmp_path = log.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for path, owner in self._owners.items():
+                if owner == log:
+                    f.write(json.dumps(self.records[path], ensure_ascii=False) + "\n")
+        os.replace(tmp_path, log)
+        stat = log.stat()
+        live = sum(1 for owner in self._owners.values() if owner == log)
+        self._positions[log] = (stat.st_size, stat.st_ino, live)
@@ -0,0 +1,343 @@
+"""
+Service de recherche HTTP local (optionnel), pour les bornes en magasin et
+le comptoir des pièces
+
+Sert le même corpus que l'index du site, à partir de l'index binaire écrit
+par generate-search-index.py --service-index (voir scripts/search_postings.py):
+le fichier est projeté en mémoire, son ouverture ne dépend pas de la taille
+du corpus, et le navigateur de la borne ne télécharge que les résultats.
+
+    GET /search?q=sa92b&limit=10
+    -> {"total": 3, "results": [{"title": ..., "description": ..., "url": ...,
+        "section": ...}]}
+    GET /stats -> documents, termes, requêtes et efficacité du cache
+
+Les requêtes sont normalisées comme dans le navigateur (tokenize de
+scripts/generators/search_index.py) et leurs réponses gardées dans un cache
+LRU: « Souffleuse » et « souffleuses » partagent la même entrée. Le serveur
+(asyncio, HTTP/1.1 avec keep-alive, sans dépendance) sert les connexions
+simultanées. Les réponses en cache sont servies directement; les autres
+(intersection des listes de documents) sont calculées dans le pool de
+threads de la boucle, pour qu'une requête coûteuse ne bloque pas les autres
+connexions. L'index est rouvert, et le cache vidé, quand le fichier est
+remplacé par un nouveau build.
+
+Usage: python scripts/search-service.py [--index .build-cache/search-index.bin]
+                                        [--host 127.0.0.1] [--port 8765]
+                                        [--cache-size 4096]
+Charge: python scripts/benchmarks/bench-search-service.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from generators.search_index import tokenize
+from search_postings import INDEX_FILE, PostingsIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Réponses gardées en mémoire (requêtes normalisées les plus récentes)
+CACHE_SIZE = 4096
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+# Intervalle de vérification du fichier d'index (secondes)
+RELOAD_INTERVAL = 2.0
+
+# Taille maximale de la ligne de requête et des en-têtes HTTP
+MAX_REQUEST_LINE = 8192
+MAX_HEADERS = 100
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def error_body(message):
+    return json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+
+
+class LRUCache:
+    """Cache LRU des réponses, par requête normalisée"""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        if self.size <= 0:
+            return
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class SearchService:
+    """Index binaire ouvert et cache des réponses"""
+
+    def __init__(self, index_path, cache_size=CACHE_SIZE):
+        self.index_path = Path(index_path)
+        self.index = PostingsIndex(self.index_path)
+        self.cache = LRUCache(cache_size)
+        self.requests = 0
+
+    def reload_if_changed(self):
+        """Rouvre l'index si le fichier a été remplacé; retourne True si oui"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return False
+        current = self.index.stat
+        if (stat.st_ino, stat.st_mtime_ns) == (current.st_ino, current.st_mtime_ns):
+            return False
+        # L'ancien index est fermé par le ramasse-miettes, une fois libéré
+        self.index = PostingsIndex(self.index_path)
+        self.cache.clear()
+        return True
+
+    @staticmethod
+    def _results(index, terms, limit):
+        """Réponse JSON (bytes) calculée sur l'index (hors de la boucle)"""
+        ids = index.search(terms)
+        return json.dumps(
+            {
+                "total": len(ids),
+                "results": [index.doc(doc_id) for doc_id in ids[:limit]],
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    async def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Réponse JSON (bytes) à une requête. Hors du cache, elle est calculée
+        dans le pool de threads de la boucle (l'index projeté en mémoire
+        n'est que lu).
+        """
+        self.requests += 1
+        terms = tuple(tokenize(query))
+        key = (terms, limit)
+        body = self.cache.get(key)
+        if body is None:
+            index = self.index
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(
+                None, self._results, index, terms, limit
+            )
+            # Pas de réponse de l'ancien index dans le cache d'un index rouvert
+            if index is self.index:
+                self.cache.put(key, body)
+        return body
+
+    def stats(self):
+        """Réponse JSON (bytes) de /stats"""
+        cache = self.cache
+        lookups = cache.hits + cache.misses
+        return json.dumps(
+            {
+                "index": str(self.index_path),
+                "documents": self.index.doc_count,
+                "terms": self.index.term_count,
+                "requests": self.requests,
+                "cache": {
+                    "size": len(cache.entries),
+                    "max_size": cache.size,
+                    "hits": cache.hits,
+                    "misses": cache.misses,
+                    "hit_rate": round(cache.hits / lookups, 4) if lookups else 0,
+                },
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    async def respond(self, method, target):
+        """Statut et corps de la réponse à une requête HTTP"""
+        if method != "GET":
+            return 405, error_body("GET uniquement")
+        url = urlsplit(target)
+        if url.path == "/search":
+            params = parse_qs(url.query)
+            query = params.get("q", [""])[0]
+            try:
+                limit = int(params.get("limit", [DEFAULT_LIMIT])[0])
+            except ValueError:
+                return 400, error_body("limit invalide")
+            return 200, await self.search(query, max(1, min(limit, MAX_LIMIT)))
+        if url.path == "/stats":
+            return 200, self.stats()
+        return 404, error_body("introuvable")
+
+
+async def read_request(reader):
+    """
+    Ligne de requête et en-têtes d'une requête HTTP/1.x, ou None si la
+    connexion est fermée
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    if len(line) > MAX_REQUEST_LINE:
+        raise ValueError("ligne de requête trop longue")
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("ligne de requête invalide")
+    method, target, version = parts
+
+    headers = {}
+    for _ in range(MAX_HEADERS):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ValueError("trop d'en-têtes")
+
+    # Les requêtes acceptées n'ont pas de corps; un corps éventuel est ignoré
+    length = int(headers.get("content-length", "0") or 0)
+    if length:
+        await reader.readexactly(length)
+    return method, target, version, headers
+
+
+def keep_alive(version, headers):
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def render_response(status, body, alive):
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        f"Connection: {'keep-alive' if alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def connection_handler(service):
+    """Traite les requêtes successives d'une connexion (keep-alive)"""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    body = error_body("requête invalide")
+                    writer.write(render_response(400, body, False))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                alive = keep_alive(version, headers)
+                status, body = await service.respond(method, target)
+                writer.write(render_response(status, body, alive))
+                await writer.drain()
+                if not alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def watch_index(service):
+    """Rouvre l'index quand generate-search-index.py le remplace"""
+    while True:
+        await asyncio.sleep(RELOAD_INTERVAL)
+        try:
+            if service.reload_if_changed():
+                print(f"🔄 Index rechargé: {service.index.doc_count} documents")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Index non rechargé: {e}")
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = await asyncio.start_server(connection_handler(service), host, port)
+    watcher = asyncio.create_task(watch_index(service))
+    addresses = ", ".join(
+        "http://{}:{}".format(*sock.getsockname()[:2]) for sock in server.sockets
+    )
+    print(f"🔎 Recherche sur {addresses}/search?q=")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Service de recherche HTTP local")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=INDEX_FILE,
+        help="index binaire écrit par generate-search-index.py --service-index",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=CACHE_SIZE,
+        metavar="N",
+        help="nombre de réponses gardées en cache (0: sans cache)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+    if not args.index.exists():
+        print(
+            f"❌ {args.index} introuvable:"
+            " lancer generate-search-index.py --service-index"
+        )
+        raise SystemExit(1)
+
+    start = time.perf_counter()
+    service = SearchService(args.index, args.cache_size)
+    elapsed = (time.perf_counter() - start) * 1000
+    size = service.index.stat.st_size / 1e6
+    print(
+        f"📂 {args.index} ({size:.1f} Mo): {service.index.doc_count} documents,"
+        f" {service.index.term_count} termes, ouvert en {elapsed:.2f} ms"
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Arrêt du service de recherche")
@@ -0,0 +1,102 @@
+"""
+Accès paresseux aux spécifications de data/specs.yaml
+
+Au lieu de charger tout le fichier en mémoire, SpecStore parcourt une seule
+fois les lignes pour noter la position de chaque clé de premier niveau (le
+SKU), puis ne parse que le bloc YAML du produit demandé. La mémoire reste
+ainsi proportionnelle à un seul produit, plus un index d'offsets.
+"""
+
+import re
+from pathlib import Path
+
+import yaml
+
+# Clé de premier niveau: "sa92b:" sans indentation ni valeur sur la ligne
+TOP_LEVEL_KEY = re.compile(rb"^([^\s#'\"][^:#]*):[ \t]*(?:#.*)?$")
+
+# Le chargeur C de libyaml, s'il est disponible, parse chaque bloc plus vite
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class SpecStore:
+    """Index des spécifications par SKU, chargées à la demande"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offsets = {}
+        self._fallback = None
+        self._file = None
+        if self.path.exists():
+            self._build_index()
+
+    def _build_index(self):
+        """Repère l'offset de début et de fin du bloc de chaque SKU"""
+        offsets = {}
+        current = None
+        start = 0
+        position = 0
+
+        with open(self.path, "rb") as f:
+            for line in f:
+                stripped = line.rstrip(b"\r\n")
+                if stripped and not stripped[:1].isspace() and not stripped.startswith(b"#"):
+                    match = TOP_LEVEL_KEY.match(stripped)
+                    if not match:
+                        # Structure inattendue (style flow, ancres, documents
+                        # multiples...): on se rabat sur un chargement complet
+                        self._load_all()
+                        return
+                    if current is not None:
+                        offsets[current] = (start, position)
+                    current = match.group(1).decode("utf-8").strip()
+                    start = position
+                position += len(line)
+
+        if current is not None:
+            offsets[current] = (start, position)
+        self.offsets = offsets
+
+    def _load_all(self):
+        """Charge tout le fichier (équivalent de l'ancien load_specs)"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            self._fallback = yaml.safe_load(f) or {}
+        self.offsets = {}
+
+    def __len__(self):
+        if self._fallback is not None:
+            return len(self._fallback)
+        return len(self.offsets)
+
+    def __contains__(self, sku):
+        if self._fallback is not None:
+            return sku in self._fallback
+        return sku in self.offsets
+
+    def get(self, sku, default=None):
+        """Retourne les specs d'un SKU en ne parsant que son bloc"""
+        if self._fallback is not None:
+            return self._fallback.get(sku, default)
+
+        span = self.offsets.get(sku)
+        if span is None:
+            return default
+
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        start, end = span
+        self._file.seek(start)
+        block = yaml.load(self._file.read(end - start), Loader=SafeLoader)
+        value = block.get(sku) if block else None
+        return default if value is None else value
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
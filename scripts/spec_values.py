@@ -0,0 +1,128 @@
+"""
+Lecture des valeurs numériques des spécifications
+
+Les specs de data/specs.yaml et des info.yaml sont du texte libre:
+"92 pouces (2337 mm)", "680 kg", "150-200 RPM", "±25 degrés",
+"Jusqu'à 18 pouces". parse_spec() en extrait une valeur typée (SpecValue):
+bornes basse et haute (égales pour une valeur simple) exprimées dans l'unité
+canonique de leur grandeur (mm, kg, rpm, deg, ans, hp).
+
+Quand une valeur est donnée dans deux unités ("92 pouces (2337 mm)"), la
+valeur dans l'unité canonique est préférée à la conversion. Un texte sans
+nombre suivi d'une unité connue ("Hydraulique", "Attache rapide") donne
+None.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Unité -> (unité canonique, facteur de conversion vers l'unité canonique)
+UNITS = {
+    "mm": ("mm", 1.0),
+    "cm": ("mm", 10.0),
+    "m": ("mm", 1000.0),
+    "po": ("mm", 25.4),
+    "pouce": ("mm", 25.4),
+    "pouces": ("mm", 25.4),
+    "inch": ("mm", 25.4),
+    "inches": ("mm", 25.4),
+    "in": ("mm", 25.4),
+    '"': ("mm", 25.4),
+    "pi": ("mm", 304.8),
+    "pied": ("mm", 304.8),
+    "pieds": ("mm", 304.8),
+    "ft": ("mm", 304.8),
+    "kg": ("kg", 1.0),
+    "lb": ("kg", 0.45359237),
+    "lbs": ("kg", 0.45359237),
+    "livre": ("kg", 0.45359237),
+    "livres": ("kg", 0.45359237),
+    "rpm": ("rpm", 1.0),
+    "tr/min": ("rpm", 1.0),
+    "°": ("deg", 1.0),
+    "degre": ("deg", 1.0),
+    "degres": ("deg", 1.0),
+    "degré": ("deg", 1.0),
+    "degrés": ("deg", 1.0),
+    "an": ("ans", 1.0),
+    "ans": ("ans", 1.0),
+    "annee": ("ans", 1.0),
+    "annees": ("ans", 1.0),
+    "année": ("ans", 1.0),
+    "années": ("ans", 1.0),
+    "mois": ("ans", 1 / 12),
+    "hp": ("hp", 1.0),
+    "ch": ("hp", 0.98632),
+    "cv": ("hp", 0.98632),
+}
+
+# Unités par ordre de longueur décroissante, pour que "pouces" soit essayé
+# avant "po" et "mm" avant "m"
+_UNIT_PATTERN = "|".join(
+    re.escape(unit) for unit in sorted(UNITS, key=len, reverse=True)
+)
+
+# Nombre avec séparateur de milliers facultatif ("1 500") et décimales
+_NUMBER = r"\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?"
+
+# Nombre ou intervalle ("150-200", "150 à 200", "±25") suivi d'une unité
+QUANTITY = re.compile(
+    rf"(?P<sign>±)?\s*(?P<low>{_NUMBER})"
+    rf"(?:\s*(?:-|–|à)\s*(?P<high>{_NUMBER}))?"
+    rf"\s*(?P<unit>{_UNIT_PATTERN})(?![^\W\d_])",
+    re.IGNORECASE,
+)
+
+# Décimales gardées après conversion
+PRECISION = 1
+
+
+class SpecValue(NamedTuple):
+    """Valeur d'une spec dans l'unité canonique de sa grandeur"""
+
+    low: float
+    high: float
+    unit: str
+
+
+def _number(text):
+    return float(re.sub(r"\s", "", text).replace(",", "."))
+
+
+def parse_spec(text):
+    """SpecValue d'un texte de spec, ou None s'il n'a pas de quantité connue"""
+    if not isinstance(text, str):
+        return None
+    return _parse_text(text)
+
+
+# Les mêmes textes reviennent d'un produit à l'autre ("2 ans", "680 kg")
+@lru_cache(maxsize=4096)
+def _parse_text(text):
+    quantities = []
+    for match in QUANTITY.finditer(text.lower()):
+        canonical, factor = UNITS[match.group("unit")]
+        low = _number(match.group("low"))
+        high = _number(match.group("high")) if match.group("high") else low
+        if match.group("sign"):
+            low = -low
+        quantities.append((factor != 1.0, canonical, low * factor, high * factor))
+    if not quantities:
+        return None
+
+    # La première quantité fixe la grandeur; une valeur déjà dans l'unité
+    # canonique de cette grandeur est préférée à une conversion
+    unit = quantities[0][1]
+    _, _, low, high = min(q for q in quantities if q[1] == unit)
+    return SpecValue(round(low, PRECISION), round(high, PRECISION), unit)
+
+
+def parse_specs(specs):
+    """SpecValue de chaque spec d'un dictionnaire qui a une quantité connue"""
+    values = {}
+    for key, text in (specs or {}).items():
+        value = parse_spec(text)
+        if value is not None:
+            values[key] = value
+    return values
@@ -0,0 +1,285 @@
+"""
+Mode --watch de scripts/build.py
+
+Après un premier build complet, surveille les sources du contenu et, pour
+chaque rafale de modifications, ne relance que les étapes qui en dépendent:
+
+- scripts/data/produits.csv, data/specs.yaml: produits
+- content/produits/<produit>/...: produits-simples
+- content/manuels/<categorie>/<modele>/...: manuels-simples (puis manuels)
+- static/pdf/manuels/...: manuels
+- autre page .md de content/: aucune étape, seulement l'index
+
+Dans chaque étape, le manifeste de build ne réécrit que les sorties dont les
+entrées ont changé (la page d'un SKU, la page et les fichiers d'un dossier de
+modèle). L'index de recherche est gardé en mémoire (LiveIndex): seules les
+pages réécrites ou modifiées sont analysées à nouveau, et le texte des PDF
+seulement si un manuel a pu changer.
+
+Les notifications viennent de watchdog s'il est installé, sinon les dossiers
+sont scrutés toutes les POLL_SECONDS secondes. Les fichiers écrits par les
+générateurs eux-mêmes sont ignorés. Prévu pour tourner à côté de
+`npm run dev`: Hugo recharge les pages dès qu'elles sont réécrites.
+"""
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from build_cache import BuildManifest
+from file_inventory import scan
+from generators import manuals, products, simple_manuals, simple_products
+from generators.search_index import CONTENT_DIR, PDF_DIR, LiveIndex
+from pipeline import run_stages, select_stages
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog non installé: scrutation périodique
+    Observer = None
+
+# Délai sans nouvel événement avant de lancer le build (copies en masse)
+DEBOUNCE_SECONDS = 0.3
+
+# Intervalle de scrutation sans watchdog
+POLL_SECONDS = 1.0
+
+WATCHED_PATHS = (
+    CONTENT_DIR,
+    products.DATA_DIR,
+    products.SPECS_FILE.parent,
+    PDF_DIR,
+)
+
+# Manifestes des générateurs, dont les sorties ne sont pas des sources
+GENERATORS = (
+    ("generate-products", products.GENERATOR_VERSION),
+    ("process-simple-manuals", simple_manuals.GENERATOR_VERSION),
+    ("process-simple-products", simple_products.GENERATOR_VERSION),
+    ("index-manuals", manuals.GENERATOR_VERSION),
+)
+
+# Événements watchdog qui signalent une modification
+SOURCE_EVENTS = {"created", "modified", "deleted", "moved"}
+
+# Étapes dont la sortie peut changer les PDF de static/pdf/manuels/
+PDF_STAGES = {"manuels-simples", "manuels"}
+
+
+def _relative(path, root):
+    """Chemin de path relatif à root, ou None s'il n'est pas dessous"""
+    try:
+        return path.relative_to(root)
+    except ValueError:
+        return None
+
+
+def affected_stages(path):
+    """Étapes à relancer pour un fichier modifié (chemin relatif à la racine)"""
+    path = Path(path)
+    if path in (products.CSV_FILE, products.SPECS_FILE):
+        return {"produits"}
+    if _relative(path, PDF_DIR) is not None:
+        return {"manuels"}
+
+    # Les .md directement sous content/produits/ et content/manuels/<categorie>/
+    # sont des pages; le reste appartient à un dossier de produit ou de modèle
+    for content_dir, depth, stage in (
+        (simple_products.CONTENT_DIR, 1, "produits-simples"),
+        (simple_manuals.CONTENT_DIR, 2, "manuels-simples"),
+    ):
+        rel_path = _relative(path, content_dir)
+        if rel_path is None:
+            continue
+        if len(rel_path.parts) > depth or path.suffix != ".md":
+            return {stage}
+    return set()
+
+
+def generated_outputs():
+    """Fichiers produits par les générateurs lors du dernier build"""
+    outputs = set()
+    for generator, version in GENERATORS:
+        outputs.update(BuildManifest(generator, version).outputs)
+    return outputs
+
+
+def is_ignored(path):
+    """Fichiers temporaires et cachés (copies en cours, éditeurs)"""
+    return any(part.startswith(".") for part in Path(path).parts)
+
+
+class _EventHandler(FileSystemEventHandler if Observer else object):
+    """Transmet les chemins modifiés signalés par watchdog"""
+
+    def __init__(self, events):
+        self.events = events
+
+    def on_any_event(self, event):
+        # Les lectures (opened, closed_no_write) viennent souvent du build
+        # lui-même. Pour les dossiers, seul un déplacement n'est pas aussi
+        # signalé fichier par fichier.
+        if event.event_type not in SOURCE_EVENTS:
+            return
+        if event.is_directory and event.event_type != "moved":
+            return
+        self.events.put(event.src_path)
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path:
+            self.events.put(dest_path)
+
+
+def _snapshot(roots):
+    """Taille et date de chaque fichier sous roots"""
+    files = {}
+    for root in roots:
+        for entry in scan(root).walk():
+            try:
+                stat = entry.stat
+            except OSError:
+                continue
+            files[entry.fspath] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def _poll(roots, events, stop):
+    """Scrute les dossiers et signale les fichiers créés, modifiés ou supprimés"""
+    previous = _snapshot(roots)
+    while not stop.wait(POLL_SECONDS):
+        current = _snapshot(roots)
+        for path in previous.keys() | current.keys():
+            if previous.get(path) != current.get(path):
+                events.put(path)
+        previous = current
+
+
+class Watcher:
+    """Rebuilds incrémentaux déclenchés par les modifications de fichiers"""
+
+    def __init__(self, make_stages, jobs=1, stream=False, service_index=None):
+        self.make_stages = make_stages
+        self.jobs = jobs
+        self.stream = stream
+        self.events = queue.Queue()
+        self.index = LiveIndex(jobs, service_index)
+        self.ignored = set()
+
+    def build(self, names=None, changed=()):
+        """Lance les étapes nommées et celles qui en dépendent (toutes si None)"""
+        pages = set()
+        refresh_pdf = names is None or bool(PDF_STAGES & names)
+
+        def search():
+            self.index.update(pages, changed, refresh_pdf)
+
+        stages = self.make_stages(
+            jobs=self.jobs, stream=self.stream, pages=pages, search=search
+        )
+        if names is not None:
+            stages = select_stages(stages, names | {"recherche"})
+
+        before = generated_outputs()
+        start = time.perf_counter()
+        ok = run_stages(stages)
+        elapsed = time.perf_counter() - start
+        # Les événements de nos propres écritures arrivent après coup
+        self.ignored = before | generated_outputs()
+
+        done = ", ".join(stage.name for stage in stages)
+        status = "✅" if ok else "❌"
+        print(f"\n{status} {done} ({elapsed * 1000:.0f} ms)")
+
+    def wait_changes(self):
+        """
+        Attend une modification, puis les suivantes jusqu'à DEBOUNCE_SECONDS
+        sans nouvel événement. Retourne les chemins relatifs modifiés.
+        """
+        paths = set()
+        while not paths:
+            try:
+                paths.add(self.events.get(timeout=1))
+            except queue.Empty:
+                continue
+        while True:
+            try:
+                paths.add(self.events.get(timeout=DEBOUNCE_SECONDS))
+            except queue.Empty:
+                break
+
+        changed = set()
+        for path in paths:
+            rel_path = os.path.relpath(path)
+            if not is_ignored(rel_path) and rel_path not in self.ignored:
+                changed.add(rel_path)
+        return changed
+
+    def start_notifications(self, roots):
+        """Démarre watchdog (ou la scrutation); retourne la fonction d'arrêt"""
+        if Observer is not None:
+            observer = Observer()
+            handler = _EventHandler(self.events)
+            for root in roots:
+                observer.schedule(handler, str(root), recursive=True)
+            observer.start()
+
+            def stop():
+                observer.stop()
+                observer.join()
+
+            return stop
+
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=_poll, args=(roots, self.events, stop_event), daemon=True
+        )
+        thread.start()
+        return stop_event.set
+
+    def run(self):
+        """Build complet, puis rebuilds à chaque modification jusqu'à Ctrl+C"""
+        print("🏗️  Build initial...")
+        self.build()
+
+        roots = [path for path in dict.fromkeys(WATCHED_PATHS) if path.is_dir()]
+        stop = self.start_notifications(roots)
+        method = "watchdog"
+        if Observer is None:
+            method = f"scrutation toutes les {POLL_SECONDS:g} s"
+        watched = ", ".join(f"{root}/" for root in roots)
+        print(f"\n👀 Surveillance de {watched} ({method}), Ctrl+C pour arrêter")
+
+        try:
+            while True:
+                changed = self.wait_changes()
+                names = set()
+                for path in changed:
+                    names |= affected_stages(path)
+                pages = [
+                    path
+                    for path in changed
+                    if path.endswith(".md")
+                    and _relative(Path(path), CONTENT_DIR) is not None
+                ]
+                if not names and not pages:
+                    continue
+
+                shown = sorted(changed)
+                more = f" (+{len(shown) - 3})" if len(shown) > 3 else ""
+                print(f"\n🔄 Modifié: {', '.join(shown[:3])}{more}")
+                self.build(names, pages)
+        except KeyboardInterrupt:
+            print("\n👋 Arrêt de la surveillance")
+        finally:
+            stop()
+
+
+def watch(make_stages, jobs=1, stream=False, service_index=None):
+    """
+    Lance le mode --watch. make_stages(jobs, stream, pages, search) retourne
+    les étapes du build (build_stages de scripts/build.py). Avec
+    service_index, l'index binaire du service de recherche est réécrit à
+    chaque rebuild.
+    """
+    Watcher(make_stages, jobs=jobs, stream=stream, service_index=service_index).run()
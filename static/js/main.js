@@ -19,35 +19,94 @@ document.addEventListener('DOMContentLoaded', function() {
   initSearch();
 });
 
+// Recherche: l'index est chargé et interrogé par static/js/search-worker.js,
+// hors du fil principal. Chaque requête porte un numéro; seule la réponse
+// à la dernière requête est affichée.
+const SEARCH_WORKER = '/tempete/js/search-worker.js';
+const SEARCH_DEBOUNCE = 120;
+const SEARCH_SUGGESTIONS = 8;
+let searchWorker = null;
+let searchRequest = 0;
+const searchPending = new Map();
+
+function getSearchWorker() {
+  if (!searchWorker) {
+    searchWorker = new Worker(SEARCH_WORKER);
+    searchWorker.onmessage = function(event) {
+      const { id, results, error } = event.data;
+      const pending = searchPending.get(id);
+      if (!pending) return;
+      searchPending.delete(id);
+      if (error) {
+        pending.reject(new Error(error));
+      } else {
+        pending.resolve(results);
+      }
+    };
+  }
+  return searchWorker;
+}
+
+function searchIndex(query, limit) {
+  const id = ++searchRequest;
+  return new Promise((resolve, reject) => {
+    searchPending.set(id, { resolve, reject });
+    getSearchWorker().postMessage({ type: 'search', id: id, query: query, limit: limit });
+  }).then(results => ({ id: id, results: results }));
+}
+
 // Fonction de recherche
 function initSearch() {
   const searchInput = document.getElementById('site-search');
   const searchBtn = document.getElementById('search-btn');
   
-  if (!searchInput) return;
+  if (!searchInput || !window.Worker) return;
+  
+  // Rien n'est téléchargé avant que le visiteur n'utilise la recherche
+  searchInput.addEventListener('focus', function() {
+    getSearchWorker().postMessage({ type: 'warmup' });
+  }, { once: true });
   
-  // Charge l'index de recherche
-  fetch('/tempete/search-index.json')
-    .then(response => response.json())
-    .then(data => {
-      window.searchIndex = data;
-    })
-    .catch(err => console.log('Index de recherche non disponible'));
+  let typingTimer = null;
   
   // Gestion de la recherche
   function performSearch(query) {
-    if (!window.searchIndex || !query) return;
+    if (!query) return;
     
-    query = query.toLowerCase();
-    const results = window.searchIndex.filter(item => {
-      return item.title.toLowerCase().includes(query) ||
-             item.description.toLowerCase().includes(query) ||
-             (item.content && item.content.toLowerCase().includes(query));
-    }).slice(0, 10);
-    
-    displaySearchResults(results);
+    clearTimeout(typingTimer);
+    searchIndex(query, 10)
+      .then(({ id, results }) => {
+        if (id !== searchRequest) return;
+        removeSearchSuggestions();
+        displaySearchResults(results);
+      })
+      .catch(err => console.log('Index de recherche non disponible'));
   }
   
+  // Recherche pendant la saisie, après une courte pause entre deux touches
+  searchInput.addEventListener('input', function() {
+    const query = this.value.trim();
+    clearTimeout(typingTimer);
+    if (!query) {
+      searchRequest++;
+      removeSearchSuggestions();
+      return;
+    }
+    typingTimer = setTimeout(function() {
+      searchIndex(query, SEARCH_SUGGESTIONS)
+        .then(({ id, results }) => {
+          if (id === searchRequest) displaySearchSuggestions(searchInput, results);
+        })
+        .catch(err => console.log('Index de recherche non disponible'));
+    }, SEARCH_DEBOUNCE);
+  });
+  
+  searchInput.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+      removeSearchSuggestions();
+    }
+  });
+  
   searchInput.addEventListener('keypress', function(e) {
     if (e.key === 'Enter') {
       performSearch(this.value);
@@ -59,6 +118,46 @@ function initSearch() {
       performSearch(searchInput.value);
     });
   }
+  
+  document.addEventListener('click', function(e) {
+    if (!e.target.closest('.search-box')) {
+      removeSearchSuggestions();
+    }
+  });
+}
+
+// Suggestions affichées sous le champ de recherche pendant la saisie
+function displaySearchSuggestions(searchInput, results) {
+  removeSearchSuggestions();
+  if (results.length === 0) return;
+  
+  const list = document.createElement('ul');
+  list.className = 'search-suggestions';
+  list.append(...results.map(r => searchResultItem(r, 'span')));
+  
+  searchInput.closest('.search-box').appendChild(list);
+}
+
+// Élément de liste d'un résultat. Titres et descriptions (dont le texte
+// extrait des PDF) sont insérés en texte, jamais interprétés comme du HTML
+function searchResultItem(result, descriptionTag) {
+  const item = document.createElement('li');
+  const link = document.createElement('a');
+  link.href = result.url;
+  const title = document.createElement('strong');
+  title.textContent = result.title;
+  const description = document.createElement(descriptionTag);
+  description.textContent = result.description || '';
+  link.append(title, description);
+  item.appendChild(link);
+  return item;
+}
+
+function removeSearchSuggestions() {
+  const existing = document.querySelector('.search-suggestions');
+  if (existing) {
+    existing.remove();
+  }
 }
 
 // Affiche les résultats de recherche
@@ -82,18 +181,10 @@ function displaySearchResults(results) {
     <div class="search-results-content">
       <button class="search-close" onclick="this.closest('.search-results').remove()">×</button>
       <h2>${results.length} résultat(s)</h2>
-      <ul>
-        ${results.map(r => `
-          <li>
-            <a href="${r.url}">
-              <strong>${r.title}</strong>
-              <p>${r.description || ''}</p>
-            </a>
-          </li>
-        `).join('')}
-      </ul>
+      <ul></ul>
     </div>
   `;
+  resultsDiv.querySelector('ul').append(...results.map(r => searchResultItem(r, 'p')));
   
   document.body.appendChild(resultsDiv);
 }
@@ -0,0 +1,364 @@
+/**
+ * Recherche du site, exécutée dans un Web Worker (lancé par main.js)
+ *
+ * Le fil principal n'envoie que le texte de la requête; le téléchargement
+ * des fragments de l'index, leur décodage et le classement des résultats se
+ * font ici, sans bloquer le défilement ni le carrousel.
+ *
+ * Messages reçus:  {type: 'warmup'} (premier focus sur la recherche) ou
+ *                  {type: 'search', id, query, limit}
+ * Messages émis:   {id, results} ou {id, error}
+ */
+
+// Normalisation des termes de recherche
+// Miroir de fold/stem/tokenize/lookup_key dans scripts/generators/search_index.py
+const SEARCH_STOPWORDS = new Set((
+  'a au aux avec ce ces d dans de des du elle en est et il la le les l leur ' +
+  'ou par pas pour qu que qui se ses son sur un une vos votre nous vous ' +
+  'the of and or for to in on with'
+).split(' '));
+
+const SEARCH_SUFFIXES = [
+  'issements', 'issement', 'atrices', 'atrice', 'ateurs', 'ateur',
+  'ations', 'ation', 'ements', 'ement', 'euses', 'euse', 'ments', 'ment',
+  'eurs', 'eur', 'iques', 'ique', 'ables', 'able', 'ives', 'ive', 'aux',
+  'es', 's', 'x', 'e'
+];
+const SEARCH_MIN_STEM = 3;
+
+function foldText(text) {
+  return text.toLowerCase()
+    .replace(/œ/g, 'oe')
+    .replace(/æ/g, 'ae')
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '');
+}
+
+function stemToken(token) {
+  if (!/^[a-z]+$/.test(token)) return token;
+  for (const suffix of SEARCH_SUFFIXES) {
+    if (token.endsWith(suffix) && token.length - suffix.length >= SEARCH_MIN_STEM) {
+      return token.slice(0, -suffix.length);
+    }
+  }
+  return token;
+}
+
+function tokenize(text) {
+  return foldText(text).split(/[^a-z0-9]+/)
+    .filter(token => token && !SEARCH_STOPWORDS.has(token))
+    .filter(token => token.length >= 2 || /^[0-9]+$/.test(token))
+    .map(stemToken);
+}
+
+// Décode une liste d'identifiants encodée en écarts (delta)
+function decodePostings(deltas) {
+  const ids = new Array(deltas.length);
+  let current = 0;
+  for (let i = 0; i < deltas.length; i++) {
+    current += deltas[i];
+    ids[i] = current;
+  }
+  return ids;
+}
+
+// Index de recherche découpé en fragments (voir scripts/generators/search_index.py):
+// le manifeste n'est chargé qu'au premier focus sur la recherche, puis
+// seuls les fragments nécessaires à chaque requête sont téléchargés. Le nom
+// des fragments contient l'empreinte de leur contenu: seul le manifeste est
+// revalidé auprès du serveur.
+const SEARCH_BASE = '/tempete/search/';
+const SEARCH_FORMAT = 3;
+const searchShards = new Map();
+
+// Une requête par fragment; un échec n'est pas gardé, la recherche suivante
+// retente le téléchargement
+function fetchSearchShard(path, options) {
+  if (!searchShards.has(path)) {
+    const shard = fetch(SEARCH_BASE + path, options)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`${path}: HTTP ${response.status}`);
+        }
+        return response.json();
+      })
+      .catch(err => {
+        searchShards.delete(path);
+        throw err;
+      });
+    searchShards.set(path, shard);
+  }
+  return searchShards.get(path);
+}
+
+async function loadSearchManifest() {
+  const manifest = await fetchSearchShard('manifest.json', { cache: 'no-cache' });
+  if (manifest.version !== SEARCH_FORMAT) {
+    throw new Error(`Format d'index de recherche inconnu: ${manifest.version}`);
+  }
+  return manifest;
+}
+
+// Fragments de termes à charger pour un terme (plusieurs si le terme en
+// cours de saisie est plus court que le préfixe des fragments)
+function termShardKeys(manifest, term, isPrefix) {
+  const key = term.slice(0, manifest.prefix);
+  if (term.length >= manifest.prefix || !isPrefix) {
+    return manifest.terms[key] ? [key] : [];
+  }
+  return Object.keys(manifest.terms).filter(shardKey => shardKey.startsWith(term));
+}
+
+// Documents contenant un terme; le dernier terme de la requête peut être
+// un préfixe (mot en cours de saisie)
+function lookupTerm(shards, term, isPrefix) {
+  const ids = new Set();
+  shards.forEach(shard => {
+    if (shard[term]) {
+      decodePostings(shard[term]).forEach(id => ids.add(id));
+    } else if (isPrefix) {
+      for (const token in shard) {
+        if (token.startsWith(term)) {
+          decodePostings(shard[token]).forEach(id => ids.add(id));
+        }
+      }
+    }
+  });
+  return Array.from(ids).sort((a, b) => a - b);
+}
+
+// Intersection de deux listes triées
+function intersectSorted(a, b) {
+  const result = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      result.push(a[i]);
+      i++;
+      j++;
+    } else if (a[i] < b[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return result;
+}
+
+// Métadonnées des documents, en ne chargeant que les fragments concernés.
+// Les fragments sont stockés par colonne; sections et préfixes d'URL sont
+// des indices dans les dictionnaires du manifeste.
+async function loadSearchDocs(manifest, ids) {
+  return Promise.all(ids.map(async id => {
+    const range = manifest.docs.find(r => id >= r.start && id < r.start + r.count);
+    const docs = await fetchSearchShard(range.file);
+    const i = id - range.start;
+    return {
+      title: docs.title[i],
+      description: docs.description[i],
+      url: manifest.url_prefixes[docs.url_prefix[i]] + docs.url[i],
+      section: manifest.sections[docs.section[i]],
+    };
+  }));
+}
+
+// Documents contenant tous les termes de la requête (recherche plein texte)
+async function searchTerms(manifest, query) {
+  const terms = tokenize(query);
+  if (terms.length === 0) return [];
+
+  let ids = null;
+  for (let i = 0; i < terms.length; i++) {
+    const isPrefix = i === terms.length - 1;
+    const keys = termShardKeys(manifest, terms[i], isPrefix);
+    const shards = await Promise.all(keys.map(key => fetchSearchShard(manifest.terms[key])));
+    const postings = lookupTerm(shards, terms[i], isPrefix);
+    ids = ids === null ? postings : intersectSorted(ids, postings);
+    if (ids.length === 0) return [];
+  }
+  return ids;
+}
+
+// Recherche d'identifiants (SKU, modèles, numéros de documents) dans les
+// clés triées de lookup.json, tolérante aux fautes de frappe:
+// "sa 92", "SA92" et "sa29b" trouvent SA92B.
+const LOOKUP_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789';
+
+// Au-delà, seules les premières clés d'un intervalle de préfixe sont classées
+const LOOKUP_SCAN = 2000;
+
+function lookupKey(text) {
+  return foldText(text).replace(/[^a-z0-9]+/g, '');
+}
+
+function lookupGrams(key) {
+  const grams = new Set();
+  for (let i = 0; i < key.length - 1; i++) {
+    grams.add(key.slice(i, i + 2));
+  }
+  return grams;
+}
+
+// Une faute de frappe tolérée à partir de 4 caractères
+function maxTypos(length) {
+  return length < 4 ? 0 : 1;
+}
+
+// Première clé >= prefix (recherche dichotomique dans les clés triées)
+function lowerBound(keys, prefix) {
+  let lo = 0;
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (keys[mid] < prefix) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+// Identifiants des clés qui commencent par prefix, les plus courtes d'abord
+function prefixMatches(keys, prefix) {
+  const ids = [];
+  for (let id = lowerBound(keys, prefix); id < keys.length && ids.length < LOOKUP_SCAN; id++) {
+    if (!keys[id].startsWith(prefix)) break;
+    ids.push(id);
+  }
+  return ids.sort((a, b) => keys[a].length - keys[b].length || a - b);
+}
+
+// Requêtes à une faute de frappe de query, les plus probables d'abord:
+// inversion de deux caractères, caractère remplacé, oublié ou en trop
+function typoVariants(query) {
+  const variants = [];
+  for (let i = 0; i < query.length - 1; i++) {
+    variants.push(query.slice(0, i) + query[i + 1] + query[i] + query.slice(i + 2));
+  }
+  for (let i = 0; i < query.length; i++) {
+    for (const c of LOOKUP_ALPHABET) {
+      if (c !== query[i]) variants.push(query.slice(0, i) + c + query.slice(i + 1));
+    }
+  }
+  for (let i = 1; i < query.length; i++) {
+    for (const c of LOOKUP_ALPHABET) {
+      variants.push(query.slice(0, i) + c + query.slice(i));
+    }
+  }
+  for (let i = 0; i < query.length; i++) {
+    variants.push(query.slice(0, i) + query.slice(i + 1));
+  }
+  return variants;
+}
+
+// Clés qui contiennent query ailleurs qu'au début: elles ont tous ses
+// bigrammes, comptés dans l'index des bigrammes
+function substringMatches(table, query) {
+  const grams = lookupGrams(query);
+  const counts = table.counts;
+  const touched = [];
+  grams.forEach(gram => {
+    const ids = table.grams.get(gram);
+    if (!ids) return;
+    for (let i = 0; i < ids.length; i++) {
+      if (counts[ids[i]]++ === 0) touched.push(ids[i]);
+    }
+  });
+  const ids = [];
+  for (const id of touched) {
+    if (counts[id] === grams.size && table.keys[id].includes(query)) ids.push(id);
+    counts[id] = 0;
+  }
+  return ids.sort((a, b) => table.keys[a].length - table.keys[b].length || a - b);
+}
+
+// Table de recherche d'identifiants décodée: bigrammes -> Int32Array des clés
+function prepareLookup(data) {
+  const grams = new Map();
+  for (const gram in data.grams) {
+    grams.set(gram, Int32Array.from(decodePostings(data.grams[gram])));
+  }
+  return {
+    keys: data.keys,
+    docs: data.docs,
+    grams: grams,
+    counts: new Uint16Array(data.keys.length),
+  };
+}
+
+// Documents des clés proches de la requête, les meilleures d'abord: clé
+// exacte et préfixes, sous-chaînes, puis à une faute de frappe. Les
+// recherches suivantes ne sont faites que s'il manque des résultats.
+function matchKeys(table, query, limit) {
+  const q = lookupKey(query);
+  if (q.length < 2) return [];
+
+  const ids = [];
+  const seenDocs = new Set();
+  const seenKeys = new Set();
+  function add(keyIds) {
+    for (const keyId of keyIds) {
+      if (seenKeys.has(keyId)) continue;
+      seenKeys.add(keyId);
+      for (const docId of table.docs[keyId]) {
+        if (!seenDocs.has(docId)) {
+          seenDocs.add(docId);
+          ids.push(docId);
+        }
+      }
+      if (ids.length >= limit) return true;
+    }
+    return false;
+  }
+
+  if (add(prefixMatches(table.keys, q))) return ids.slice(0, limit);
+  if (add(substringMatches(table, q))) return ids.slice(0, limit);
+  if (maxTypos(q.length) > 0) {
+    for (const variant of typoVariants(q)) {
+      if (add(prefixMatches(table.keys, variant))) break;
+    }
+  }
+  return ids.slice(0, limit);
+}
+
+let lookupTable = null;
+
+function loadLookup(manifest) {
+  if (!lookupTable) {
+    lookupTable = fetchSearchShard(manifest.lookup)
+      .then(prepareLookup)
+      .catch(err => {
+        lookupTable = null;
+        throw err;
+      });
+  }
+  return lookupTable;
+}
+
+// Identifiants correspondants d'abord, puis résultats plein texte
+async function search(query, limit) {
+  const manifest = await loadSearchManifest();
+  const [table, termIds] = await Promise.all([loadLookup(manifest), searchTerms(manifest, query)]);
+  const ids = matchKeys(table, query, limit);
+  const seen = new Set(ids);
+  for (const id of termIds) {
+    if (ids.length >= limit) break;
+    if (!seen.has(id)) ids.push(id);
+  }
+  return loadSearchDocs(manifest, ids);
+}
+
+if (typeof importScripts === 'function') {
+  self.onmessage = function(event) {
+    const message = event.data;
+    if (message.type === 'warmup') {
+      loadSearchManifest().then(loadLookup).catch(() => {});
+      return;
+    }
+    search(message.query, message.limit)
+      .then(results => self.postMessage({ id: message.id, results: results }))
+      .catch(err => self.postMessage({ id: message.id, error: String(err) }));
+  };
+} else if (typeof module !== 'undefined') {
+  // Node.js: scripts/benchmarks/bench-search-lookup.py
+  module.exports = { lookupKey, lookupGrams, prepareLookup, matchKeys };
+}
@@ -0,0 +1,53 @@
+"""
+Manifeste de build (scripts/build_cache.py): seuls les fichiers réécrits sans
+enregistrement de recherche sont transmis aux étapes suivantes, quel que
+soit le nombre de pages
+Usage: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from build_cache import BuildManifest, hash_text  # noqa: E402
+from search_records import renders  # noqa: E402
+
+PAGES = 50
+
+
+def page(number):
+    return {"title": f"Page {number}"}, f"Corps {number}"
+
+
+@renders(page)
+def render_page(number):
+    frontmatter, body = page(number)
+    return f"---\ntitle: {frontmatter['title']}\n---\n\n{body}\n"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_rendered_holds_only_outputs_without_record(tmp_path, monkeypatch, jobs):
+    monkeypatch.chdir(tmp_path)
+    manifest = BuildManifest("test", "1", cache_dir=tmp_path / "cache")
+    manifest.rendered = set()
+
+    pages = [
+        (
+            Path(f"content/pages/{number}.md"),
+            hash_text(str(number)),
+            render_page,
+            (number,),
+        )
+        for number in range(PAGES)
+    ]
+    written = list(manifest.write_many(pages, jobs=jobs))
+    text = '{"pages": []}'
+    manifest.write_text(Path("data/pages.json"), hash_text(text), str, text)
+    manifest.save()
+
+    assert len(written) == PAGES
+    assert manifest.rendered == {str(Path("data/pages.json"))}
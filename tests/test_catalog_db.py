@@ -0,0 +1,101 @@
+"""
+Base SQLite du catalogue (scripts/catalog_db.py): l'aller-retour CSV -> base
+-> CSV est sans perte, et les pages produits sont les mêmes avec le CSV ou
+la base
+Usage: python -m pytest tests
+"""
+
+import csv
+import shutil
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from catalog_db import CatalogDB, export_catalog, import_catalog  # noqa: E402
+from generators import products  # noqa: E402
+
+# SKU en minuscules, colonne supplémentaire, sans colonnes in_stock/featured
+CSV_TEXT = """\
+sku,name,category,price,description,manual_ref,fournisseur
+sa92b,Souffleuse SA92B,Souffleuse,3499.99,Souffleuse 92 pouces,manuels/souffleuses/sa92b,Tempête
+BL60,Balai BL60,Balais,,Balai rotatif 60 pouces,,
+"""
+
+SPECS_TEXT = """\
+sa92b:
+  largeur: "92 pouces (2337 mm)"
+  poids: "680 kg"
+bl60:
+  largeur: "60 pouces"
+"""
+
+# Sorties de generate-products.py
+OUTPUTS = ("content/produits", "data/related.json", "static/catalog")
+
+
+def write_catalog():
+    products.CSV_FILE.parent.mkdir(parents=True)
+    products.CSV_FILE.write_text(CSV_TEXT, encoding="utf-8")
+    products.SPECS_FILE.parent.mkdir(parents=True)
+    products.SPECS_FILE.write_text(SPECS_TEXT, encoding="utf-8")
+
+
+def read_rows(csv_file):
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def snapshot():
+    """Contenu des sorties du générateur, par chemin"""
+    files = {}
+    for output in map(Path, OUTPUTS):
+        for path in [output] if output.is_file() else sorted(output.rglob("*")):
+            if path.is_file():
+                files[str(path)] = path.read_bytes()
+    return files
+
+
+def test_round_trip_is_lossless(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_catalog()
+    expected = read_rows(products.CSV_FILE)
+
+    with CatalogDB(tmp_path / "catalog.sqlite") as db:
+        import_catalog(db, products.CSV_FILE, products.SPECS_FILE)
+        assert db.product("SA92B")["sku"] == "sa92b"
+        export_catalog(db, tmp_path / "export.csv", tmp_path / "export.yaml")
+
+    assert read_rows(tmp_path / "export.csv") == expected
+
+
+def test_backends_render_the_same_pages(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    write_catalog()
+    products.generate_products()
+    from_csv = snapshot()
+    assert "content/produits/sa92b.md" in from_csv
+
+    # Même empreinte pour chaque page: rien n'est réécrit en changeant de source
+    db_file = tmp_path / "catalog.sqlite"
+    with CatalogDB(db_file) as db:
+        import_catalog(db, products.CSV_FILE, products.SPECS_FILE)
+    capsys.readouterr()
+    products.generate_products(catalog=db_file)
+    assert "✅ 0 pages produits générées" in capsys.readouterr().out
+    assert snapshot() == from_csv
+
+    # Build à froid à partir de la base seule
+    for output in map(Path, OUTPUTS):
+        if output.is_dir():
+            shutil.rmtree(output)
+        else:
+            output.unlink()
+    shutil.rmtree(".build-cache")
+    with CatalogDB(db_file) as db:
+        db.connection.execute("DELETE FROM consumers")
+        db.connection.commit()
+    products.generate_products(catalog=db_file)
+    assert snapshot() == from_csv
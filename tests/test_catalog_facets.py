@@ -0,0 +1,34 @@
+"""
+Index du catalogue (scripts/catalog_facets.py): les produits sans prix sont à
+la fin des tris par prix, croissant comme décroissant
+Usage: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from catalog_facets import CatalogFacets  # noqa: E402
+
+# (sku, prix): sans prix, prix invalide, prix égaux
+PRODUCTS = [
+    ("A", "1500"),
+    ("B", ""),
+    ("C", "250.50"),
+    ("D", "sur demande"),
+    ("E", "3499.99"),
+    ("F", "250.50"),
+]
+
+
+def test_price_sorts_keep_unpriced_products_last():
+    catalog = CatalogFacets()
+    for sku, price in PRODUCTS:
+        catalog.add({"sku": sku, "name": sku, "price": price}, {})
+
+    sort = catalog.facets()["sort"]
+    skus = catalog.skus
+    assert [skus[i] for i in sort["price"]] == ["C", "F", "A", "E", "B", "D"]
+    assert [skus[i] for i in sort["price_desc"]] == ["E", "A", "C", "F", "B", "D"]
@@ -0,0 +1,112 @@
+"""
+Aller-retour de scripts/frontmatter.py: dump_frontmatter produit exactement
+le texte de yaml.dump, qui se relit à l'identique
+Usage: python -m pytest tests
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import frontmatter  # noqa: E402
+
+# Frontmatters synthétiques de bench-frontmatter.py
+_spec = importlib.util.spec_from_file_location(
+    "bench_frontmatter", SCRIPTS_DIR / "benchmarks" / "bench-frontmatter.py"
+)
+bench_frontmatter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_frontmatter)
+
+# Valeurs qui obligent à des guillemets, un repli de ligne ou un autre
+# émetteur que les gabarits
+TRICKY_VALUES = [
+    "",
+    " espace en tête",
+    "espace en fin ",
+    "clé: valeur",
+    "texte # pas un commentaire",
+    "#commentaire",
+    "- tiret",
+    "yes",
+    "null",
+    "~",
+    "2024-01-01",
+    "1234",
+    "0x1F",
+    "1.5e3",
+    "'apostrophes'",
+    '"guillemets"',
+    "ligne 1\nligne 2",
+    "tab\there",
+    "accents é à ç ± °",
+    "emoji 🔥",
+    "* astérisque",
+    "& ancre",
+    "! étiquette",
+    "%pourcentage",
+    "@arobase",
+    "`accent grave`",
+    "{accolades}",
+    "[crochets]",
+    "a" * 200,
+    " ".join(["mot"] * 40),
+    "mot " * 30 + "fin",
+    0,
+    -1,
+    1.0,
+    0.1,
+    1e20,
+    float("inf"),
+    True,
+    False,
+    None,
+    [],
+    {},
+    ["un", "deux"],
+    [{"title": "a", "file": "b.pdf"}],
+    {"largeur": "60 pouces", "poids": 400},
+]
+
+
+def assert_round_trip(data):
+    expected = yaml.dump(data, allow_unicode=True, sort_keys=False)
+    output = frontmatter.dump_frontmatter(data)
+    assert output == expected
+    assert yaml.safe_load(output) == data
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [bench_frontmatter.product_frontmatter, bench_frontmatter.manual_frontmatter],
+)
+def test_generated_pages(factory):
+    """Frontmatters des générateurs de pages produits et manuels"""
+    for i in range(200):
+        assert_round_trip(factory(i))
+
+
+@pytest.mark.parametrize("value", TRICKY_VALUES, ids=repr)
+@pytest.mark.parametrize("key", ["title", "description", "specs", "inconnue"])
+def test_tricky_values(key, value):
+    """Valeurs particulières, sous une clé des gabarits ou une clé inconnue"""
+    data = bench_frontmatter.product_frontmatter(1)
+    data[key] = value
+    assert_round_trip(data)
+
+
+@pytest.mark.parametrize("value", TRICKY_VALUES, ids=repr)
+def test_tricky_spec_values(value):
+    """Valeurs particulières dans les specs et les manuels"""
+    data = bench_frontmatter.product_frontmatter(2)
+    data["specs"]["largeur"] = value
+    assert_round_trip(data)
+
+    data = bench_frontmatter.manual_frontmatter(2)
+    data["manuals"][0]["version"] = value
+    assert_round_trip(data)
@@ -0,0 +1,37 @@
+"""
+Déclinaisons responsives (scripts/image_variants.py): deux photos de même nom
+et d'extensions différentes, dans un même dossier, ont des déclinaisons
+distinctes
+Usage: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from image_variants import Image, build_variants  # noqa: E402
+
+
+@pytest.mark.skipif(Image is None, reason="Pillow non installé")
+def test_same_stem_photos_do_not_collide(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    folder = Path("content/produits/x")
+    folder.mkdir(parents=True)
+    photos = []
+    for name, color in (("photo.jpg", (200, 0, 0)), ("photo.png", (0, 0, 200))):
+        source = folder / name
+        Image.new("RGB", (1000, 750), color).save(source)
+        web_path = f"images/produits/x/{name}"
+        photos.append((source, source.stat(), web_path, Path("static") / web_path))
+
+    entries, assets = build_variants(photos, "produits")
+
+    targets = [target for _, target, _ in assets]
+    assert len(targets) == len(set(targets))
+    jpg, png = (entries[web_path] for _, _, web_path, _ in photos)
+    assert jpg["src"] != png["src"]
+    assert jpg["src"] == "images/produits/x/photo.jpg-960w.jpg"
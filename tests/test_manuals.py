@@ -0,0 +1,48 @@
+"""
+Pages de manuels (scripts/generators/manuals.py): une page de catégorie écrite
+à la main n'est ni réécrite ni supprimée, une page générée l'est
+Usage: python -m pytest tests
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from generators.manuals import CONTENT_DIR, PDF_BASE_DIR, index_manuals  # noqa: E402
+
+HAND_INDEX = """---
+title: "Lames"
+description: "Texte écrit à la main"
+---
+"""
+
+
+def add_pdf(category, model):
+    folder = PDF_BASE_DIR / category / model
+    folder.mkdir(parents=True)
+    (folder / f"{model.upper()} OM 0440-F.pdf").write_bytes(b"%PDF-1.4\n")
+
+
+def test_hand_written_category_index_is_preserved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for category in ("lames", "balais", "souffleuses"):
+        add_pdf(category, "modele")
+    hand_index = CONTENT_DIR / "lames" / "_index.md"
+    hand_index.parent.mkdir(parents=True)
+    hand_index.write_text(HAND_INDEX, encoding="utf-8")
+    generated_index = CONTENT_DIR / "balais" / "_index.md"
+
+    index_manuals()
+    assert hand_index.read_text(encoding="utf-8") == HAND_INDEX
+    assert generated_index.exists()
+
+    # Les catégories se vident: seule la page générée est supprimée
+    shutil.rmtree(PDF_BASE_DIR / "lames")
+    shutil.rmtree(PDF_BASE_DIR / "balais")
+    index_manuals()
+    assert hand_index.read_text(encoding="utf-8") == HAND_INDEX
+    assert not generated_index.exists()
+    assert (CONTENT_DIR / "souffleuses" / "_index.md").exists()
@@ -0,0 +1,89 @@
+"""
+Index de recherche: le texte des PDF des dossiers de manuels simples, publiés
+dans le magasin static/pdf/manuels/_fichiers/, est trouvé par la recherche;
+l'index du service de recherche est écrit par le build et le mode --watch
+Usage: python -m pytest tests
+"""
+
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from build import build_stages  # noqa: E402
+from generators.search_index import LiveIndex, build_search_index, tokenize  # noqa: E402
+from generators.simple_manuals import process_manual_folders  # noqa: E402
+from pdf_text import HAS_PYPDF  # noqa: E402
+from pipeline import run_stages  # noqa: E402
+from search_postings import PostingsIndex  # noqa: E402
+
+# PDF synthétiques de bench-build.py
+_spec = importlib.util.spec_from_file_location(
+    "bench_build", SCRIPTS_DIR / "benchmarks" / "bench-build.py"
+)
+bench_build = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_build)
+
+PDF_PAGES = 3
+
+
+def simple_manual(category, model, pdf_name, pdf):
+    """Dossier de manuel simple: info.yaml et un PDF"""
+    folder = Path("content/manuels") / category / model
+    folder.mkdir(parents=True)
+    (folder / "info.yaml").write_text(f'title: "{model}"\n', encoding="utf-8")
+    (folder / pdf_name).write_bytes(pdf)
+
+
+def search(index, query):
+    return [index.doc(doc_id) for doc_id in index.search(tuple(tokenize(query)))]
+
+
+@pytest.mark.skipif(not HAS_PYPDF, reason="pypdf non installé")
+def test_simple_folder_pdf_text_is_searchable(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pdf = bench_build.dummy_pdf("ZORGLUB 0440", PDF_PAGES, random.Random(0))
+    # Le même PDF dans deux modèles n'est publié, et indexé, qu'une fois
+    simple_manual("lames", "testmod", "OM-0440LM-F.pdf", pdf)
+    simple_manual("lames", "autremod", "OM-0440LM-F.pdf", pdf)
+
+    process_manual_folders()
+    service_index = tmp_path / "search-index.bin"
+    build_search_index(service_index=service_index)
+
+    with PostingsIndex(service_index) as index:
+        results = search(index, "zorglub")
+        pdf_pages = [doc for doc in results if "#page=" in doc["url"]]
+        assert len(pdf_pages) == PDF_PAGES
+        for doc in pdf_pages:
+            assert "/pdf/manuels/_fichiers/" in doc["url"]
+            assert doc["section"] == "manuels"
+
+
+def hand_page(name, title):
+    page = Path("content/pages") / f"{name}.md"
+    page.parent.mkdir(parents=True, exist_ok=True)
+    page.write_text(f'---\ntitle: "{title}"\n---\n\nTexte\n', encoding="utf-8")
+    return str(page)
+
+
+def test_build_and_watch_write_the_service_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    hand_page("a", "Pelle Zorglub")
+    service_index = tmp_path / "search-index.bin"
+
+    assert run_stages(build_stages(service_index=service_index), parallel=False)
+    with PostingsIndex(service_index) as index:
+        assert len(search(index, "zorglub")) == 1
+
+    # Rebuild du mode --watch: l'index du service suit la page ajoutée
+    live = LiveIndex(service_index=service_index)
+    live.update()
+    live.update(changed={hand_page("b", "Lame Zorglub")})
+    with PostingsIndex(service_index) as index:
+        assert len(search(index, "zorglub")) == 2